@@ -0,0 +1,129 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.db import DatabaseError
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Greatest
+
+logger = logging.getLogger(__name__)
+
+
+def add_to_column(queryset, field, amounts):
+    """
+    Add ``amounts[pk]`` to ``field`` of each row with one ``UPDATE ... SET
+    col = MAX(col + CASE ... END, 0)``; returns the rows updated.
+    """
+    amounts = {pk: n for pk, n in amounts.items() if n}
+    if not amounts:
+        return 0
+    # Rows that move by the same amount share one WHEN.
+    by_amount = defaultdict(list)
+    for pk, n in amounts.items():
+        by_amount[n].append(pk)
+    delta = Case(
+        *[When(pk__in=pks, then=Value(n)) for n, pks in by_amount.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    return queryset.filter(pk__in=amounts).update(
+        **{field: Greatest(F(field) + delta, 0)}
+    )
+
+
+class WriteBehindBuffer:
+    """
+    Writes collected in memory by this process and applied in bulk.
+
+    ``flush_if_due()`` (connect it to ``request_finished``) writes the
+    buffer once ``interval`` seconds have passed since the last flush or
+    ``max_pending`` entries are waiting, and ``flush()`` also runs when the
+    interpreter exits. A process that dies without a clean exit therefore
+    loses at most one interval of writes. Subclasses say how entries are
+    collected (``empty()``) and written (``write()``).
+    """
+
+    def __init__(self, interval=5, max_pending=1000):
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending = self.empty()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
+
+    def empty(self):
+        return {}
+
+    def write(self, pending):
+        """Apply ``pending`` to the database; returns the rows written."""
+        raise NotImplementedError
+
+    def restore(self, pending):
+        """Put back the entries of a failed flush; newer ones win."""
+        for key, value in pending.items():
+            self._pending.setdefault(key, value)
+
+    def pending(self):
+        with self._lock:
+            return dict(self._pending)
+
+    def discard(self):
+        with self._lock:
+            self._pending = self.empty()
+
+    def is_due(self):
+        return (
+            len(self._pending) >= self.max_pending
+            or time.monotonic() - self._last_flush >= self.interval
+        )
+
+    def flush_if_due(self, **kwargs):
+        if self._pending and self.is_due():
+            self.flush()
+
+    def flush(self):
+        """Write everything buffered so far; returns the rows written."""
+        with self._lock:
+            pending, self._pending = self._pending, self.empty()
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        try:
+            return self.write(pending)
+        except DatabaseError:
+            logger.exception(
+                "Flushing %s failed; keeping %d entries buffered", self, len(pending)
+            )
+            with self._lock:
+                self.restore(pending)
+            return 0
+
+
+class CounterBuffer(WriteBehindBuffer):
+    """
+    Increments of an integer column, summed per row in this process and
+    written back as one ``add_to_column()`` UPDATE.
+    """
+
+    def __init__(self, model, field, interval=5, max_pending=1000):
+        self.model = model
+        self.field = field
+        super().__init__(interval=interval, max_pending=max_pending)
+
+    def __str__(self):
+        return f"{self.model._meta.label}.{self.field}"
+
+    def empty(self):
+        return Counter()
+
+    def add(self, pk, n=1):
+        with self._lock:
+            self._pending[pk] += n
+
+    def write(self, pending):
+        return add_to_column(self.model._base_manager.all(), self.field, pending)
+
+    def restore(self, pending):
+        self._pending.update(pending)
@@ -0,0 +1,102 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.core.cache import caches
+
+
+class TaggedResponseCache:
+    """
+    Cache of rendered response data where every entry carries tags.
+
+    Each tag has a version stored in the cache; an entry remembers the
+    versions of its tags at write time and is treated as a miss as soon as
+    any of them moved. ``invalidate("article:3")`` therefore drops exactly
+    the entries that included article 3, without scanning keys.
+
+    Hits and misses are counted per *scope* tag (the tags describing which
+    slice of the data a request asked for) in this process.
+    """
+
+    def __init__(self, prefix, timeout=300, alias="default"):
+        self.prefix = prefix
+        self.timeout = timeout
+        self.alias = alias
+        self._stats = {"hits": Counter(), "misses": Counter()}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def make_key(self, *parts):
+        digest = hashlib.sha1(repr(parts).encode(), usedforsecurity=False).hexdigest()
+        return f"{self.prefix}:entry:{digest}"
+
+    def _version_key(self, tag):
+        return f"{self.prefix}:tag:{tag}"
+
+    @staticmethod
+    def _fresh_version():
+        # Unique per (re)initialisation, so an evicted version can never
+        # come back with a value an old entry was stored under.
+        return time.time_ns()
+
+    def get_versions(self, tags):
+        keys = {self._version_key(tag): tag for tag in tags}
+        found = self.cache.get_many(keys.keys())
+        missing = {key: self._fresh_version() for key in keys if key not in found}
+        if missing:
+            self.cache.set_many(missing, timeout=None)
+            found.update(missing)
+        return {keys[key]: version for key, version in found.items()}
+
+    def get(self, key, scope_tags=()):
+        entry = self.cache.get(key)
+        fresh = entry is not None and self._is_current(entry["tags"])
+        self._count("hits" if fresh else "misses", scope_tags)
+        return entry["value"] if fresh else None
+
+    def _is_current(self, stored):
+        keys = {self._version_key(tag): version for tag, version in stored.items()}
+        current = self.cache.get_many(keys.keys())
+        return all(current.get(key) == version for key, version in keys.items())
+
+    def set(self, key, value, tags, snapshot=None):
+        """
+        Store ``value`` under ``tags``. Pass the ``get_versions()`` result
+        taken *before* computing the value as ``snapshot`` so an invalidation
+        racing with the computation is not lost.
+        """
+        versions = self.get_versions(set(tags) - set(snapshot or ()))
+        versions.update(snapshot or {})
+        self.cache.set(key, {"value": value, "tags": versions}, self.timeout)
+
+    def invalidate(self, *tags):
+        for tag in set(tags):
+            key = self._version_key(tag)
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                self.cache.set(key, self._fresh_version(), timeout=None)
+
+    def _count(self, kind, scope_tags):
+        with self._stats_lock:
+            self._stats[kind].update(scope_tags)
+
+    def stats(self):
+        with self._stats_lock:
+            tags = set(self._stats["hits"]) | set(self._stats["misses"])
+            return {
+                tag: {
+                    "hits": self._stats["hits"][tag],
+                    "misses": self._stats["misses"][tag],
+                }
+                for tag in sorted(tags)
+            }
+
+    def reset_stats(self):
+        with self._stats_lock:
+            for counter in self._stats.values():
+                counter.clear()
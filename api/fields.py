@@ -0,0 +1,88 @@
+from django.db import models
+from rest_framework import serializers
+
+
+class UserFlagField(serializers.BooleanField):
+    """
+    ``True`` when the requesting user owns a ``model`` row pointing at the
+    serialized object, e.g. ``UserFlagField(Like, "article")`` for
+    ``is_liked``. ``pending(user_id, pks)`` may return ``{pk: flagged}``
+    for writes not stored yet, which override the stored flags.
+
+    Used under ``UserFlagListSerializer`` the flags of a whole page are
+    resolved with a single ``<target>_id IN (...)`` query instead of a
+    correlated subquery per row. A lone instance is resolved on demand.
+    """
+
+    def __init__(self, model, target, user_field="user", pending=None, **kwargs):
+        self.flag_model = model
+        self.target = target
+        self.user_field = user_field
+        self.pending = pending
+        self._resolved = set()
+        self._flagged = set()
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def get_user(self):
+        request = self.context.get("request")
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            return None
+        return user
+
+    def get_flagged_ids(self, user, pks):
+        """Return the subset of ``pks`` flagged by ``user``; one query."""
+        flagged = set(
+            self.flag_model.objects.filter(
+                **{self.user_field: user, f"{self.target}_id__in": pks}
+            )
+            .order_by()
+            .values_list(f"{self.target}_id", flat=True)
+        )
+        if self.pending is not None:
+            for pk, on in self.pending(user.pk, pks).items():
+                if on:
+                    flagged.add(pk)
+                else:
+                    flagged.discard(pk)
+        return flagged
+
+    def resolve(self, instances):
+        pks = {obj.pk for obj in instances} - self._resolved
+        if not pks:
+            return
+        user = self.get_user()
+        if user is not None:
+            self._flagged.update(self.get_flagged_ids(user, pks))
+        self._resolved.update(pks)
+
+    def flag_rows(self, rows, pk_field="id"):
+        """Set this flag on already-rendered ``rows`` (e.g. from a cache)."""
+        user = self.get_user()
+        pks = {row[pk_field] for row in rows}
+        flagged = set()
+        if user is not None and pks:
+            flagged = set(self.get_flagged_ids(user, pks))
+        for row in rows:
+            row[self.field_name] = row[pk_field] in flagged
+
+    def get_attribute(self, instance):
+        if instance.pk not in self._resolved:
+            self.resolve([instance])
+        return instance.pk in self._flagged
+
+
+class UserFlagListSerializer(serializers.ListSerializer):
+    """Resolves every ``UserFlagField`` of the child for the whole batch."""
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        for field in self.child.fields.values():
+            if isinstance(field, UserFlagField):
+                field.resolve(items)
+        return super().to_representation(items)
+
+
+def user_flag_fields(serializer):
+    return [f for f in serializer.fields.values() if isinstance(f, UserFlagField)]
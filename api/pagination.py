@@ -0,0 +1,190 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque-cursor pagination keyed on the queryset ordering plus ``id``.
+
+    The cursor stores the ordering values of the last (or first) row of the
+    page, so every page is a ``WHERE (created_at, id) < (...) LIMIT n`` range
+    read. No ``COUNT(*)`` or ``OFFSET`` is ever issued, and rows inserted
+    while a client is paging cannot shift or duplicate results.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        self.ordering = self.get_ordering(queryset)
+
+        position, reverse = self.decode_cursor(request)
+        ordering = self.invert(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.keyset_filter(ordering, position))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        ordering = list(queryset.query.order_by or self.model._meta.ordering)
+        for field in ordering:
+            assert isinstance(field, str) and "__" not in field, (
+                "KeysetPagination only supports ordering by local fields, "
+                f"got {field!r}."
+            )
+        ordering = [
+            "-id" if f == "-pk" else "id" if f == "pk" else f for f in ordering
+        ]
+        if not any(f.lstrip("-") == "id" for f in ordering):
+            descending = bool(ordering) and ordering[0].startswith("-")
+            ordering.append("-id" if descending else "id")
+        return ordering
+
+    @staticmethod
+    def invert(ordering):
+        return [f[1:] if f.startswith("-") else f"-{f}" for f in ordering]
+
+    @staticmethod
+    def keyset_filter(ordering, position):
+        """
+        Build ``(f1, f2, ...) > (v1, v2, ...)`` honouring each field's
+        direction. The leading column is also bounded on its own so SQLite
+        can turn the predicate into an index range scan.
+        """
+        clauses = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            op = "lt" if field.startswith("-") else "gt"
+            clauses |= equal & Q(**{f"{name}__{op}": value})
+            equal &= Q(**{name: value})
+        lead = ordering[0]
+        op = "lte" if lead.startswith("-") else "gte"
+        return Q(**{f"{lead.lstrip('-')}__{op}": position[0]}) & clauses
+
+    def get_position(self, item):
+        return [getattr(item, f.lstrip("-")) for f in self.ordering]
+
+    def encode_cursor(self, position, reverse):
+        values = [v.isoformat() if hasattr(v, "isoformat") else v for v in position]
+        payload = {"p": values}
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        cursor = base64.urlsafe_b64encode(raw).decode().rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            payload = json.loads(raw)
+            values = payload["p"]
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.to_python(f.lstrip("-"), v) for f, v in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(payload.get("r"))
+
+    def to_python(self, name, value):
+        try:
+            field = self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Annotations (e.g. a search rank) are stored as plain JSON values.
+            return value
+        try:
+            return field.to_python(value)
+        except ValidationError as exc:
+            raise ValueError from exc
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque pagination cursor from a previous response.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Number of results per page (max {self.max_page_size}).",
+                "schema": {"type": "integer"},
+            },
+        ]
@@ -0,0 +1,16 @@
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Newline-delimited JSON. ``request.data`` is a lazy iterator over the raw
+    lines of the body, so large uploads are consumed as they are read and
+    never buffered whole; decoding is left to the view.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if stream is None:
+            return iter(())
+        return iter(stream.readline, b"")
@@ -0,0 +1,184 @@
+import re
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from authentication.models import User, Role, Permission
+from articles.models import Article
+from articles.trending import refresh_trending
+from category.models import Category
+from comments.models import Comment
+from feeds.models import TimelineEntry
+from likes.models import Like
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+class QueryPlanTest(TestCase):
+    """
+    Every list path must reach its page through an index: no full table
+    scans and no sorting of the whole filtered set in a temporary B-tree.
+
+    Only the page query (ordered, with ``LIMIT``) is checked; the validator
+    aggregates of conditional GET count the filtered rows by definition.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        role = Role.objects.create(
+            name="writer",
+            permissions=Permission.FOLLOW | Permission.COMMENT | Permission.WRITE,
+        )
+        cls.user = User.objects.create_user(
+            email="writer@example.com", password="testpass123", role=role
+        )
+        cls.category = Category.objects.create(name="Tech")
+        cls.articles = [
+            Article.objects.create(
+                title=f"Article {i}",
+                slug=f"article-{i}",
+                body="body",
+                author=cls.user,
+                category=cls.category,
+                status=Article.Status.PUBLISHED if i % 2 else Article.Status.DRAFT,
+            )
+            for i in range(4)
+        ]
+        article = cls.articles[0]
+        parent = Comment.objects.create(article=article, author=cls.user, body="Top")
+        Comment.objects.create(article=article, author=cls.user, body="Re", parent=parent)
+        Like.objects.create(article=article, user=cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def page_query_plan(self, url, table):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200, url)
+        page_queries = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if f'FROM "{table}"' in q["sql"]
+            and " ORDER BY " in q["sql"]
+            and " LIMIT " in q["sql"]
+        ]
+        self.assertEqual(len(page_queries), 1, url)
+        return resp, explain(page_queries[0])
+
+    def assertIndexedPlan(self, url, table):
+        resp, plan = self.page_query_plan(url, table)
+        for step in plan:
+            self.assertIsNone(
+                re.fullmatch(r"SCAN \w+", step), f"{url}: full scan in {plan}"
+            )
+            self.assertNotIn("TEMP B-TREE", step, f"{url}: sort in {plan}")
+        return resp
+
+    def assertIndexedPages(self, url, table):
+        """Check ``url`` and the page its ``next`` cursor points at."""
+        resp = self.assertIndexedPlan(url, table)
+        separator = "&" if "?" in url else "?"
+        resp = self.assertIndexedPlan(f"{url}{separator}page_size=1", table)
+        self.assertIsNotNone(resp.data["next"], url)
+        self.assertIndexedPlan(resp.data["next"], table)
+
+    def test_article_paths(self):
+        base = "/api/v1/articles/"
+        for query in (
+            "",
+            "?status=Published",
+            f"?category={self.category.pk}",
+            f"?author={self.user.pk}",
+            f"?status=Published&category={self.category.pk}",
+            f"?status=Published&author={self.user.pk}",
+            "?ordering=created_at",
+            "?ordering=updated_at",
+            "?ordering=-updated_at",
+            "?ordering=title",
+            "?ordering=-title",
+        ):
+            with self.subTest(query=query):
+                self.assertIndexedPages(base + query, "articles_article")
+
+    def test_trending(self):
+        refresh_trending()
+        self.assertIndexedPlan("/api/v1/articles/trending/", "articles_articletrend")
+
+    def test_feed(self):
+        reader = User.objects.create_user(email="reader@example.com", password="x")
+        TimelineEntry.objects.bulk_create(
+            TimelineEntry(
+                user=reader,
+                article=article,
+                author=self.user,
+                published_at=article.created_at,
+            )
+            for article in self.articles
+        )
+        self.client.force_authenticate(user=reader)
+        resp = self.assertIndexedPlan("/api/v1/feed/?page_size=1", "feeds_timelineentry")
+        self.assertIndexedPlan(resp.data["next"], "feeds_timelineentry")
+
+    def test_comment_paths(self):
+        base = "/api/v1/comments/"
+        for query in ("", f"?article={self.articles[0].pk}"):
+            with self.subTest(query=query):
+                self.assertIndexedPlan(base + query, "comments_comment")
+        self.assertIndexedPlan(
+            f"{base}thread/?article={self.articles[0].pk}", "comments_comment"
+        )
+        parent = Comment.objects.get(parent=None)
+        self.assertIndexedPlan(f"{base}{parent.pk}/replies/", "comments_comment")
+
+    def test_moderation_queues(self):
+        moderator = User.objects.create_user(
+            email="mod@example.com",
+            password="testpass123",
+            role=Role.objects.create(name="moderator", permissions=Permission.MODERATE),
+        )
+        self.client.force_authenticate(user=moderator)
+        for state in ("flagged", "recent", "hidden", "deleted"):
+            with self.subTest(state=state):
+                self.assertIndexedPlan(
+                    f"/api/v1/comments/queue/?state={state}", "comments_comment"
+                )
+
+    def test_liked_lookup(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(
+                "/api/v1/likes/mine/",
+                {"articles": [a.pk for a in self.articles]},
+                format="json",
+            )
+        [sql] = [q["sql"] for q in ctx.captured_queries if '"likes_like"' in q["sql"]]
+        plan = explain(sql)
+        self.assertFalse([step for step in plan if step.startswith("SCAN")], plan)
+
+    def test_article_stats(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(f"/api/v1/articles/{self.articles[0].pk}/stats/")
+        [sql] = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if 'FROM "articles_articledailystats"' in q["sql"]
+        ]
+        plan = explain(sql)
+        self.assertFalse(
+            [step for step in plan if step.startswith("SCAN") or "TEMP B-TREE" in step],
+            plan,
+        )
+
+    def test_like_paths(self):
+        base = "/api/v1/likes/"
+        for query in ("", f"?article={self.articles[0].pk}"):
+            with self.subTest(query=query):
+                self.assertIndexedPlan(base + query, "likes_like")
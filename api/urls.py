@@ -8,4 +8,6 @@ urlpatterns = [
     path("articles/", include("articles.urls")),
     path("comments/", include("comments.urls")),
     path("likes/", include("likes.urls")),
+    path("jobs/", include("jobs.urls")),
+    path("feed/", include("feeds.urls")),
 ]
@@ -0,0 +1,96 @@
+from django.conf import settings
+from django.db import transaction
+
+from api.cache import TaggedResponseCache
+from .models import Article
+
+feed_cache = TaggedResponseCache(
+    "article-feed", timeout=getattr(settings, "ARTICLE_FEED_CACHE_TIMEOUT", 300)
+)
+
+# Bumped whenever likes or comments move an article's counters. The list
+# ETag carries its version instead of summing the counters on each request.
+ENGAGEMENT_TAG = "articles:engagement"
+
+
+def is_feed_request(request):
+    return request.query_params.get("status") == Article.Status.PUBLISHED
+
+
+def feed_cache_key(request):
+    params = request.query_params
+    normalized = sorted(
+        (name, tuple(sorted(v for v in params.getlist(name) if v)))
+        for name in params
+        if any(params.getlist(name))
+    )
+    return feed_cache.make_key(request.path, normalized)
+
+
+def feed_scope_tags(request):
+    """
+    Tags for the set of articles a request can list; any article written
+    into that set invalidates it. Hit/miss stats are kept per scope tag.
+    """
+    tags = []
+    for param in ("category", "author"):
+        value = request.query_params.get(param)
+        if value:
+            tags.append(f"articles:{param}:{value}")
+    return tags or ["articles"]
+
+
+def feed_entry_tags(rows):
+    """Tags for the rows a page rendered, including nested category and author."""
+    tags = set()
+    for row in rows:
+        tags.add(f"article:{row['id']}")
+        tags.add(f"user:{row['author']}")
+        if row.get("category"):
+            tags.add(f"category:{row['category']['id']}")
+    return tags
+
+
+def invalidate(*tags):
+    feed_cache.invalidate(*tags)
+    # Again after commit: a reader may have cached the pre-commit state
+    # under the versions bumped above.
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: feed_cache.invalidate(*tags))
+
+
+def invalidate_engagement(*article_ids):
+    """Likes or comments changed: pages showing the articles, and list ETags."""
+    invalidate(ENGAGEMENT_TAG, *(f"article:{pk}" for pk in article_ids))
+
+
+def engagement_version():
+    return feed_cache.get_versions([ENGAGEMENT_TAG])[ENGAGEMENT_TAG]
+
+
+def invalidate_article(article):
+    """
+    An article changed: pages showing it, and every list it may now belong
+    to. Lists it left are covered by ``article:<id>``.
+    """
+    invalidate(*article_tags(article))
+
+
+def invalidate_articles(articles):
+    """One round of invalidations for many articles, e.g. after ``bulk_create``."""
+    tags = set()
+    for article in articles:
+        tags.update(article_tags(article))
+    if tags:
+        invalidate(*tags)
+
+
+def article_tags(article):
+    tags = [
+        "articles",
+        f"article:{article.pk}",
+        f"articles:author:{article.author_id}",
+    ]
+    if article.category_id:
+        tags.append(f"articles:category:{article.category_id}")
+    return tags
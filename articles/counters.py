@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from api.buffers import CounterBuffer
+from comments.models import Comment
+from comments.moderation import VISIBLE
+from likes.models import Like
+from .models import Article
+
+DEFAULTS = {
+    "FLUSH_INTERVAL": 5,
+    "MAX_PENDING": 1000,
+}
+
+config = {**DEFAULTS, **getattr(settings, "ARTICLE_VIEWS", {})}
+
+article_views = CounterBuffer(
+    Article,
+    "views_count",
+    interval=config["FLUSH_INTERVAL"],
+    max_pending=config["MAX_PENDING"],
+)
+
+VIEWS_COUNT_HELP = (
+    "Times the article was retrieved. Buffered in each server process and "
+    f"written every {config['FLUSH_INTERVAL']} s, so it lags by up to that "
+    "long; a process that crashes loses the views of its last interval."
+)
+
+
+def count_subquery(model, field="article", condition=Q()):
+    """
+    The number of live ``model`` rows matching ``condition`` whose ``field``
+    points at the outer row (an article by default).
+    """
+    return Coalesce(
+        Subquery(
+            model.objects.filter(condition, **{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(total=Count("pk"))
+            .values("total")
+        ),
+        0,
+    )
+
+
+def engagement_events():
+    """
+    The likes and comments the trending scores and the daily rollups are
+    built from, by name, including rows whose article has been deleted.
+    """
+    # Comments deleted or hidden by a moderator are not engagement.
+    return {
+        "likes": Like.all_with_deleted.all(),
+        "comments": Comment.all_with_deleted.filter(VISIBLE),
+    }
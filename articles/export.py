@@ -0,0 +1,16 @@
+ARTICLE_EXPORT_COLUMNS = (
+    "id",
+    "title",
+    "slug",
+    "status",
+    "excerpt",
+    "body",
+    "category_id",
+    "author_id",
+    "author__email",
+    "likes_count",
+    "comments_count",
+    "views_count",
+    "created_at",
+    "updated_at",
+)
@@ -0,0 +1,222 @@
+import json
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import or_
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils.text import slugify
+from rest_framework import serializers
+
+from category.models import Category
+from .cache import invalidate_articles
+from .models import Article
+
+SLUG_MAX_LENGTH = Article._meta.get_field("slug").max_length
+
+
+class ArticleImportRowSerializer(serializers.Serializer):
+    """
+    Shape of one NDJSON line. Only per-row checks live here; uniqueness and
+    references are resolved for a whole batch by ``ArticleImporter``.
+    """
+
+    title = serializers.CharField(max_length=255)
+    slug = serializers.SlugField(
+        max_length=SLUG_MAX_LENGTH, required=False, allow_blank=True
+    )
+    body = serializers.CharField()
+    excerpt = serializers.CharField(required=False, allow_blank=True, default="")
+    status = serializers.ChoiceField(
+        choices=Article.Status.choices, default=Article.Status.DRAFT
+    )
+    category = serializers.IntegerField(required=False, allow_null=True)
+    author = serializers.EmailField(
+        required=False, help_text="Author email; defaults to the importing user."
+    )
+
+
+@dataclass
+class ImportReport:
+    created: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, line, errors):
+        self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self):
+        return {"created": self.created, "errors": self.errors}
+
+
+class ArticleImporter:
+    """
+    Imports articles from NDJSON lines in batches of ``batch_size``.
+
+    A batch costs a handful of queries whatever its size: one for categories,
+    one for authors, one for slugs (plus one per hundred colliding slugs) and
+    the ``bulk_create``. Invalid lines are reported in the ``ImportReport``
+    and skipped; they never abort the stream. Colliding slugs get a ``-2``,
+    ``-3``... suffix.
+    """
+
+    SLUG_LOOKUP_CHUNK = 100
+
+    def __init__(self, user, batch_size=500):
+        self.user = user
+        self.batch_size = batch_size
+        self.report = ImportReport()
+
+    def run(self, lines):
+        batch = []
+        for number, raw in enumerate(lines, start=1):
+            if isinstance(raw, bytes):
+                raw = raw.decode("utf-8", errors="replace")
+            if not raw.strip():
+                continue
+            try:
+                data = json.loads(raw)
+            except ValueError as exc:
+                self.report.add_error(
+                    number, {"non_field_errors": [f"Invalid JSON: {exc}"]}
+                )
+                continue
+            if not isinstance(data, dict):
+                self.report.add_error(
+                    number, {"non_field_errors": ["Expected a JSON object."]}
+                )
+                continue
+            batch.append((number, data))
+            if len(batch) >= self.batch_size:
+                self.import_batch(batch)
+                batch = []
+        if batch:
+            self.import_batch(batch)
+        return self.report
+
+    def import_batch(self, batch):
+        rows = []
+        for number, data in batch:
+            serializer = ArticleImportRowSerializer(data=data)
+            if serializer.is_valid():
+                rows.append((number, serializer.validated_data))
+            else:
+                self.report.add_error(number, serializer.errors)
+
+        categories = self.existing_categories(rows)
+        authors = self.resolve_authors(rows)
+        valid = []
+        for number, row in rows:
+            errors = {}
+            if row.get("category") and row["category"] not in categories:
+                errors["category"] = [
+                    f'Invalid pk "{row["category"]}" - object does not exist.'
+                ]
+            if row.get("author") and row["author"].lower() not in authors:
+                errors["author"] = [f'No user with email "{row["author"]}".']
+            if not (row.get("slug") or slugify(row["title"])):
+                errors["slug"] = ["Could not derive a slug from the title."]
+            if errors:
+                self.report.add_error(number, errors)
+            else:
+                valid.append((number, row))
+        if not valid:
+            return
+
+        slugs = self.resolve_slugs(
+            [
+                row.get("slug") or slugify(row["title"])[:SLUG_MAX_LENGTH]
+                for _, row in valid
+            ]
+        )
+        default_author = self.user.pk
+        articles = [
+            Article(
+                title=row["title"],
+                slug=slug,
+                body=row["body"],
+                # bulk_create skips Article.save(), which fills this in.
+                excerpt=row["excerpt"] or Article.make_excerpt(row["body"]),
+                status=row["status"],
+                category_id=row.get("category"),
+                author_id=(
+                    authors[row["author"].lower()] if row.get("author") else default_author
+                ),
+                created_by_id=self.user.pk,
+                updated_by_id=self.user.pk,
+            )
+            for (_, row), slug in zip(valid, slugs)
+        ]
+        for article in articles:
+            # Imported articles are back-catalogue: stamped, never fanned out.
+            article.stamp_published()
+        try:
+            with transaction.atomic():
+                created = Article.objects.bulk_create(articles)
+        except IntegrityError:
+            # A concurrent writer took one of the slugs; isolate the row.
+            created = self.insert_one_by_one(valid, articles)
+        self.report.created += len(created)
+        # bulk_create sends no post_save either.
+        invalidate_articles(created)
+
+    def insert_one_by_one(self, valid, articles):
+        created = []
+        for (number, _), article in zip(valid, articles):
+            try:
+                with transaction.atomic():
+                    article.save()
+            except IntegrityError as exc:
+                self.report.add_error(number, {"non_field_errors": [str(exc)]})
+            else:
+                created.append(article)
+        return created
+
+    def existing_categories(self, rows):
+        ids = {row["category"] for _, row in rows if row.get("category")}
+        if not ids:
+            return set()
+        return set(Category.objects.filter(pk__in=ids).values_list("pk", flat=True))
+
+    def resolve_authors(self, rows):
+        emails = {row["author"].lower() for _, row in rows if row.get("author")}
+        if not emails:
+            return {}
+        users = (
+            get_user_model()
+            .objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=emails)
+        )
+        return dict(users.values_list("email_lower", "pk"))
+
+    def resolve_slugs(self, wanted):
+        """Return ``wanted`` with every collision (stored or in-batch) suffixed."""
+        taken = set(
+            Article.objects.filter(slug__in=set(wanted)).values_list("slug", flat=True)
+        )
+        counts = {}
+        for slug in wanted:
+            counts[slug] = counts.get(slug, 0) + 1
+        colliding = sorted(
+            slug for slug in counts if slug in taken or counts[slug] > 1
+        )
+        # Only collided bases need their numbered siblings looked up; chunked
+        # to stay clear of SQLite's expression depth limit.
+        for start in range(0, len(colliding), self.SLUG_LOOKUP_CHUNK):
+            chunk = colliding[start : start + self.SLUG_LOOKUP_CHUNK]
+            taken.update(
+                Article.objects.filter(
+                    reduce(or_, (Q(slug__startswith=f"{slug}-") for slug in chunk))
+                ).values_list("slug", flat=True)
+            )
+        resolved = []
+        for slug in wanted:
+            candidate, n = slug, 1
+            while candidate in taken:
+                n += 1
+                suffix = f"-{n}"
+                candidate = slug[: SLUG_MAX_LENGTH - len(suffix)] + suffix
+            taken.add(candidate)
+            resolved.append(candidate)
+        return resolved
@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from articles.rollups import backfill_daily_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the per-day article rollups of a range of days from the likes "
+        "and comments tables, replacing the stored rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--from",
+            dest="first_day",
+            type=date.fromisoformat,
+            required=True,
+            help="First day to recount (YYYY-MM-DD, UTC).",
+        )
+        parser.add_argument(
+            "--to",
+            dest="last_day",
+            type=date.fromisoformat,
+            help="Last day to recount (YYYY-MM-DD, UTC); defaults to today.",
+        )
+        parser.add_argument(
+            "--days-per-batch",
+            type=int,
+            default=7,
+            help="Days recounted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        first_day = options["first_day"]
+        last_day = options["last_day"] or timezone.now().date()
+        if first_day > last_day:
+            raise CommandError("--from must not be after --to.")
+        step = timedelta(days=max(options["days_per_batch"], 1))
+        written = 0
+        while first_day <= last_day:
+            batch_end = min(first_day + step - timedelta(days=1), last_day)
+            rows = backfill_daily_stats(first_day, batch_end)
+            if rows is None:
+                raise CommandError(
+                    "The rollups were never refreshed; run refresh_article_stats "
+                    "first, its first run counts the whole history."
+                )
+            written += rows
+            first_day = batch_end + timedelta(days=1)
+        self.stdout.write(self.style.SUCCESS(f"Recounted {written} article days."))
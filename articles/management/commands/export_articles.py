@@ -0,0 +1,22 @@
+from api.export import ExportCommand
+from articles.export import ARTICLE_EXPORT_COLUMNS
+from articles.models import Article
+
+
+class Command(ExportCommand):
+    help = "Stream articles as CSV or NDJSON."
+    columns = ARTICLE_EXPORT_COLUMNS
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--status", choices=Article.Status.values)
+        parser.add_argument("--category", type=int)
+        parser.add_argument("--author", type=int)
+
+    def get_queryset(self, options):
+        filters = {
+            field: options[field]
+            for field in ("status", "category", "author")
+            if options[field] is not None
+        }
+        return Article.objects.filter(**filters).order_by("pk")
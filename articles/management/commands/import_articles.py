@@ -0,0 +1,45 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from articles.importer import ArticleImporter
+
+
+class Command(BaseCommand):
+    help = "Import articles from an NDJSON file (one JSON object per line)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help='NDJSON file to read, or "-" for stdin.')
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="Email of the importing user; authors rows without an author.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of lines validated and inserted per batch.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(email__iexact=options["user"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'No user with email "{options["user"]}".')
+
+        importer = ArticleImporter(user, batch_size=options["batch_size"])
+        if options["path"] == "-":
+            report = importer.run(sys.stdin)
+        else:
+            with open(options["path"], encoding="utf-8") as lines:
+                report = importer.run(lines)
+
+        for error in report.errors:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report.created} articles; {len(report.errors)} lines failed."
+            )
+        )
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from articles.cache import invalidate_engagement
+from articles.counters import count_subquery
+from articles.models import Article
+from comments.models import Comment
+from comments.moderation import VISIBLE
+from likes.models import Like
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Article.likes_count, Article.comments_count and "
+        "Comment.replies_count in chunks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of rows updated per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        # Hidden comments are out of both counts, as moderation keeps them.
+        articles = self.rebuild(
+            Article.all_with_deleted,
+            chunk_size,
+            likes_count=count_subquery(Like),
+            comments_count=count_subquery(Comment, condition=VISIBLE),
+        )
+        comments = self.rebuild(
+            Comment.all_with_deleted,
+            chunk_size,
+            replies_count=count_subquery(Comment, "parent", VISIBLE),
+        )
+        invalidate_engagement()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt counters for {articles} articles and {comments} comments."
+            )
+        )
+
+    def rebuild(self, manager, chunk_size, **counters):
+        last_pk = 0
+        updated = 0
+        while True:
+            pks = list(
+                manager.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:chunk_size]
+            )
+            if not pks:
+                return updated
+            with transaction.atomic():
+                updated += manager.filter(pk__gte=pks[0], pk__lte=pks[-1]).update(
+                    **counters
+                )
+            last_pk = pks[-1]
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from articles.search import ensure_fts_schema, rebuild_fts_index
+
+
+class Command(BaseCommand):
+    help = "Recreate the article full-text index triggers and reindex every article."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if not ensure_fts_schema(using):
+            raise CommandError("This database does not support SQLite FTS5.")
+        rebuild_fts_index(using)
+        self.stdout.write(self.style.SUCCESS("Article search index rebuilt."))
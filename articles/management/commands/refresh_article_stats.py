@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from articles.rollups import refresh_daily_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold likes and comments newer than the last run into the per-day "
+        "article rollups. Meant to run periodically (e.g. every minute from cron)."
+    )
+
+    def handle(self, *args, **options):
+        result = refresh_daily_stats()
+        if result is None:
+            self.stdout.write(self.style.WARNING("Another run consumed this window."))
+            return
+        touched, until = result
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated {touched} article days with events up to {until.isoformat()}."
+            )
+        )
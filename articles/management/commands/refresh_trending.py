@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from articles.trending import refresh_trending
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold likes and comments newer than the last run into the trending "
+        "scores. Meant to run periodically (e.g. every minute from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Drop all scores and recompute them from every event.",
+        )
+
+    def handle(self, *args, **options):
+        result = refresh_trending(rebuild=options["rebuild"])
+        if result is None:
+            self.stdout.write(self.style.WARNING("Another run consumed this window."))
+            return
+        touched, until = result
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated {touched} articles with events up to {until.isoformat()}."
+            )
+        )
@@ -0,0 +1,50 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:33
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Article = apps.get_model("articles", "Article")
+    Like = apps.get_model("likes", "Like")
+    Comment = apps.get_model("comments", "Comment")
+
+    def count_subquery(model):
+        return Coalesce(
+            Subquery(
+                model.objects.filter(article=OuterRef("pk"))
+                .order_by()
+                .values("article")
+                .annotate(total=Count("pk"))
+                .values("total")
+            ),
+            0,
+        )
+
+    Article.objects.update(
+        likes_count=count_subquery(Like),
+        comments_count=count_subquery(Comment),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("articles", "0001_initial"),
+        ("comments", "0001_initial"),
+        ("likes", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="comments_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="likes_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
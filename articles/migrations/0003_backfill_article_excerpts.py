@@ -0,0 +1,32 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:05
+
+from django.db import migrations
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+EXCERPT_LENGTH = 280
+
+
+def backfill_excerpts(apps, schema_editor):
+    Article = apps.get_model("articles", "Article")
+    blank = Article.objects.filter(excerpt="").only("pk", "body")
+    batch = []
+    for article in blank.iterator(chunk_size=500):
+        text = " ".join(strip_tags(article.body).split())
+        article.excerpt = Truncator(text).chars(EXCERPT_LENGTH)
+        batch.append(article)
+        if len(batch) >= 500:
+            Article.objects.bulk_update(batch, ["excerpt"])
+            batch = []
+    if batch:
+        Article.objects.bulk_update(batch, ["excerpt"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("articles", "0002_article_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_excerpts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("articles", "0003_backfill_article_excerpts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="cover_image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
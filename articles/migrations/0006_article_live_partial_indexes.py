@@ -0,0 +1,100 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("articles", "0005_article_list_indexes"),
+        ("category", "0003_category_created_at_category_created_by_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="article",
+            name="article_status_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="article",
+            name="article_author_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="article",
+            name="article_category_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="article",
+            name="article_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="article",
+            name="article_updated_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="article",
+            name="article_title_idx",
+        ),
+        migrations.AlterField(
+            model_name="article",
+            name="slug",
+            field=models.SlugField(db_index=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["status", "created_at"],
+                name="article_status_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["author", "created_at"],
+                name="article_author_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["category", "created_at"],
+                name="article_category_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["created_at"],
+                name="article_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["updated_at"],
+                name="article_updated_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["title"],
+                name="article_title_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="article",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("slug",),
+                name="article_live_slug_uniq",
+            ),
+        ),
+    ]
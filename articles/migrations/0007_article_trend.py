@@ -0,0 +1,40 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("articles", "0006_article_live_partial_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArticleTrend",
+            fields=[
+                (
+                    "article",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="trend",
+                        serialize=False,
+                        to="articles.article",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                ("listed", models.BooleanField(default=False)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("listed", True)),
+                        fields=["-score"],
+                        name="article_trend_listed_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("articles", "0007_article_trend"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="views_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:28
+
+from django.db import migrations, models
+
+
+def backfill_published_at(apps, schema_editor):
+    # Publication times were never recorded; creation is the best estimate.
+    Article = apps.get_model("articles", "Article")
+    Article.objects.filter(status="Published", published_at__isnull=True).update(
+        published_at=models.F("created_at")
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("articles", "0008_article_views_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="published_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_published_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                condition=models.Q(
+                    ("deleted_at__isnull", True),
+                    ("status", "Published"),
+                ),
+                fields=["author", "published_at"],
+                name="article_author_published_idx",
+            ),
+        ),
+    ]
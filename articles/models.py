@@ -1,16 +1,27 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.conf import settings
-from mixins.model_mixin import AuditModel
+from django.dispatch import Signal
+from django.utils import timezone
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+from mixins.model_mixin import LIVE, AuditModel
+
+# Sent by ``Article.save()`` the first time an article is saved as published.
+article_published = Signal()
 
 
 class Article(AuditModel):
+    EXCERPT_LENGTH = 280
+
     class Status(models.TextChoices):
         DRAFT = "Draft", "Draft"
         PUBLISHED = "Published", "Published"
         ARCHIVED = "Archived", "Archived"
 
     title = models.CharField(max_length=255)
-    slug = models.SlugField(max_length=255, unique=True)
+    slug = models.SlugField(max_length=255, db_index=False)
     body = models.TextField()
     excerpt = models.TextField(blank=True, default="")
     author = models.ForeignKey(
@@ -26,15 +37,187 @@ class Article(AuditModel):
         related_name="articles",
     )
     cover_image = models.ImageField(upload_to="articles/", null=True, blank=True)
+    cover_image_variants = models.JSONField(default=dict, blank=True, editable=False)
     status = models.CharField(
         max_length=10,
         choices=Status.choices,
         default=Status.DRAFT,
     )
+    published_at = models.DateTimeField(null=True, blank=True, editable=False)
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+    views_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Only ever changed with ``F()`` updates; a full ``save()`` of an article
+    # loaded earlier must not write back a stale value.
+    COUNTER_FIELDS = ("likes_count", "comments_count", "views_count")
 
     class Meta:
         ordering = ["-created_at"]
         verbose_name_plural = "Articles"
+        constraints = [
+            # A deleted article gives its slug back.
+            models.UniqueConstraint(
+                fields=["slug"], condition=LIVE, name="article_live_slug_uniq"
+            ),
+        ]
+        # One per list filter combined with the default ordering, plus one
+        # per orderable column. The rowid rides along in every index, so the
+        # keyset ``id`` tie-breaker needs no column of its own. All are
+        # partial: soft-deleted rows never make them bigger.
+        indexes = [
+            models.Index(
+                fields=["status", "created_at"],
+                condition=LIVE,
+                name="article_status_created_idx",
+            ),
+            models.Index(
+                fields=["author", "created_at"],
+                condition=LIVE,
+                name="article_author_created_idx",
+            ),
+            models.Index(
+                fields=["category", "created_at"],
+                condition=LIVE,
+                name="article_category_created_idx",
+            ),
+            models.Index(
+                fields=["created_at"], condition=LIVE, name="article_created_idx"
+            ),
+            models.Index(
+                fields=["updated_at"], condition=LIVE, name="article_updated_idx"
+            ),
+            models.Index(fields=["title"], condition=LIVE, name="article_title_idx"),
+            # Followed authors' articles read at feed time (feeds.timeline).
+            models.Index(
+                fields=["author", "published_at"],
+                condition=LIVE & models.Q(status="Published"),
+                name="article_author_published_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_body()
+        return instance
+
+    def remember_body(self):
+        """Note the stored body, to tell whether ``excerpt`` was made from it."""
+        if "body" not in self.get_deferred_fields():
+            self._stored_body = self.body
+
+    def excerpt_is_stale(self):
+        """Blank, or generated from a body that has since been edited."""
+        if not self.excerpt.strip():
+            return True
+        stored = getattr(self, "_stored_body", None)
+        return (
+            stored is not None
+            and self.body != stored
+            and self.excerpt == self.make_excerpt(stored)
+        )
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        if self.excerpt_is_stale():
+            self.excerpt = self.make_excerpt(self.body)
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "excerpt"}
+        publishing = self.stamp_published()
+        if publishing and kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "published_at"}
+        super().save(*args, **kwargs)
+        self.remember_body()
+        if publishing:
+            article_published.send(sender=type(self), instance=self)
+
+    def stamp_published(self):
+        """Set ``published_at`` on the first publication; True if it was set."""
+        if self.status != self.Status.PUBLISHED or self.published_at is not None:
+            return False
+        self.published_at = timezone.now()
+        return True
+
+    @classmethod
+    def make_excerpt(cls, body: str) -> str:
+        """Plain-text prefix of ``body``, whitespace-collapsed and bounded."""
+        text = " ".join(strip_tags(body).split())
+        return Truncator(text).chars(cls.EXCERPT_LENGTH)
+
+    @classmethod
+    def adjust_counter(cls, article_id, field: str, delta: int):
+        """Atomically add ``delta`` to a denormalized counter, never below zero."""
+        cls.all_with_deleted.filter(pk=article_id).update(
+            **{field: Greatest(F(field) + delta, 0)}
+        )
+
+
+class ArticleTrend(models.Model):
+    """
+    Materialized trending score, maintained by ``articles.trending``.
+
+    ``score`` is ``log(sum(weight * exp(rate * (t - EPOCH))))`` over the
+    article's likes and comments: ordering by it equals ordering by the
+    exponentially decayed engagement at any moment, and new events are
+    folded in without touching older ones. ``listed`` mirrors "published and
+    not deleted" so the top-N read never has to consult ``articles_article``
+    to filter.
+    """
+
+    article = models.OneToOneField(
+        Article, on_delete=models.CASCADE, primary_key=True, related_name="trend"
+    )
+    score = models.FloatField()
+    listed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-score"],
+                condition=models.Q(listed=True),
+                name="article_trend_listed_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.article_id}: {self.score:.3f}"
+
+    @staticmethod
+    def is_listed(status, deleted_at):
+        return status == Article.Status.PUBLISHED and deleted_at is None
+
+
+class ArticleDailyStats(models.Model):
+    """
+    Likes and comments an article received per UTC day, maintained by
+    ``articles.rollups`` so time series never read the raw event tables.
+    """
+
+    article = models.ForeignKey(
+        Article, on_delete=models.CASCADE, related_name="daily_stats"
+    )
+    day = models.DateField()
+    likes = models.PositiveIntegerField(default=0)
+    comments = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # Also the index every date range read walks.
+            models.UniqueConstraint(
+                fields=["article", "day"], name="article_daily_stats_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.article_id} @ {self.day}: {self.likes}/{self.comments}"
@@ -1,5 +1,6 @@
 from rest_framework.permissions import BasePermission
 from authentication.models import Permission
+from authentication.permissions import request_has_permission
 
 
 class CanWriteArticle(BasePermission):
@@ -10,4 +11,4 @@ class CanWriteArticle(BasePermission):
             return False
         if request.method in ("GET", "HEAD", "OPTIONS"):
             return True
-        return request.user.has_app_permission(Permission.WRITE)
+        return request_has_permission(request, Permission.WRITE)
@@ -0,0 +1,161 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from jobs.models import Watermark
+from .counters import engagement_events
+from .models import Article, ArticleDailyStats
+
+WATERMARK = "articles.daily_stats"
+
+DEFAULTS = {
+    # Events younger than this are left for the next run (see TRENDING).
+    "LAG_SECONDS": 60,
+    # Longest range GET /articles/{id}/stats/ answers.
+    "MAX_DAYS": 366,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "ARTICLE_STATS", {})}
+
+
+def day_start(day):
+    return datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+
+
+def day_counts(window):
+    """
+    ``{(article_id, day): {"likes": n, "comments": n}}`` for the events
+    matching ``window`` (a ``Q`` on ``created_at``); one ``GROUP BY`` query
+    per event table.
+    """
+    counts = defaultdict(lambda: {"likes": 0, "comments": 0})
+    for field, manager in engagement_events().items():
+        rows = (
+            manager.filter(window)
+            .annotate(day=TruncDate("created_at", tzinfo=dt_timezone.utc))
+            .order_by()
+            .values("article_id", "day")
+            .annotate(total=Count("pk"))
+            .values_list("article_id", "day", "total")
+        )
+        for article_id, day, total in rows.iterator():
+            counts[(article_id, day)][field] += total
+    return counts
+
+
+def apply_counts(counts, batch_size=500):
+    """Add ``counts`` to the stored rollups with one upsert per batch."""
+    keys = list(counts)
+    for start in range(0, len(keys), batch_size):
+        batch = keys[start : start + batch_size]
+        article_ids = {article_id for article_id, _ in batch}
+        stored = {
+            (article_id, day): (likes, comments)
+            for article_id, day, likes, comments in ArticleDailyStats.objects.filter(
+                article_id__in=article_ids, day__in={day for _, day in batch}
+            ).values_list("article_id", "day", "likes", "comments")
+        }
+        # Events can outlive a purged article.
+        existing = set(
+            Article.all_with_deleted.filter(pk__in=article_ids).values_list(
+                "pk", flat=True
+            )
+        )
+        rows = []
+        for key in batch:
+            if key[0] not in existing:
+                continue
+            likes, comments = stored.get(key, (0, 0))
+            rows.append(
+                ArticleDailyStats(
+                    article_id=key[0],
+                    day=key[1],
+                    likes=likes + counts[key]["likes"],
+                    comments=comments + counts[key]["comments"],
+                )
+            )
+        ArticleDailyStats.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["article", "day"],
+            update_fields=["likes", "comments"],
+        )
+
+
+def refresh_daily_stats(now=None):
+    """
+    Fold likes and comments newer than the watermark into the daily rollups
+    and advance it. Returns ``(rows_touched, window_end)`` or ``None`` if a
+    concurrent run already consumed the window. The first run folds in the
+    whole history.
+
+    Likes and comments removed, or comments hidden, before a run are never
+    counted; once counted they are not subtracted. ``backfill_daily_stats``
+    recounts a range of days from the likes and visible comments that exist.
+    """
+    until = (now or timezone.now()) - timedelta(seconds=get_config()["LAG_SECONDS"])
+    with transaction.atomic():
+        mark = Watermark.objects.select_for_update().filter(name=WATERMARK).first()
+        since = mark.value if mark else None
+        if since is not None and since >= until:
+            return 0, since
+        window = Q(created_at__lte=until)
+        if since is not None:
+            window &= Q(created_at__gt=since)
+        counts = day_counts(window)
+        apply_counts(counts)
+        if not Watermark.advance(WATERMARK, since, until):
+            transaction.set_rollback(True)
+            return None
+    return len(counts), until
+
+
+def backfill_daily_stats(first_day, last_day):
+    """
+    Recount the rollups of ``first_day`` through ``last_day`` from the event
+    tables, replacing what is stored. Events after the watermark are left to
+    ``refresh_daily_stats`` so they are never counted twice. Returns the rows
+    written, or ``None`` if the rollups were never refreshed.
+    """
+    with transaction.atomic():
+        # Locked so a concurrent refresh cannot add to rows replaced here.
+        mark = Watermark.objects.select_for_update().filter(name=WATERMARK).first()
+        if mark is None:
+            return None
+        end = day_start(last_day + timedelta(days=1))
+        if mark.value < end:
+            # Refresh windows are closed at the top: (since, until].
+            window = Q(created_at__lte=mark.value)
+        else:
+            window = Q(created_at__lt=end)
+        window &= Q(created_at__gte=day_start(first_day))
+        ArticleDailyStats.objects.filter(day__gte=first_day, day__lte=last_day).delete()
+        counts = day_counts(window)
+        apply_counts(counts)
+    return len(counts)
+
+
+def daily_series(article_id, first_day, last_day):
+    """One entry per day of the range, zero-filled, read from the rollups only."""
+    stored = {
+        day: (likes, comments)
+        for day, likes, comments in ArticleDailyStats.objects.filter(
+            article_id=article_id, day__gte=first_day, day__lte=last_day
+        )
+        .order_by("day")
+        .values_list("day", "likes", "comments")
+    }
+    series = []
+    day = first_day
+    while day <= last_day:
+        likes, comments = stored.get(day, (0, 0))
+        series.append({"day": day, "likes": likes, "comments": comments})
+        day += timedelta(days=1)
+    return series
@@ -0,0 +1,143 @@
+from django.db import OperationalError, connections, transaction
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+FTS_TABLE = "articles_article_fts"
+FTS_COLUMNS = ("title", "body", "excerpt", "slug")
+
+# What snippet() puts around matches. The text is HTML-escaped before these
+# become <mark> tags, so no other markup from an article survives.
+MARK_START = "\x02"
+MARK_END = "\x03"
+
+_available = {}
+
+
+def _column_list(prefix=""):
+    return ", ".join(f"{prefix}{col}" for col in FTS_COLUMNS)
+
+
+def fts_schema_statements():
+    """
+    SQL creating the external-content FTS5 index and the triggers that keep
+    it in step with ``articles_article``.
+
+    Everything is ``IF NOT EXISTS`` so it can be replayed after every
+    migration: SQLite migrations that rebuild ``articles_article`` drop its
+    triggers along with the old table.
+    """
+    cols = _column_list()
+    new_cols = _column_list("new.")
+    old_cols = _column_list("old.")
+    delete_old = (
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) "
+        f"VALUES ('delete', old.id, {old_cols});"
+    )
+    insert_new = (
+        f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_cols});"
+    )
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{cols}, content='articles_article', content_rowid='id', "
+        f"tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON "
+        f"articles_article BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON "
+        f"articles_article BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {cols} ON "
+        f"articles_article BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def ensure_fts_schema(using="default"):
+    """Create the FTS index and triggers; rebuild the index if it is new."""
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return False
+    created = FTS_TABLE not in connection.introspection.table_names()
+    try:
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            for statement in fts_schema_statements():
+                cursor.execute(statement)
+            if created:
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+                )
+    except OperationalError:
+        # SQLite compiled without FTS5: search keeps using icontains.
+        return False
+    finally:
+        _available.pop(connection.settings_dict["NAME"], None)
+    return True
+
+
+def rebuild_fts_index(using="default"):
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def fts_available(using="default"):
+    connection = connections[using]
+    key = connection.settings_dict["NAME"]
+    if key not in _available:
+        _available[key] = (
+            connection.vendor == "sqlite"
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _available[key]
+
+
+def render_snippet(snippet):
+    """``snippet()`` output as safe HTML with the matches in ``<mark>``."""
+    return (
+        escape(snippet).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+    )
+
+
+def build_match_query(terms):
+    """Quote each term (FTS5 syntax is not user input) and prefix-match it."""
+    return " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+class ArticleSearchFilter(SearchFilter):
+    """
+    ``?search=`` backed by the FTS5 index, ranked by BM25 with a highlighted
+    ``search_snippet`` (see ``render_snippet``). Falls back to ``SearchFilter``'s ``icontains`` lookups
+    on databases without the index.
+
+    Place it after ``OrderingFilter``: unless the client asked for an explicit
+    ``?ordering=``, results are ordered by relevance.
+    """
+
+    snippet_tokens = 16
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms or not fts_available(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        match = build_match_query(terms)
+        table = queryset.model._meta.db_table
+        scoped = (
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"AND {FTS_TABLE}.rowid = {table}.id"
+        )
+        queryset = queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+            )
+        ).annotate(
+            search_rank=RawSQL(f"(SELECT bm25({FTS_TABLE}) {scoped})", [match]),
+            search_snippet=RawSQL(
+                f"(SELECT snippet({FTS_TABLE}, -1, %s, %s, '…', "
+                f"{self.snippet_tokens}) {scoped})",
+                [MARK_START, MARK_END, match],
+            ),
+        )
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            # BM25 scores are negative; the best match has the lowest value.
+            queryset = queryset.order_by("search_rank")
+        return queryset
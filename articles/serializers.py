@@ -1,17 +1,42 @@
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 from drf_spectacular.utils import extend_schema_field
 from drf_spectacular.types import OpenApiTypes
+from .counters import VIEWS_COUNT_HELP
+from .rollups import get_config as get_stats_config
+from .search import render_snippet
 from .models import Article
+from api.fields import UserFlagField, UserFlagListSerializer
 from category.serializers import CategorySerializer
+from likes.buffer import pending_likes
+from likes.models import Like
+from mixins.image_variants import ImageVariantsField, ImageVariantsMixin
+
+
+class SearchSnippetField(serializers.CharField):
+    def to_representation(self, value):
+        return render_snippet(value)
 
 
 class ArticleListSerializer(serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     author_email = serializers.EmailField(source="author.email", read_only=True)
-    likes_count = serializers.IntegerField(read_only=True, default=0)
-    comments_count = serializers.IntegerField(read_only=True, default=0)
-    is_liked = serializers.BooleanField(read_only=True, default=False)
+    is_liked = UserFlagField(Like, "article", pending=pending_likes)
+    search_snippet = SearchSnippetField(read_only=True, default=None)
+    trending_score = serializers.FloatField(read_only=True, default=None)
+    views_count = serializers.IntegerField(read_only=True, help_text=VIEWS_COUNT_HELP)
+    cover_image_variants = ImageVariantsField()
+
+    class Meta:
+        model = Article
+        exclude = ["body"]
+        list_serializer_class = UserFlagListSerializer
 
+
+class ArticleDetailSerializer(ArticleListSerializer):
     class Meta:
         model = Article
         fields = "__all__"
@@ -23,6 +48,10 @@ class ArticleSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+# The slug constraint only covers live rows, which DRF does not infer.
+LIVE_SLUG_VALIDATOR = UniqueValidator(queryset=Article.objects.all())
+
+
 class BinaryImageField(serializers.ImageField):
     pass
 
@@ -30,7 +59,8 @@ class BinaryImageField(serializers.ImageField):
 extend_schema_field(OpenApiTypes.BINARY)(BinaryImageField)
 
 
-class ArticleCreateSerializer(serializers.ModelSerializer):
+class ArticleCreateSerializer(ImageVariantsMixin, serializers.ModelSerializer):
+    image_variant_fields = {"cover_image": "cover_image_variants"}
     cover_image = BinaryImageField(required=False, allow_null=True)
 
     class Meta:
@@ -44,9 +74,11 @@ class ArticleCreateSerializer(serializers.ModelSerializer):
             "cover_image",
             "status",
         ]
+        extra_kwargs = {"slug": {"validators": [LIVE_SLUG_VALIDATOR]}}
 
 
-class ArticleUpdateSerializer(serializers.ModelSerializer):
+class ArticleUpdateSerializer(ImageVariantsMixin, serializers.ModelSerializer):
+    image_variant_fields = {"cover_image": "cover_image_variants"}
     cover_image = BinaryImageField(required=False, allow_null=True)
 
     class Meta:
@@ -60,3 +92,38 @@ class ArticleUpdateSerializer(serializers.ModelSerializer):
             "cover_image",
             "status",
         ]
+        extra_kwargs = {"slug": {"validators": [LIVE_SLUG_VALIDATOR]}}
+
+
+class ArticleStatsQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        end = attrs.get("end") or timezone.now().date()
+        start = attrs.get("start") or end - timedelta(days=29)
+        if start > end:
+            raise serializers.ValidationError({"start": "Must not be after end."})
+        max_days = get_stats_config()["MAX_DAYS"]
+        if (end - start).days >= max_days:
+            raise serializers.ValidationError(
+                {"start": f"A range covers at most {max_days} days."}
+            )
+        return {"start": start, "end": end}
+
+
+class DailyStatsSerializer(serializers.Serializer):
+    day = serializers.DateField()
+    likes = serializers.IntegerField()
+    comments = serializers.IntegerField()
+
+
+class ArticleStatsSerializer(serializers.Serializer):
+    article = serializers.IntegerField()
+    start = serializers.DateField()
+    end = serializers.DateField()
+    as_of = serializers.DateTimeField(
+        allow_null=True,
+        help_text="Likes and comments up to this moment are counted.",
+    )
+    days = DailyStatsSerializer(many=True)
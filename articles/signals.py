@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate, invalidate_article, invalidate_engagement
+from .counters import article_views
+from .models import Article, ArticleTrend
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_article_feed(sender, instance, **kwargs):
+    invalidate_article(instance)
+
+
+@receiver(post_save, sender=Article)
+def sync_trend_listing(sender, instance, **kwargs):
+    ArticleTrend.objects.filter(article_id=instance.pk).update(
+        listed=ArticleTrend.is_listed(instance.status, instance.deleted_at)
+    )
+
+
+@receiver(post_save, sender="likes.Like")
+@receiver(post_delete, sender="likes.Like")
+@receiver(post_save, sender="comments.Comment")
+@receiver(post_delete, sender="comments.Comment")
+def invalidate_article_engagement(sender, instance, **kwargs):
+    invalidate_engagement(instance.article_id)
+
+
+@receiver(post_save, sender="category.Category")
+@receiver(post_delete, sender="category.Category")
+def invalidate_category(sender, instance, **kwargs):
+    invalidate(f"category:{instance.pk}")
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_author(sender, instance, **kwargs):
+    invalidate(f"user:{instance.pk}")
+
+
+@receiver(request_finished)
+def flush_article_views(sender, **kwargs):
+    article_views.flush_if_due()
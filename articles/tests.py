@@ -1,9 +1,28 @@
+import json
+import os
+import tempfile
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 from authentication.models import User, Role, Permission
 from category.models import Category
-from .models import Article
+from comments.models import Comment
+from comments.moderation import moderate
+from likes.models import Like
+from .cache import feed_cache
+from .counters import article_views
+from .models import Article, ArticleDailyStats, ArticleTrend
+from .rollups import backfill_daily_stats, refresh_daily_stats
+from .trending import refresh_trending
 
 
 def make_writer():
@@ -19,6 +38,11 @@ def make_reader():
     return User.objects.create_user(email='reader@example.com', password='testpass123', role=role)
 
 
+def make_admin():
+    role = Role.objects.create(name='admin', permissions=Permission.ADMIN)
+    return User.objects.create_user(email='admin@example.com', password='testpass123', role=role)
+
+
 class ArticleCRUDTest(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -44,10 +68,10 @@ class ArticleCRUDTest(TestCase):
         )
         resp = self.client.get('/api/v1/articles/')
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(resp.data), 1)
-        self.assertIn('likes_count', resp.data[0])
-        self.assertIn('comments_count', resp.data[0])
-        self.assertIn('is_liked', resp.data[0])
+        self.assertEqual(len(resp.data['results']), 1)
+        self.assertIn('likes_count', resp.data['results'][0])
+        self.assertIn('comments_count', resp.data['results'][0])
+        self.assertIn('is_liked', resp.data['results'][0])
 
     def test_retrieve_article(self):
         article = Article.objects.create(
@@ -71,7 +95,7 @@ class ArticleCRUDTest(TestCase):
             title='A1', slug='a1', body='body', author=self.writer,
         )
         resp = self.client.delete(f'/api/v1/articles/{article.pk}/')
-        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
         self.assertEqual(Article.objects.count(), 0)
 
 
@@ -114,18 +138,846 @@ class ArticleSearchFilterTest(TestCase):
 
     def test_search_by_title(self):
         resp = self.client.get('/api/v1/articles/', {'search': 'Django'})
-        self.assertEqual(len(resp.data), 1)
-        self.assertEqual(resp.data[0]['title'], 'Django Tips')
+        self.assertEqual(len(resp.data['results']), 1)
+        self.assertEqual(resp.data['results'][0]['title'], 'Django Tips')
 
     def test_filter_by_status(self):
         resp = self.client.get('/api/v1/articles/', {'status': 'Published'})
-        self.assertEqual(len(resp.data), 1)
+        self.assertEqual(len(resp.data['results']), 1)
 
     def test_filter_by_category(self):
         resp = self.client.get('/api/v1/articles/', {'category': self.cat.pk})
-        self.assertEqual(len(resp.data), 1)
+        self.assertEqual(len(resp.data['results']), 1)
 
     def test_ordering(self):
         resp = self.client.get('/api/v1/articles/', {'ordering': 'title'})
-        titles = [a['title'] for a in resp.data]
+        titles = [a['title'] for a in resp.data['results']]
         self.assertEqual(titles, sorted(titles))
+
+
+class ArticleCounterTest(TestCase):
+    def setUp(self):
+        self.writer = make_writer()
+        self.article = Article.objects.create(
+            title='A1', slug='a1', body='body', author=self.writer,
+        )
+
+    def test_like_create_and_delete(self):
+        like = Like.objects.create(article=self.article, user=self.writer)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 1)
+        like.delete()
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 0)
+
+    def test_comment_cascade_decrements(self):
+        parent = Comment.objects.create(article=self.article, author=self.writer, body='p')
+        Comment.objects.create(article=self.article, author=self.writer, body='r', parent=parent)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comments_count, 2)
+        parent.delete()
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comments_count, 0)
+
+    def test_rebuild_command(self):
+        Like.objects.create(article=self.article, user=self.writer)
+        Comment.objects.create(article=self.article, author=self.writer, body='c')
+        Article.objects.filter(pk=self.article.pk).update(likes_count=7, comments_count=0)
+        call_command('rebuild_article_counters', chunk_size=1, stdout=StringIO())
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 1)
+        self.assertEqual(self.article.comments_count, 1)
+
+    def test_rebuild_leaves_hidden_comments_out(self):
+        parent = Comment.objects.create(article=self.article, author=self.writer, body='p')
+        replies = [
+            Comment.objects.create(article=self.article, author=self.writer, body='r', parent=parent)
+            for _ in range(2)
+        ]
+        moderate('hide', [replies[0].pk], self.writer)
+        Comment.all_with_deleted.update(replies_count=5)
+        call_command('rebuild_article_counters', chunk_size=2, stdout=StringIO())
+        self.article.refresh_from_db()
+        parent.refresh_from_db()
+        self.assertEqual((self.article.comments_count, parent.replies_count), (2, 1))
+
+
+class ArticlePaginationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.writer = make_writer()
+        self.client.force_authenticate(user=self.writer)
+        for i in range(5):
+            Article.objects.create(title=f'A{i}', slug=f'a{i}', body='body', author=self.writer)
+        # Identical timestamps force the id tie-breaker to do the work.
+        Article.objects.update(created_at=timezone.now())
+
+    def walk(self, url):
+        ids = []
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            ids.extend(a['id'] for a in resp.data['results'])
+            url = resp.data['next']
+        return ids
+
+    def test_pages_cover_all_rows_in_order(self):
+        ids = self.walk('/api/v1/articles/?page_size=2')
+        expected = list(Article.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_insert_during_paging_does_not_shift_pages(self):
+        first = self.client.get('/api/v1/articles/', {'page_size': 2})
+        Article.objects.create(title='New', slug='new', body='body', author=self.writer)
+        rest = self.walk(first.data['next'])
+        seen = [a['id'] for a in first.data['results']] + rest
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(len(seen), 5)
+
+    def test_previous_link_returns_prior_page(self):
+        first = self.client.get('/api/v1/articles/', {'page_size': 2})
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [a['id'] for a in back.data['results']],
+            [a['id'] for a in first.data['results']],
+        )
+
+    def test_no_count_or_offset(self):
+        first = self.client.get('/api/v1/articles/', {'page_size': 2})
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(first.data['next'])
+        # Only the page fetch; the ETag validator aggregate counts on purpose.
+        page_sql = [q['sql'].upper() for q in ctx.captured_queries if 'LIMIT' in q['sql']]
+        self.assertEqual(len(page_sql), 1)
+        self.assertNotIn('COUNT(', page_sql[0])
+        self.assertNotIn('OFFSET', page_sql[0])
+
+    def test_invalid_cursor(self):
+        resp = self.client.get('/api/v1/articles/', {'cursor': 'garbage'})
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ArticleFullTextSearchTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.writer = make_writer()
+        self.client.force_authenticate(user=self.writer)
+        self.once = Article.objects.create(
+            title='Queues', slug='queues', body='A note on caching and queues.',
+            author=self.writer,
+        )
+        self.often = Article.objects.create(
+            title='Caching', slug='caching', body='Caching, caching and more caching.',
+            author=self.writer,
+        )
+
+    def search(self, term, **params):
+        resp = self.client.get('/api/v1/articles/', {'search': term, **params})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.data['results']
+
+    def test_results_ranked_by_relevance(self):
+        results = self.search('caching')
+        self.assertEqual([a['id'] for a in results], [self.often.pk, self.once.pk])
+
+    def test_ranked_results_paginate(self):
+        first = self.client.get('/api/v1/articles/', {'search': 'caching', 'page_size': 1})
+        second = self.client.get(first.data['next'])
+        self.assertEqual(first.data['results'][0]['id'], self.often.pk)
+        self.assertEqual(second.data['results'][0]['id'], self.once.pk)
+        self.assertIsNone(second.data['next'])
+
+    def test_snippet_highlights_match(self):
+        results = self.search('queues')
+        self.assertEqual(len(results), 1)
+        self.assertIn('<mark>', results[0]['search_snippet'])
+
+    def test_snippet_escapes_article_markup(self):
+        Article.objects.create(
+            title='Evil', slug='evil', body='Queues <script>alert(1)</script> here',
+            author=self.writer,
+        )
+        snippet = self.search('alert')[0]['search_snippet']
+        self.assertNotIn('<script>', snippet)
+        self.assertIn('&lt;script&gt;<mark>alert</mark>', snippet)
+
+    def test_explicit_ordering_wins(self):
+        results = self.search('caching', ordering='title')
+        self.assertEqual([a['title'] for a in results], ['Caching', 'Queues'])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.once.body = 'Nothing relevant here.'
+        self.once.title = 'Other'
+        self.once.slug = 'other'
+        self.once.save()
+        self.assertEqual([a['id'] for a in self.search('queues')], [])
+        self.often.delete()
+        self.assertEqual(self.search('caching'), [])
+
+    def test_quotes_in_terms_are_escaped(self):
+        self.assertEqual(len(self.search('"caching OR')), 0)
+        self.assertEqual(len(self.search('"caching')), 2)
+
+
+class ArticleExcerptTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.writer = make_writer()
+        self.client.force_authenticate(user=self.writer)
+
+    def test_blank_excerpt_generated_from_body(self):
+        article = Article.objects.create(
+            title='A1', slug='a1', body='<p>Hello   <b>world</b></p>\n' + 'word ' * 200,
+            author=self.writer,
+        )
+        self.assertTrue(article.excerpt.startswith('Hello world word'))
+        self.assertLessEqual(len(article.excerpt), Article.EXCERPT_LENGTH)
+        self.assertNotIn('<', article.excerpt)
+
+    def test_explicit_excerpt_kept(self):
+        article = Article.objects.create(
+            title='A1', slug='a1', body='Long body', excerpt='Custom', author=self.writer,
+        )
+        self.assertEqual(article.excerpt, 'Custom')
+
+    def test_generated_excerpt_follows_body(self):
+        article = Article.objects.create(title='A1', slug='a1', body='Old body', author=self.writer)
+        resp = self.client.patch(f'/api/v1/articles/{article.pk}/', {'body': 'New body'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        article.refresh_from_db()
+        self.assertEqual(article.excerpt, 'New body')
+
+        article.excerpt = 'Custom'
+        article.save()
+        article.body = 'Newer body'
+        article.save()
+        article.refresh_from_db()
+        self.assertEqual(article.excerpt, 'Custom')
+
+    def test_list_omits_body_and_retrieve_includes_it(self):
+        article = Article.objects.create(title='A1', slug='a1', body='Full body', author=self.writer)
+        with CaptureQueriesContext(connection) as ctx:
+            listed = self.client.get('/api/v1/articles/')
+        self.assertNotIn('body', listed.data['results'][0])
+        self.assertEqual(listed.data['results'][0]['excerpt'], 'Full body')
+        article_sql = [q['sql'] for q in ctx.captured_queries if 'FROM "articles_article"' in q['sql']]
+        self.assertTrue(article_sql)
+        self.assertFalse(any('"articles_article"."body"' in sql for sql in article_sql))
+        detail = self.client.get(f'/api/v1/articles/{article.pk}/')
+        self.assertEqual(detail.data['body'], 'Full body')
+
+
+class ArticleIsLikedTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.writer = make_writer()
+        self.client.force_authenticate(user=self.writer)
+        self.articles = [
+            Article.objects.create(title=f'A{i}', slug=f'a{i}', body='body', author=self.writer)
+            for i in range(3)
+        ]
+        Like.objects.create(article=self.articles[1], user=self.writer)
+
+    def test_list_resolves_flags_with_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get('/api/v1/articles/')
+        flags = {a['id']: a['is_liked'] for a in resp.data['results']}
+        self.assertEqual(flags, {
+            self.articles[0].pk: False,
+            self.articles[1].pk: True,
+            self.articles[2].pk: False,
+        })
+        like_queries = [q for q in ctx.captured_queries if '"likes_like"' in q['sql']]
+        self.assertEqual(len(like_queries), 1)
+        self.assertIn(' IN (', like_queries[0]['sql'])
+
+    def test_retrieve_resolves_single_flag(self):
+        resp = self.client.get(f'/api/v1/articles/{self.articles[1].pk}/')
+        self.assertTrue(resp.data['is_liked'])
+        resp = self.client.get(f'/api/v1/articles/{self.articles[0].pk}/')
+        self.assertFalse(resp.data['is_liked'])
+
+
+class ArticleConditionalGetTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.writer = make_writer()
+        self.client.force_authenticate(user=self.writer)
+        self.article = Article.objects.create(title='A1', slug='a1', body='body', author=self.writer)
+
+    def test_retrieve_not_modified(self):
+        url = f'/api/v1/articles/{self.article.pk}/'
+        first = self.client.get(url)
+        self.assertIn('ETag', first)
+        self.assertIn('Last-Modified', first)
+        again = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.client.patch(url, {'title': 'Changed'})
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+
+    def test_list_not_modified_skips_row_fetch(self):
+        first = self.client.get('/api/v1/articles/')
+        with CaptureQueriesContext(connection) as ctx:
+            again = self.client.get('/api/v1/articles/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('SUM(', ctx.captured_queries[0]['sql'].upper())
+
+    def test_list_etag_follows_counters_and_deletes(self):
+        first = self.client.get('/api/v1/articles/')
+        Like.objects.create(article=self.article, user=self.writer)
+        liked = self.client.get('/api/v1/articles/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(liked.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(liked['ETag'], first['ETag'])
+        self.article.delete()
+        gone = self.client.get('/api/v1/articles/', HTTP_IF_NONE_MATCH=liked['ETag'])
+        self.assertEqual(gone.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_follows_moderation(self):
+        comment = Comment.objects.create(article=self.article, author=self.writer, body='c')
+        first = self.client.get('/api/v1/articles/')
+        moderate('hide', [comment.pk], self.writer)
+        hidden = self.client.get('/api/v1/articles/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(hidden.status_code, status.HTTP_200_OK)
+        self.assertEqual(hidden.data['results'][0]['comments_count'], 0)
+
+    def test_etag_is_per_user(self):
+        first = self.client.get('/api/v1/articles/')
+        self.client.force_authenticate(user=make_reader())
+        other = self.client.get('/api/v1/articles/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(other.status_code, status.HTTP_200_OK)
+
+
+class ArticleFeedCacheTest(TestCase):
+    url = '/api/v1/articles/?status=Published'
+
+    def setUp(self):
+        feed_cache.cache.clear()
+        feed_cache.reset_stats()
+        self.client = APIClient()
+        self.writer = make_writer()
+        self.client.force_authenticate(user=self.writer)
+        self.category = Category.objects.create(name='Tech')
+        self.article = Article.objects.create(
+            title='A1', slug='a1', body='body', author=self.writer,
+            category=self.category, status=Article.Status.PUBLISHED,
+        )
+
+    def test_hit_skips_article_queries(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.url)
+        self.assertEqual(len(resp.data['results']), 1)
+        self.assertFalse(any('"articles_article"' in q['sql'] for q in ctx.captured_queries))
+
+    def test_query_params_are_normalized(self):
+        self.client.get(f'{self.url}&page_size=5')
+        self.client.get(f'/api/v1/articles/?page_size=5&status=Published&search=')
+        self.assertEqual(feed_cache.stats()['articles'], {'hits': 1, 'misses': 1})
+
+    def test_is_liked_is_per_user(self):
+        Like.objects.create(article=self.article, user=self.writer)
+        self.assertTrue(self.client.get(self.url).data['results'][0]['is_liked'])
+        self.client.force_authenticate(user=make_reader())
+        self.assertFalse(self.client.get(self.url).data['results'][0]['is_liked'])
+        self.assertEqual(feed_cache.stats()['articles']['hits'], 1)
+
+    def test_like_and_comment_invalidate_article(self):
+        self.client.get(self.url)
+        Like.objects.create(article=self.article, user=self.writer)
+        self.assertEqual(self.client.get(self.url).data['results'][0]['likes_count'], 1)
+        Comment.objects.create(article=self.article, author=self.writer, body='Hi')
+        self.assertEqual(self.client.get(self.url).data['results'][0]['comments_count'], 1)
+        self.assertEqual(feed_cache.stats()['articles'], {'hits': 0, 'misses': 3})
+
+    def test_new_article_invalidates_scope(self):
+        scoped = f'{self.url}&category={self.category.pk}'
+        self.client.get(scoped)
+        other = Category.objects.create(name='Other')
+        Article.objects.create(
+            title='A2', slug='a2', body='body', author=self.writer,
+            category=other, status=Article.Status.PUBLISHED,
+        )
+        self.assertEqual(len(self.client.get(scoped).data['results']), 1)
+        self.assertEqual(len(self.client.get(self.url).data['results']), 2)
+        Article.objects.create(
+            title='A3', slug='a3', body='body', author=self.writer,
+            category=self.category, status=Article.Status.PUBLISHED,
+        )
+        self.assertEqual(len(self.client.get(scoped).data['results']), 2)
+        stats = feed_cache.stats()
+        self.assertEqual(stats[f'articles:category:{self.category.pk}'], {'hits': 1, 'misses': 2})
+
+    def test_cached_entry_answers_not_modified(self):
+        first = self.client.get(self.url)
+        with CaptureQueriesContext(connection) as ctx:
+            again = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_stats_require_admin(self):
+        resp = self.client.get('/api/v1/articles/cache-stats/')
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=make_admin())
+        self.client.get(self.url)
+        resp = self.client.get('/api/v1/articles/cache-stats/')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['articles'], {'hits': 0, 'misses': 1})
+
+    def test_nested_category_change_invalidates(self):
+        self.client.get(self.url)
+        self.category.name = 'Science'
+        self.category.save()
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.data['results'][0]['category']['name'], 'Science')
+
+
+class ArticleImportTest(TestCase):
+    url = '/api/v1/articles/import/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = make_admin()
+        self.writer = make_writer()
+        self.category = Category.objects.create(name='Tech')
+        self.client.force_authenticate(user=self.admin)
+
+    def post_lines(self, rows, **params):
+        body = '\n'.join(r if isinstance(r, str) else json.dumps(r) for r in rows)
+        query = '&'.join(f'{k}={v}' for k, v in params.items())
+        return self.client.post(
+            f'{self.url}?{query}', body.encode(), content_type='application/x-ndjson'
+        )
+
+    def test_import_reports_line_errors_and_continues(self):
+        resp = self.post_lines([
+            {'title': 'First', 'body': '<p>Hello   world</p>', 'category': self.category.pk},
+            '{not json',
+            {'title': 'No body'},
+            {'title': 'Bad category', 'body': 'x', 'category': 9999},
+            {'title': 'By writer', 'body': 'x', 'author': 'WRITER@example.com'},
+        ])
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['created'], 2)
+        self.assertEqual([e['line'] for e in resp.data['errors']], [2, 3, 4])
+        self.assertIn('body', resp.data['errors'][1]['errors'])
+        self.assertIn('category', resp.data['errors'][2]['errors'])
+        first = Article.objects.get(slug='first')
+        self.assertEqual(first.excerpt, 'Hello world')
+        self.assertEqual(first.author, self.admin)
+        self.assertEqual(Article.objects.get(slug='by-writer').author, self.writer)
+
+    def test_slug_collisions_are_suffixed(self):
+        Article.objects.create(title='Dup', slug='dup', body='x', author=self.writer)
+        Article.objects.create(title='Dup', slug='dup-2', body='x', author=self.writer)
+        rows = [{'title': 'Dup', 'body': 'x'}] * 3 + [{'title': 'x', 'slug': 'dup', 'body': 'x'}]
+        resp = self.post_lines(rows)
+        self.assertEqual(resp.data['created'], 4)
+        self.assertEqual(
+            set(Article.objects.values_list('slug', flat=True)),
+            {'dup', 'dup-2', 'dup-3', 'dup-4', 'dup-5', 'dup-6'},
+        )
+
+    def test_queries_do_not_grow_with_batch(self):
+        rows = [
+            {'title': f'T{i}', 'body': 'x', 'category': self.category.pk, 'author': 'writer@example.com'}
+            for i in range(50)
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.post_lines(rows, batch_size=50)
+        self.assertEqual(resp.data['created'], 50)
+        self.assertLess(len(ctx.captured_queries), 10)
+
+    def test_imported_articles_are_searchable_and_invalidate_feed(self):
+        feed = self.client.get('/api/v1/articles/?status=Published')
+        self.assertEqual(feed.data['results'], [])
+        self.post_lines([{'title': 'Quantum', 'body': 'entanglement', 'status': 'Published'}])
+        feed = self.client.get('/api/v1/articles/?status=Published')
+        self.assertEqual(len(feed.data['results']), 1)
+        found = self.client.get('/api/v1/articles/?search=entanglement')
+        self.assertEqual(len(found.data['results']), 1)
+
+    def test_requires_admin(self):
+        self.client.force_authenticate(user=self.writer)
+        resp = self.post_lines([{'title': 'x', 'body': 'x'}])
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_management_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson', delete=False) as f:
+            f.write(json.dumps({'title': 'From file', 'body': 'x'}) + '\n\n[]\n')
+        self.addCleanup(os.remove, f.name)
+        out, err = StringIO(), StringIO()
+        call_command('import_articles', f.name, user='writer@example.com', stdout=out, stderr=err)
+        self.assertIn('Imported 1 articles; 1 lines failed.', out.getvalue())
+        self.assertIn('line 3', err.getvalue())
+        self.assertEqual(Article.objects.get(slug='from-file').author, self.writer)
+
+
+class ArticleExportTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.writer = make_writer()
+        self.client.force_authenticate(user=self.writer)
+        self.category = Category.objects.create(name='Tech')
+        Article.objects.create(
+            title='Published, one', slug='p1', body='x', author=self.writer,
+            category=self.category, status=Article.Status.PUBLISHED,
+        )
+        Article.objects.create(title='Draft', slug='d1', body='x', author=self.writer)
+
+    def test_csv_export_streams_all_rows(self):
+        resp = self.client.get('/api/v1/articles/export/')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(resp['Content-Type'], 'text/csv')
+        self.assertIn('articles.csv', resp['Content-Disposition'])
+        lines = b''.join(resp.streaming_content).decode().splitlines()
+        self.assertTrue(lines[0].startswith('id,title,slug,status'))
+        self.assertEqual(len(lines), 3)
+        self.assertIn('"Published, one"', lines[2])
+
+    def test_ndjson_export_applies_list_filters(self):
+        resp = self.client.get(
+            f'/api/v1/articles/export/?fmt=ndjson&status=Published&category={self.category.pk}'
+        )
+        rows = [json.loads(line) for line in b''.join(resp.streaming_content).splitlines()]
+        self.assertEqual([r['slug'] for r in rows], ['p1'])
+        self.assertEqual(rows[0]['author__email'], 'writer@example.com')
+
+    def test_unknown_format_rejected(self):
+        resp = self.client.get('/api/v1/articles/export/?fmt=xml')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command('export_articles', format='ndjson', status='Draft', stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r['slug'] for r in rows], ['d1'])
+
+
+class ArticleSoftDeleteTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.writer = make_writer()
+        self.client.force_authenticate(user=self.writer)
+        self.article = Article.objects.create(title='A1', slug='a1', body='body', author=self.writer)
+        Comment.objects.create(article=self.article, author=self.writer, body='Hi')
+        Like.objects.create(article=self.article, user=self.writer)
+
+    def test_destroy_is_single_update(self):
+        url = f'/api/v1/articles/{self.article.pk}/'
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.delete(url)
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
+        writes = [q['sql'] for q in ctx.captured_queries if not q['sql'].startswith('SELECT')]
+        self.assertFalse(any(sql.startswith('DELETE') for sql in writes))
+        article_writes = [sql for sql in writes if '"articles_article"' in sql]
+        self.assertEqual(len(article_writes), 1)
+        self.assertTrue(article_writes[0].startswith('UPDATE "articles_article"'))
+        # Purged later by the job.
+        self.assertEqual(Comment.all_with_deleted.count(), 1)
+        self.assertEqual(Like.all_with_deleted.count(), 1)
+
+        deleted = Article.all_with_deleted.get(pk=self.article.pk)
+        self.assertTrue(deleted.is_deleted)
+        self.assertEqual(deleted.updated_by, self.writer)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        comments = self.client.get(f'/api/v1/comments/?article={self.article.pk}')
+        self.assertEqual(comments.data['results'], [])
+        self.assertEqual(self.client.get('/api/v1/likes/').data['results'], [])
+
+    def test_slug_is_released(self):
+        self.article.soft_delete()
+        reused = Article.objects.create(title='A1', slug='a1', body='body', author=self.writer)
+        self.assertNotEqual(reused.pk, self.article.pk)
+        resp = self.client.post('/api/v1/articles/', {'title': 'Dup', 'slug': 'a1', 'body': 'x'})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('slug', resp.data)
+
+    def test_counters_keep_tracking_deleted_article(self):
+        self.article.soft_delete()
+        Like.objects.create(article=self.article, user=make_reader())
+        self.assertEqual(Article.all_with_deleted.get(pk=self.article.pk).likes_count, 2)
+
+
+class ArticleViewsCountTest(TestCase):
+    def setUp(self):
+        article_views.discard()
+        self.addCleanup(article_views.discard)
+        patcher = mock.patch.object(article_views, 'interval', 3600)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.writer = make_writer()
+        self.client.force_authenticate(user=self.writer)
+        self.articles = [
+            Article.objects.create(title=f'A{i}', slug=f'a-{i}', body='Body', author=self.writer)
+            for i in range(3)
+        ]
+
+    def view(self, article, times=1):
+        for _ in range(times):
+            resp = self.client.get(f'/api/v1/articles/{article.pk}/')
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def stored(self):
+        return dict(Article.objects.values_list('pk', 'views_count'))
+
+    def test_views_are_buffered_until_flush(self):
+        self.view(self.articles[0], times=3)
+        self.view(self.articles[1])
+        self.assertEqual(set(self.stored().values()), {0})
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(article_views.flush(), 2)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(
+            self.stored(),
+            {self.articles[0].pk: 3, self.articles[1].pk: 1, self.articles[2].pk: 0},
+        )
+        resp = self.client.get(f'/api/v1/articles/{self.articles[0].pk}/')
+        self.assertEqual(resp.data['views_count'], 3)
+
+    def test_flushes_after_request_once_due(self):
+        with mock.patch.object(article_views, 'interval', 0):
+            self.view(self.articles[0])
+        self.assertEqual(self.stored()[self.articles[0].pk], 1)
+        self.assertEqual(article_views.pending(), {})
+
+    def test_not_modified_is_not_counted_and_keeps_etag(self):
+        url = f'/api/v1/articles/{self.articles[0].pk}/'
+        first = self.client.get(url)
+        article_views.flush()
+        again = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(article_views.pending(), {})
+
+    def test_missing_article_is_not_counted(self):
+        resp = self.client.get('/api/v1/articles/99999/')
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(article_views.pending(), {})
+
+    def test_stale_save_keeps_flushed_views(self):
+        article = Article.objects.get(pk=self.articles[0].pk)
+        self.view(article, times=2)
+        article_views.flush()
+        article.title = 'Renamed'
+        article.save()
+        article.refresh_from_db()
+        self.assertEqual((article.title, article.views_count), ('Renamed', 2))
+
+    def test_failed_flush_keeps_views_buffered(self):
+        self.view(self.articles[0])
+        with mock.patch(
+            'django.db.models.QuerySet.update', side_effect=DatabaseError
+        ), self.assertLogs('api.buffers', 'ERROR'):
+            self.assertEqual(article_views.flush(), 0)
+        self.assertEqual(article_views.pending(), {self.articles[0].pk: 1})
+
+
+class ArticleTrendingTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.writer = make_writer()
+        self.client.force_authenticate(user=self.writer)
+        self.now = timezone.now()
+        self.old, self.fresh, self.draft = [
+            Article.objects.create(
+                title=title, slug=title, body='body', author=self.writer, status=state,
+            )
+            for title, state in (
+                ('old', Article.Status.PUBLISHED),
+                ('fresh', Article.Status.PUBLISHED),
+                ('draft', Article.Status.DRAFT),
+            )
+        ]
+        self.readers = [
+            User.objects.create_user(email=f'r{i}@example.com', password='testpass123')
+            for i in range(4)
+        ]
+        for reader in self.readers:
+            self.like(self.old, reader, days_ago=3)
+        self.like(self.fresh, self.readers[0], days_ago=0.1)
+        self.like(self.draft, self.readers[0], days_ago=0.1)
+
+    def like(self, article, user, days_ago):
+        like = Like.objects.create(article=article, user=user)
+        Like.objects.filter(pk=like.pk).update(created_at=self.now - timedelta(days=days_ago))
+
+    def test_recent_engagement_outranks_older(self):
+        refresh_trending(now=self.now)
+        resp = self.client.get('/api/v1/articles/trending/')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([a['slug'] for a in resp.data], ['fresh', 'old'])
+        # Four likes with a 24h half-life, three days ago: 4 / 2**3.
+        self.assertAlmostEqual(resp.data[1]['trending_score'], 0.5, delta=0.01)
+
+    def test_incremental_refresh_matches_rebuild(self):
+        refresh_trending(now=self.now)
+        comment = Comment.objects.create(article=self.old, author=self.writer, body='Hi')
+        Comment.objects.filter(pk=comment.pk).update(created_at=self.now + timedelta(minutes=1))
+        touched, _ = refresh_trending(now=self.now + timedelta(minutes=10))
+        self.assertEqual(touched, 1)
+        incremental = dict(ArticleTrend.objects.values_list('article_id', 'score'))
+        refresh_trending(rebuild=True, now=self.now + timedelta(minutes=10))
+        rebuilt = dict(ArticleTrend.objects.values_list('article_id', 'score'))
+        self.assertEqual(incremental.keys(), rebuilt.keys())
+        for article_id, score in rebuilt.items():
+            self.assertAlmostEqual(incremental[article_id], score)
+
+    def test_hidden_and_deleted_comments_do_not_count(self):
+        for _ in range(2):
+            Comment.objects.create(article=self.old, author=self.writer, body='Hi')
+        Comment.objects.filter(pk=Comment.objects.first().pk).update(is_hidden=True)
+        Comment.objects.last().soft_delete()
+        Comment.all_with_deleted.update(created_at=self.now - timedelta(days=3))
+        refresh_trending(now=self.now)
+        resp = self.client.get('/api/v1/articles/trending/')
+        self.assertAlmostEqual(resp.data[1]['trending_score'], 0.5, delta=0.01)
+
+    def test_window_is_consumed_once(self):
+        self.assertEqual(refresh_trending(now=self.now)[0], 3)
+        self.assertEqual(refresh_trending(now=self.now)[0], 0)
+
+    def test_unpublished_articles_leave_the_ranking(self):
+        refresh_trending(now=self.now)
+        self.fresh.status = Article.Status.DRAFT
+        self.fresh.save()
+        self.old.soft_delete(self.writer)
+        self.assertFalse(ArticleTrend.objects.filter(listed=True).exists())
+        resp = self.client.get('/api/v1/articles/trending/')
+        self.assertEqual(resp.data, [])
+
+    def test_ranking_is_one_query(self):
+        refresh_trending(now=self.now)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/v1/articles/trending/?limit=5')
+        trend_queries = [q for q in ctx.captured_queries if '"articles_articletrend"' in q['sql']]
+        self.assertEqual(len(trend_queries), 1)
+        self.assertIn('LIMIT 5', trend_queries[0]['sql'])
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command('refresh_trending', stdout=out)
+        self.assertIn('Updated 3 articles', out.getvalue())
+
+
+class ArticleDailyStatsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.writer = make_writer()
+        self.client.force_authenticate(user=self.writer)
+        self.now = datetime(2026, 3, 10, 12, 0, tzinfo=dt_timezone.utc)
+        self.article, self.other = [
+            Article.objects.create(title=title, slug=title, body='body', author=self.writer)
+            for title in ('first', 'second')
+        ]
+        self.readers = [
+            User.objects.create_user(email=f'r{i}@example.com', password='testpass123')
+            for i in range(3)
+        ]
+        for reader in self.readers:
+            self.like(self.article, reader, days_ago=2)
+        self.like(self.other, self.readers[0], days_ago=1)
+        self.comment(self.article, days_ago=1)
+
+    def at(self, days_ago):
+        return self.now - timedelta(days=days_ago)
+
+    def like(self, article, user, days_ago):
+        like = Like.objects.create(article=article, user=user)
+        Like.objects.filter(pk=like.pk).update(created_at=self.at(days_ago))
+        return like
+
+    def comment(self, article, days_ago):
+        comment = Comment.objects.create(article=article, author=self.writer, body='Hi')
+        Comment.objects.filter(pk=comment.pk).update(created_at=self.at(days_ago))
+        return comment
+
+    def stored(self):
+        return {
+            (article_id, day.isoformat()): (likes, comments)
+            for article_id, day, likes, comments in ArticleDailyStats.objects.values_list(
+                'article_id', 'day', 'likes', 'comments'
+            )
+        }
+
+    def test_refresh_is_incremental(self):
+        self.assertEqual(refresh_daily_stats(now=self.now)[0], 3)
+        self.assertEqual(refresh_daily_stats(now=self.now)[0], 0)
+        self.comment(self.article, days_ago=0)
+        self.like(self.article, self.writer, days_ago=0)
+        self.like(self.other, self.readers[1], days_ago=0)
+        touched, _ = refresh_daily_stats(now=self.now + timedelta(minutes=10))
+        self.assertEqual(touched, 2)
+        self.assertEqual(self.stored(), {
+            (self.article.pk, '2026-03-08'): (3, 0),
+            (self.article.pk, '2026-03-09'): (0, 1),
+            (self.article.pk, '2026-03-10'): (1, 1),
+            (self.other.pk, '2026-03-09'): (1, 0),
+            (self.other.pk, '2026-03-10'): (1, 0),
+        })
+
+    def test_stats_read_only_the_rollups(self):
+        refresh_daily_stats(now=self.now)
+        url = f'/api/v1/articles/{self.article.pk}/stats/'
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, {'start': '2026-03-07', 'end': '2026-03-10'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertFalse([
+            q for q in ctx.captured_queries
+            if 'likes_like' in q['sql'] or 'comments_comment' in q['sql']
+        ])
+        self.assertEqual(
+            [(d['day'], d['likes'], d['comments']) for d in resp.data['days']],
+            [
+                (date(2026, 3, 7), 0, 0),
+                (date(2026, 3, 8), 3, 0),
+                (date(2026, 3, 9), 0, 1),
+                (date(2026, 3, 10), 0, 0),
+            ],
+        )
+        self.assertEqual(resp.data['as_of'], self.now - timedelta(seconds=60))
+
+    def test_stats_range_is_validated(self):
+        url = f'/api/v1/articles/{self.article.pk}/stats/'
+        resp = self.client.get(url)
+        self.assertEqual(len(resp.data['days']), 30)
+        self.assertIsNone(resp.data['as_of'])
+        for query in (
+            {'start': '2026-03-10', 'end': '2026-03-01'},
+            {'start': '2024-01-01', 'end': '2026-01-01'},
+            {'start': 'yesterday'},
+        ):
+            with self.subTest(query=query):
+                resp = self.client.get(url, query)
+                self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_backfill_recounts_up_to_the_watermark(self):
+        self.assertIsNone(backfill_daily_stats(date(2026, 3, 8), date(2026, 3, 10)))
+        refresh_daily_stats(now=self.now)
+        Like.objects.filter(user=self.readers[0], article=self.article).delete()
+        Comment.objects.update(is_hidden=True)
+        # Newer than the watermark: left to the next refresh.
+        self.comment(self.article, days_ago=0)
+        self.assertEqual(backfill_daily_stats(date(2026, 3, 8), date(2026, 3, 10)), 2)
+        refresh_daily_stats(now=self.now + timedelta(minutes=10))
+        self.assertEqual(self.stored(), {
+            (self.article.pk, '2026-03-08'): (2, 0),
+            (self.article.pk, '2026-03-10'): (0, 1),
+            (self.other.pk, '2026-03-09'): (1, 0),
+        })
+
+    def test_backfill_command(self):
+        with self.assertRaises(CommandError):
+            call_command('backfill_article_stats', '--from', '2026-03-01', stdout=StringIO())
+        refresh_daily_stats(now=self.now)
+        ArticleDailyStats.objects.all().delete()
+        out = StringIO()
+        call_command(
+            'backfill_article_stats', '--from', '2026-03-01', '--to', '2026-03-10',
+            '--days-per-batch', '3', stdout=out,
+        )
+        self.assertIn('Recounted 3 article days', out.getvalue())
+        self.assertEqual(len(self.stored()), 3)
@@ -0,0 +1,133 @@
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from jobs.models import Watermark
+from .counters import engagement_events
+from .models import Article, ArticleTrend
+
+WATERMARK = "articles.trending"
+# Fixed origin of the log-space scores; never change it without --rebuild.
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+DEFAULTS = {
+    "HALF_LIFE_HOURS": 24,
+    "LIKE_WEIGHT": 1.0,
+    "COMMENT_WEIGHT": 3.0,
+    # Events younger than this are left for the next run, so rows whose
+    # transaction commits a little after their created_at are not skipped.
+    "LAG_SECONDS": 60,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "TRENDING", {})}
+
+
+def decay_rate(config=None):
+    """Per-second decay constant for the configured half-life."""
+    config = config or get_config()
+    return math.log(2) / (config["HALF_LIFE_HOURS"] * 3600)
+
+
+def logaddexp(a, b):
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+def event_key(weight, at, rate):
+    return math.log(weight) + rate * (at - EPOCH).total_seconds()
+
+
+def current_score(key, now=None, rate=None):
+    """The decayed engagement a stored ``key`` stands for at ``now``."""
+    now = now or timezone.now()
+    rate = rate or decay_rate()
+    exponent = key - rate * (now - EPOCH).total_seconds()
+    return math.exp(exponent) if exponent > -700 else 0.0
+
+
+def event_streams(config):
+    weights = {"likes": config["LIKE_WEIGHT"], "comments": config["COMMENT_WEIGHT"]}
+    return [(events, weights[name]) for name, events in engagement_events().items()]
+
+
+def collect_keys(since, until, config, chunk_size=2000):
+    """Fold every event in ``(since, until]`` into one key per article."""
+    rate = decay_rate(config)
+    keys = {}
+    for manager, weight in event_streams(config):
+        events = manager.filter(created_at__lte=until)
+        if since is not None:
+            events = events.filter(created_at__gt=since)
+        rows = events.order_by().values_list("article_id", "created_at")
+        for article_id, created_at in rows.iterator(chunk_size=chunk_size):
+            key = event_key(weight, created_at, rate)
+            keys[article_id] = logaddexp(keys.get(article_id), key)
+    return keys
+
+
+def apply_keys(keys, batch_size=500):
+    """Merge ``keys`` into ``ArticleTrend`` with one upsert per batch."""
+    article_ids = list(keys)
+    for start in range(0, len(article_ids), batch_size):
+        batch = article_ids[start : start + batch_size]
+        stored = dict(
+            ArticleTrend.objects.filter(article_id__in=batch).values_list(
+                "article_id", "score"
+            )
+        )
+        listed = {
+            pk: ArticleTrend.is_listed(status, deleted_at)
+            for pk, status, deleted_at in Article.all_with_deleted.filter(
+                pk__in=batch
+            ).values_list("pk", "status", "deleted_at")
+        }
+        ArticleTrend.objects.bulk_create(
+            [
+                ArticleTrend(
+                    article_id=article_id,
+                    score=logaddexp(stored.get(article_id), keys[article_id]),
+                    listed=listed[article_id],
+                )
+                for article_id in batch
+                # Events can outlive a purged article.
+                if article_id in listed
+            ],
+            update_conflicts=True,
+            unique_fields=["article"],
+            update_fields=["score", "listed", "updated_at"],
+        )
+
+
+def refresh_trending(rebuild=False, now=None):
+    """
+    Fold likes and comments newer than the watermark into the scores and
+    advance it. Returns ``(articles_touched, window_end)`` or ``None`` if a
+    concurrent run already consumed the window.
+
+    Likes and comments removed, or comments hidden, before a run are never
+    counted; once counted they are not subtracted. ``rebuild=True``
+    recomputes everything from scratch.
+    """
+    config = get_config()
+    until = (now or timezone.now()) - timedelta(seconds=config["LAG_SECONDS"])
+    with transaction.atomic():
+        mark = Watermark.objects.filter(name=WATERMARK).first()
+        since = None if rebuild or mark is None else mark.value
+        if since is not None and since >= until:
+            return 0, since
+        keys = collect_keys(since, until, config)
+        if rebuild:
+            ArticleTrend.objects.all().delete()
+        apply_keys(keys)
+        previous = mark.value if mark else None
+        if not Watermark.advance(WATERMARK, previous, until):
+            transaction.set_rollback(True)
+            return None
+    return len(keys), until
@@ -1,51 +1,235 @@
-from django.db.models import Count, Exists, OuterRef
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 
-from .models import Article
-from likes.models import Like
-from comments.models import Comment
+from .models import Article, ArticleTrend
 from .serializers import (
     ArticleSerializer,
     ArticleListSerializer,
+    ArticleDetailSerializer,
     ArticleCreateSerializer,
     ArticleUpdateSerializer,
+    ArticleStatsQuerySerializer,
+    ArticleStatsSerializer,
 )
+from .counters import article_views
+from .export import ARTICLE_EXPORT_COLUMNS
+from .importer import ArticleImporter
 from .permissions import CanWriteArticle
+from .search import ArticleSearchFilter
+from .rollups import WATERMARK as STATS_WATERMARK, daily_series
+from .trending import current_score, decay_rate
+from .cache import (
+    engagement_version,
+    feed_cache,
+    feed_cache_key,
+    feed_entry_tags,
+    feed_scope_tags,
+    is_feed_request,
+)
+from api.export import ExportMixin
+from api.fields import user_flag_fields
+from api.parsers import NDJSONParser
+from api.pagination import KeysetPagination
+from jobs.mixins import BackgroundDeleteMixin
+from jobs.models import Watermark
+from mixins.view_mixin import ConditionalGetMixin
+from users.permissions import IsAdmin
 
 
 @extend_schema(tags=["Articles"])
-class ArticleViewSet(ModelViewSet):
+class ArticleViewSet(
+    ConditionalGetMixin, ExportMixin, BackgroundDeleteMixin, ModelViewSet
+):
     serializer_class = ArticleListSerializer
     permission_classes = [IsAuthenticated, CanWriteArticle]
     parser_classes = (MultiPartParser, FormParser)
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend, OrderingFilter, ArticleSearchFilter]
     filterset_fields = ["status", "category", "author"]
     search_fields = ["title", "body", "excerpt", "slug"]
     ordering_fields = ["created_at", "updated_at", "title"]
     ordering = ["-created_at"]
+    last_modified_fields = ("updated_at", "category__updated_at")
+    # Not views_count: every flush would change the ETag of busy articles.
+    etag_fields = ("likes_count", "comments_count")
+    export_columns = ARTICLE_EXPORT_COLUMNS
+    export_filename = "articles"
 
     def get_queryset(self):
-        qs = Article.objects.select_related("category", "author").annotate(
-            likes_count=Count("likes", distinct=True),
-            comments_count=Count("comments", distinct=True),
-            is_liked=Exists(
-                Like.objects.filter(article=OuterRef("pk"), user=self.request.user)
-            ),
-        )
+        qs = Article.objects.select_related("category", "author")
+        if self.action == "list":
+            qs = qs.defer("body")
         return qs
 
+    def get_list_version(self):
+        # Stands in for the counters in the list ETag (see articles/cache.py).
+        return engagement_version()
+
     def get_serializer_class(self):
         if self.action == "create":
             return ArticleCreateSerializer
         if self.action in ["update", "partial_update"]:
             return ArticleUpdateSerializer
+        if self.action == "retrieve":
+            return ArticleDetailSerializer
         return ArticleListSerializer
 
+    def list(self, request, *args, **kwargs):
+        """
+        The published feed is served from ``feed_cache``. Entries hold the
+        user-independent page plus its validators, so a hit costs no query
+        beyond resolving the caller's own ``is_liked`` flags.
+        """
+        if not is_feed_request(request):
+            return super().list(request, *args, **kwargs)
+        key = feed_cache_key(request)
+        scope = feed_scope_tags(request)
+        entry = feed_cache.get(key, scope)
+        if entry is not None:
+            not_modified = self.evaluate_preconditions(*entry["validators"])
+            if not_modified is not None:
+                return not_modified
+            return Response(self.flag_cached_page(entry["data"]))
+
+        snapshot = feed_cache.get_versions(scope)
+        validators = self.get_list_validators()
+        not_modified = self.evaluate_preconditions(*validators)
+        if not_modified is not None:
+            return not_modified
+        response = self.render_list(request, *args, **kwargs)
+        flags = [field.field_name for field in user_flag_fields(self.get_serializer())]
+        rows = [
+            {name: value for name, value in row.items() if name not in flags}
+            for row in response.data["results"]
+        ]
+        feed_cache.set(
+            key,
+            {"validators": validators, "data": {**response.data, "results": rows}},
+            tags=[*scope, *feed_entry_tags(rows)],
+            snapshot=snapshot,
+        )
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Views are counted in ``article_views`` and reach the database in
+        one batched UPDATE per flush interval, never on this request. A 304
+        is not a view.
+        """
+        response = super().retrieve(request, *args, **kwargs)
+        if response.status_code == 200:
+            article_views.add(int(self.kwargs["pk"]))
+        return response
+
+    def flag_cached_page(self, data):
+        rows = [dict(row) for row in data["results"]]
+        for field in user_flag_fields(self.get_serializer()):
+            field.flag_rows(rows)
+        return {**data, "results": rows}
+
+    @extend_schema(
+        tags=["Articles"],
+        parameters=[OpenApiParameter("limit", OpenApiTypes.INT)],
+        responses=ArticleListSerializer(many=True),
+    )
+    @action(detail=False, methods=["get"])
+    def trending(self, request):
+        """
+        Published articles by time-decayed likes and comments, read from the
+        table ``manage.py refresh_trending`` maintains.
+        """
+        try:
+            limit = int(request.query_params.get("limit", self.paginator.page_size))
+        except ValueError:
+            limit = self.paginator.page_size
+        limit = min(max(limit, 1), self.paginator.max_page_size)
+        trends = (
+            ArticleTrend.objects.filter(listed=True)
+            .select_related("article__category", "article__author")
+            .defer("article__body")
+            .order_by("-score")[:limit]
+        )
+        now, rate = timezone.now(), decay_rate()
+        articles = []
+        for trend in trends:
+            trend.article.trending_score = current_score(trend.score, now, rate)
+            articles.append(trend.article)
+        serializer = ArticleListSerializer(
+            articles, many=True, context=self.get_serializer_context()
+        )
+        return Response(serializer.data)
+
+    @extend_schema(
+        tags=["Articles"],
+        parameters=[ArticleStatsQuerySerializer],
+        responses=ArticleStatsSerializer,
+    )
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        """
+        Likes and comments per UTC day between ``?start=`` and ``?end=``
+        (the last 30 days by default), read only from the rollups that
+        ``manage.py refresh_article_stats`` maintains.
+        """
+        article = self.get_object()
+        query = ArticleStatsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        start, end = query.validated_data["start"], query.validated_data["end"]
+        mark = Watermark.objects.filter(name=STATS_WATERMARK).first()
+        return Response(
+            {
+                "article": article.pk,
+                "start": start,
+                "end": end,
+                "as_of": mark.value if mark else None,
+                "days": daily_series(article.pk, start, end),
+            }
+        )
+
+    @extend_schema(tags=["Articles"], responses={200: dict})
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="cache-stats",
+        permission_classes=[IsAuthenticated, IsAdmin],
+    )
+    def cache_stats(self, request):
+        """Feed cache hits and misses per scope tag since this process started."""
+        return Response(feed_cache.stats())
+
+    @extend_schema(
+        tags=["Articles"],
+        request={"application/x-ndjson": {"type": "string", "format": "binary"}},
+        responses={200: dict},
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[NDJSONParser],
+        permission_classes=[IsAuthenticated, IsAdmin],
+    )
+    def bulk_import(self, request):
+        """
+        Create articles from an NDJSON body, one object per line, in batches
+        of ``?batch_size=`` (default 500). Lines that fail validation are
+        reported by line number and skipped.
+        """
+        try:
+            batch_size = max(1, int(request.query_params.get("batch_size", 500)))
+        except ValueError:
+            batch_size = 500
+        report = ArticleImporter(request.user, batch_size=batch_size).run(request.data)
+        return Response(report.as_dict())
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
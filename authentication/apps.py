@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class AuthenticationConfig(AppConfig):
     name = "authentication"
+
+    def ready(self):
+        from . import schema, signals  # noqa: F401
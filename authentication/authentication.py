@@ -0,0 +1,85 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .cache import user_cache
+from .tokens import PERM_CLAIM, ROLE_ID_CLAIM, ROLE_VERSION_CLAIM, role_version
+
+
+class RoleClaimsJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that trusts the access token's ``perm`` claim.
+
+    The token is rejected (401, ``token_stale``) once the user has been
+    given another role or their role's permissions changed since it was
+    issued; the client then gets a fresh one from the refresh endpoint.
+    The check costs no query beyond simplejwt's own user fetch while the
+    role version is cached.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        self.check_role_claims(validated_token, user)
+        return user
+
+    def check_role_claims(self, validated_token, user):
+        if PERM_CLAIM in validated_token and (
+            validated_token.get(ROLE_ID_CLAIM) != user.role_id
+            or validated_token.get(ROLE_VERSION_CLAIM) != role_version(user.role_id)
+        ):
+            raise AuthenticationFailed(
+                "The token's permissions are out of date.", code="token_stale"
+            )
+
+
+class CachedJWTAuthentication(RoleClaimsJWTAuthentication):
+    """
+    ``RoleClaimsJWTAuthentication`` reading the user, with its role, from
+    the per-process ``user_cache`` (see authentication/cache.py).
+
+    A miss loads the user and role in one query. simplejwt's checks (active
+    user, password not changed) and the role claim check run against the
+    cached row on every request, and saving a ``User`` or ``Role`` drops
+    its entries, so a write in this process is seen at once and one in
+    another within ``AUTH_USER_CACHE["TIMEOUT"]`` seconds.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        user = user_cache.get(user_id)
+        if user is None:
+            generation = user_cache.generation()
+            try:
+                user = self.user_model.objects.select_related("role").get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(
+                    _("User not found"), code="user_not_found"
+                ) from e
+            user_cache.put(user, generation)
+
+        self.check_user(validated_token, user)
+        self.check_role_claims(validated_token, user)
+        return user
+
+    def check_user(self, validated_token, user):
+        """simplejwt's own checks of the loaded user."""
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
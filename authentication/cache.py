@@ -0,0 +1,108 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+DEFAULTS = {
+    # Users kept per process, least recently authenticated dropped first.
+    "MAX_SIZE": 10000,
+    # Seconds a cached user is trusted; bounds staleness in other processes.
+    "TIMEOUT": 30,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "AUTH_USER_CACHE", {})}
+
+
+class UserCache:
+    """
+    Authenticated users, with their role attached, keyed by user id.
+    Ids are compared as strings, the form simplejwt puts in the token.
+
+    A bounded LRU held in process memory: ``get()`` hands out a copy so a
+    request can modify its ``request.user`` without touching the entry.
+    ``forget()`` and ``forget_role()`` are called from the ``User`` and
+    ``Role`` save signals; a user loaded while one of them ran is not
+    stored, so a read racing a write cannot put the old row back.
+    """
+
+    def __init__(self, max_size=10000, timeout=30):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+
+    def generation(self):
+        """Token for ``put()``, taken before the user is read."""
+        return self._generation
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            key = str(user_id)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return copy.copy(entry[1])
+
+    def put(self, user, generation):
+        if self.max_size <= 0 or self.timeout <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            key = str(user.pk)
+            self._entries[key] = (time.monotonic() + self.timeout, copy.copy(user))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def forget(self, user_id):
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(str(user_id), None)
+
+    def forget_role(self, role_id):
+        """Drop every user holding ``role_id``."""
+        with self._lock:
+            self._generation += 1
+            for key in [
+                key for key, (_, user) in self._entries.items() if user.role_id == role_id
+            ]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._hits = self._misses = 0
+
+
+config = get_config()
+
+user_cache = UserCache(max_size=config["MAX_SIZE"], timeout=config["TIMEOUT"])
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("authentication", "0003_user_followers_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="role",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
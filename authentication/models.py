@@ -13,6 +13,22 @@ class Permission(models.IntegerChoices):
 class Role(models.Model):
     name = models.CharField(max_length=64, unique=True)
     permissions = models.IntegerField(default=0)
+    # Bumped whenever ``permissions`` changes; access tokens carry the value
+    # they were issued with and are refused once it moves on.
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    def save(self, *args, **kwargs):
+        if (
+            self.pk is not None
+            and Role.objects.filter(pk=self.pk)
+            .exclude(permissions=self.permissions)
+            .exists()
+        ):
+            self.version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "version"}
+        super().save(*args, **kwargs)
 
     def has_permission(self, perm: Permission) -> bool:
         return bool(self.permissions & perm)
@@ -93,6 +109,8 @@ class User(AbstractUser, PermissionsMixin):
     role = models.ForeignKey(
         Role, on_delete=models.SET_NULL, null=True, blank=True, related_name="users"
     )
+    # Maintained by feeds.signals; decides fan-out vs. read-time merge.
+    followers_count = models.PositiveIntegerField(default=0, editable=False)
 
     objects = UserManager()  # type: ignore
 
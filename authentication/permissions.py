@@ -0,0 +1,13 @@
+from .tokens import PERM_CLAIM
+
+
+def request_has_permission(request, perm):
+    """
+    Check ``perm`` against the access token's permission bitmask. Requests
+    authenticated some other way (or with a token issued before the claim
+    existed) fall back to the user's role.
+    """
+    token = request.auth
+    if token is not None and PERM_CLAIM in token:
+        return bool(token[PERM_CLAIM] & perm)
+    return request.user.has_app_permission(perm)
@@ -0,0 +1,13 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class RoleClaimsJWTScheme(SimpleJWTScheme):
+    """Documents ``RoleClaimsJWTAuthentication`` as the usual bearer scheme."""
+
+    target_class = "authentication.authentication.RoleClaimsJWTAuthentication"
+
+
+class CachedJWTScheme(RoleClaimsJWTScheme):
+    """Documents ``CachedJWTAuthentication`` as the usual bearer scheme."""
+
+    target_class = "authentication.authentication.CachedJWTAuthentication"
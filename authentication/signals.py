@@ -0,0 +1,29 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import user_cache
+from .models import Role, User
+from .tokens import remember_role_version, role_version_key
+
+
+@receiver(post_save, sender=Role)
+def publish_role_version(sender, instance, **kwargs):
+    remember_role_version(instance.pk, instance.version)
+
+
+@receiver(post_delete, sender=Role)
+def forget_role_version(sender, instance, **kwargs):
+    cache.delete(role_version_key(instance.pk))
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def forget_role_users(sender, instance, **kwargs):
+    user_cache.forget_role(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user(sender, instance, **kwargs):
+    user_cache.forget(instance.pk)
@@ -1,7 +1,16 @@
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from articles.models import Article
+from feeds.models import Follow
+from .cache import UserCache, user_cache
 from .models import User, Role, Permission
+from .tokens import tokens_for_user
 
 
 class RoleModelTest(TestCase):
@@ -218,3 +227,160 @@ class ForgotResetPasswordTest(TestCase):
             'new_password': 'resetpass123',
         })
         self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class RoleClaimsTokenTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.role = Role.objects.create(
+            name='writer', permissions=Permission.FOLLOW | Permission.COMMENT | Permission.WRITE,
+        )
+        self.user = User.objects.create_user(email='user@example.com', password='testpass123', role=self.role)
+        self.article = Article.objects.create(title='T', slug='t', body='Body', author=self.user)
+        resp = self.client.post('/api/v1/auth/login/', {
+            'email': 'user@example.com',
+            'password': 'testpass123',
+        })
+        self.access, self.refresh = resp.data['access'], resp.data['refresh']
+
+    def comment(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        return self.client.post('/api/v1/comments/', {'article': self.article.pk, 'body': 'Hi'})
+
+    def test_access_token_carries_role_claims(self):
+        token = AccessToken(self.access)
+        self.assertEqual(token['perm'], self.role.permissions)
+        self.assertEqual((token['role_id'], token['role_ver']), (self.role.pk, 1))
+
+    def test_permission_checks_read_the_token(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.comment(self.access)
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(
+            [q for q in ctx.captured_queries if 'FROM "authentication_role"' in q['sql']]
+        )
+
+    def test_permission_change_makes_token_stale(self):
+        self.role.permissions = Permission.FOLLOW
+        self.role.save()
+        self.assertEqual(self.role.version, 2)
+        resp = self.comment(self.access)
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(resp.data['code'], 'token_stale')
+
+        self.client.credentials()
+        resp = self.client.post('/api/v1/auth/refresh/', {'refresh': self.refresh})
+        self.assertEqual(AccessToken(resp.data['access'])['perm'], Permission.FOLLOW)
+        self.assertEqual(self.comment(resp.data['access']).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_unchanged_permissions_keep_version(self):
+        self.role.name = 'author'
+        self.role.save()
+        self.assertEqual(self.role.version, 1)
+        self.assertEqual(self.comment(self.access).status_code, status.HTTP_201_CREATED)
+
+    def test_role_reassignment_makes_token_stale(self):
+        self.user.role = Role.objects.create(name='other', permissions=Permission.FOLLOW)
+        self.user.save()
+        self.assertEqual(self.comment(self.access).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tokens_without_claims_fall_back_to_role(self):
+        access = RefreshToken.for_user(self.user).access_token
+        self.assertEqual(self.comment(str(access)).status_code, status.HTTP_201_CREATED)
+
+
+class UserCacheTest(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        user_cache.reset_stats()
+        self.client = APIClient()
+        self.role = Role.objects.create(name='writer', permissions=Permission.FOLLOW)
+        self.user = User.objects.create_user(email='user@example.com', password='testpass123', role=self.role)
+        _, access = tokens_for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get('/api/v1/auth/profile/')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        # The profile itself is reloaded; the join is the authentication's.
+        return [
+            q for q in ctx.captured_queries
+            if 'FROM "authentication_user" LEFT OUTER JOIN "authentication_role"' in q['sql']
+        ]
+
+    def test_cached_user_costs_no_query(self):
+        first = self.user_queries()
+        self.assertEqual(len(first), 1)
+        self.assertEqual(self.user_queries(), [])
+        stats = user_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_ratio']), (1, 1, 0.5))
+
+    def test_user_save_drops_entry(self):
+        self.user_queries()
+        self.user.is_active = False
+        self.user.save()
+        resp = self.client.get('/api/v1/auth/profile/')
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_change_password_drops_entry(self):
+        self.user_queries()
+        resp = self.client.post('/api/v1/auth/change-password/', {
+            'old_password': 'testpass123',
+            'new_password': 'newpass1234',
+        })
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.user_queries()), 1)
+
+    def test_role_save_drops_holders(self):
+        self.user_queries()
+        self.role.name = 'author'
+        self.role.save()
+        self.assertEqual(len(self.user_queries()), 1)
+
+    def test_profile_update_keeps_counters(self):
+        self.user_queries()
+        reader = User.objects.create_user(email='reader@example.com', password='testpass123')
+        Follow.objects.create(follower=reader, author=self.user)
+        resp = self.client.patch('/api/v1/auth/profile/', {'gender': 'Male'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.gender, self.user.followers_count), ('Male', 1))
+
+    def test_entries_expire(self):
+        self.user_queries()
+        with mock.patch('authentication.cache.time.monotonic', return_value=10 ** 9):
+            self.assertEqual(len(self.user_queries()), 1)
+
+    def test_size_is_bounded(self):
+        cache = UserCache(max_size=2, timeout=30)
+        users = [User(pk=pk, email=f'{pk}@example.com') for pk in (1, 2, 3)]
+        for user in users[:2]:
+            cache.put(user, cache.generation())
+        cache.get(1)
+        cache.put(users[2], cache.generation())
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(1).email, '1@example.com')
+        self.assertEqual(cache.stats()['size'], 2)
+
+    def test_load_racing_a_save_is_not_stored(self):
+        cache = UserCache()
+        generation = cache.generation()
+        cache.forget(self.user.pk)
+        cache.put(self.user, generation)
+        self.assertIsNone(cache.get(self.user.pk))
+
+    def test_stats_require_admin(self):
+        resp = self.client.get('/api/v1/auth/cache-stats/')
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+        Role.insert_roles()
+        admin = User.objects.create_user(
+            email='admin@example.com', password='adminpass123',
+            role=Role.objects.get(name='Administrator'),
+        )
+        _, access = tokens_for_user(admin)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        resp = self.client.get('/api/v1/auth/cache-stats/')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['size'], 2)
+        self.assertEqual(resp.data['misses'], 2)
@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .models import Role, User
+
+# Access token claims describing the user's role when the token was issued.
+PERM_CLAIM = "perm"
+ROLE_ID_CLAIM = "role_id"
+ROLE_VERSION_CLAIM = "role_ver"
+
+
+def role_version_key(role_id):
+    return f"role-version:{role_id}"
+
+
+def role_version(role_id):
+    """
+    Current ``Role.version``, read through the cache. ``Role.save()`` writes
+    the new value there, so other processes see a change within
+    ``ROLE_VERSION_CACHE_TIMEOUT`` seconds (at once with a shared cache).
+    """
+    if role_id is None:
+        return 0
+    key = role_version_key(role_id)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            Role.objects.filter(pk=role_id).values_list("version", flat=True).first()
+        )
+        if version is None:
+            return None
+        remember_role_version(role_id, version)
+    return version
+
+
+def remember_role_version(role_id, version):
+    cache.set(
+        role_version_key(role_id),
+        version,
+        getattr(settings, "ROLE_VERSION_CACHE_TIMEOUT", 60),
+    )
+
+
+def role_claims(user):
+    role = user.role
+    return {
+        PERM_CLAIM: role.permissions if role else 0,
+        ROLE_ID_CLAIM: role.pk if role else None,
+        ROLE_VERSION_CLAIM: role.version if role else 0,
+    }
+
+
+def add_role_claims(token, user):
+    for claim, value in role_claims(user).items():
+        token[claim] = value
+    return token
+
+
+def tokens_for_user(user):
+    """A refresh token and an access token carrying the role claims."""
+    refresh = RefreshToken.for_user(user)
+    return refresh, add_role_claims(refresh.access_token, user)
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refreshes re-read the role, so a new access token is never stale."""
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        access = AccessToken(data["access"])
+        user = (
+            User.objects.select_related("role")
+            .filter(**{api_settings.USER_ID_FIELD: access[api_settings.USER_ID_CLAIM]})
+            .first()
+        )
+        if user is None:
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+        data["access"] = str(add_role_claims(access, user))
+        return data
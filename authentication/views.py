@@ -5,10 +5,13 @@ from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenRefreshView
 from drf_spectacular.utils import extend_schema
 
+from users.permissions import IsAdmin
+from .cache import user_cache
 from .models import User
+from .tokens import RoleTokenRefreshSerializer, tokens_for_user
 from .serializer import (
     RegisterSerializer,
     LoginSerializer,
@@ -47,16 +50,23 @@ class LoginView(generics.GenericAPIView):
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        refresh = RefreshToken.for_user(user)
+        refresh, access = tokens_for_user(user)
         return Response(
             {
-                "access": str(refresh.access_token),
+                "access": str(access),
                 "refresh": str(refresh),
                 "user": ProfileSerializer(user).data,
             }
         )
 
 
+@extend_schema(tags=["Auth"])
+class RoleTokenRefreshView(TokenRefreshView):
+    """New access token for a refresh token, with the user's current role."""
+
+    serializer_class = RoleTokenRefreshSerializer
+
+
 @extend_schema(tags=["Auth"])
 class ProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
@@ -68,7 +78,18 @@ class ProfileView(generics.RetrieveUpdateAPIView):
         return ProfileSerializer
 
     def get_object(self):
-        return self.request.user
+        # request.user may be a cached copy; saving it would write back
+        # columns changed since, e.g. followers_count or is_active.
+        return User.objects.get(pk=self.request.user.pk)
+
+
+@extend_schema(tags=["Auth"], responses={200: dict})
+class UserCacheStatsView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request, *args, **kwargs):
+        """Authenticated-user cache hits and misses since this process started."""
+        return Response(user_cache.stats())
 
 
 @extend_schema(tags=["Auth"])
@@ -150,5 +171,5 @@ class ChangePasswordView(generics.GenericAPIView):
             )
 
         request.user.set_password(serializer.validated_data["new_password"])
-        request.user.save()
+        request.user.save(update_fields=["password"])
         return Response({"detail": "Password has been changed."})
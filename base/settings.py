@@ -47,6 +47,8 @@ INSTALLED_APPS = [
     "articles.apps.ArticlesConfig",
     "comments.apps.CommentsConfig",
     "likes.apps.LikesConfig",
+    "jobs.apps.JobsConfig",
+    "feeds.apps.FeedsConfig",
     "django_filters",
 ]
 
@@ -127,13 +129,96 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Per-process by default; point "default" at Redis or Memcached when running
+# several workers so cache invalidation reaches all of them.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# How long a process may trust its cached copy of a role's version (see
+# authentication/tokens.py) before re-reading it; bounds how long an access
+# token survives a permission change in other processes without a shared cache.
+ROLE_VERSION_CACHE_TIMEOUT = 60
+
+# Authenticated users, with their role, kept in each process for TIMEOUT
+# seconds (see authentication/cache.py). Saving a User or Role drops its
+# entries in the process that saved it; other processes see the change once
+# their copy expires. GET /auth/cache-stats/ reports the hit ratio.
+AUTH_USER_CACHE = {
+    "MAX_SIZE": 10000,
+    "TIMEOUT": 30,
+}
+
+# Lifetime of a cached published-feed page (see articles/cache.py). Entries
+# are invalidated on writes; the timeout only bounds memory.
+ARTICLE_FEED_CACHE_TIMEOUT = 300
+
+# Article views are counted in memory and written in one UPDATE at most every
+# FLUSH_INTERVAL seconds per process (see articles/counters.py); a crashed
+# process loses up to one interval of views.
+ARTICLE_VIEWS = {
+    "FLUSH_INTERVAL": 5,
+    "MAX_PENDING": 1000,
+}
+
+# With WRITE_BEHIND, PUT/DELETE /likes/article/<id>/ only queue the intent in
+# the process; intents are written in bulk at most every FLUSH_INTERVAL
+# seconds (see likes/buffer.py). Off by default: a crashed process loses up to
+# one interval of likes. POST /likes/mine/ takes up to LOOKUP_MAX_IDS ids and
+# caches each user's last LOOKUP_CACHE_SIZE answers (see likes/lookup.py).
+LIKES = {
+    "WRITE_BEHIND": False,
+    "FLUSH_INTERVAL": 1,
+    "MAX_PENDING": 1000,
+    "LOOKUP_MAX_IDS": 5000,
+    "LOOKUP_CACHE_SIZE": 5000,
+    "LOOKUP_CACHE_TIMEOUT": 300,
+}
+
+# Background jobs (see jobs/runner.py). Cascade deletes run on a thread of
+# the process that enqueued them; `manage.py run_jobs` picks up the rest.
+JOBS = {
+    "RUN_IN_PROCESS": True,
+    "BATCH_SIZE": 500,
+    "STALE_AFTER": 300,
+}
+
+# Upper bounds for GET /comments/thread/, how many replies /comments/
+# embeds per comment (see comments/threads.py) and how many ids one
+# POST /comments/moderate/ may carry.
+COMMENTS = {
+    "THREAD_MAX_DEPTH": 10,
+    "THREAD_MAX_NODES": 500,
+    "INLINE_REPLIES": 3,
+    "MODERATION_MAX_IDS": 5000,
+}
+
+# Follow feeds (see feeds/timeline.py). Articles are copied into followers'
+# timelines by a background job when published; authors with more followers
+# than FAN_OUT_MAX_FOLLOWERS are merged into feeds at read time instead.
+FEEDS = {
+    "FAN_OUT_MAX_FOLLOWERS": 10000,
+    "BACKFILL": 20,
+}
+
+# Resized copies generated in worker processes for uploaded images
+# (see mixins/image_variants.py). "WORKERS": 0 renders inline.
+IMAGE_VARIANTS = {
+    "WIDTHS": [160, 480, 1200],
+    "FORMATS": ["webp", "jpeg"],
+    "QUALITY": 80,
+    "WORKERS": 2,
+}
+
 # User model
 AUTH_USER_MODEL = "authentication.User"
 # Rest Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "authentication.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -41,5 +41,5 @@ class CategoryCRUDTest(TestCase):
     def test_delete_category(self):
         cat = Category.objects.create(name='Tech', description='Tech')
         resp = self.client.delete(f'/api/v1/categories/{cat.pk}/')
-        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
         self.assertEqual(Category.objects.count(), 0)
@@ -3,11 +3,12 @@ from rest_framework.viewsets import ModelViewSet
 from .serializers import CategorySerializer, CategoryWithTasksSerializer
 from .models import Category
 from drf_spectacular.utils import extend_schema
+from jobs.mixins import BackgroundDeleteMixin
 
 
 # Create your views here.
 @extend_schema(tags=["Category"])
-class CategoryListView(ModelViewSet):
+class CategoryListView(BackgroundDeleteMixin, ModelViewSet):
     queryset = Category.objects.prefetch_related("tasks").all()
     serializer_class = CategoryWithTasksSerializer
 
@@ -0,0 +1,10 @@
+COMMENT_EXPORT_COLUMNS = (
+    "id",
+    "article_id",
+    "parent_id",
+    "author_id",
+    "author__email",
+    "body",
+    "created_at",
+    "updated_at",
+)
@@ -0,0 +1,18 @@
+from api.export import ExportCommand
+from comments.export import COMMENT_EXPORT_COLUMNS
+from comments.models import Comment
+
+
+class Command(ExportCommand):
+    help = "Stream comments as CSV or NDJSON."
+    columns = COMMENT_EXPORT_COLUMNS
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--article", type=int)
+
+    def get_queryset(self, options):
+        qs = Comment.objects.order_by("pk")
+        if options["article"] is not None:
+            qs = qs.filter(article_id=options["article"])
+        return qs
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("articles", "0005_article_list_indexes"),
+        ("comments", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["article", "parent", "created_at"],
+                name="comment_article_parent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["parent", "created_at"], name="comment_parent_created_idx"
+            ),
+        ),
+    ]
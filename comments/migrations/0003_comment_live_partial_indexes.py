@@ -0,0 +1,39 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("articles", "0006_article_live_partial_indexes"),
+        ("comments", "0002_comment_list_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="comment",
+            name="comment_article_parent_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="comment",
+            name="comment_parent_created_idx",
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["article", "parent", "created_at"],
+                name="comment_article_parent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["parent", "created_at"],
+                name="comment_parent_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:33
+
+from django.db import migrations, models
+
+PATH_STEP = 8
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def path_segment(pk):
+    digits = ""
+    while pk:
+        pk, rest = divmod(pk, 36)
+        digits = DIGITS[rest] + digits
+    return digits.rjust(PATH_STEP, "0")
+
+
+def backfill_paths(apps, schema_editor):
+    # Level by level, so every parent has its path before its replies.
+    Comment = apps.get_model("comments", "Comment")
+    level = Comment.objects.filter(parent__isnull=True)
+    depth = 0
+    while True:
+        comments = list(level.filter(path="").select_related("parent"))
+        if not comments:
+            return
+        for comment in comments:
+            parent_path = comment.parent.path if comment.parent_id else ""
+            comment.path = parent_path + path_segment(comment.pk)
+            comment.depth = depth
+        Comment.objects.bulk_update(comments, ["path", "depth"], batch_size=500)
+        depth += 1
+        level = Comment.objects.filter(parent__depth=depth - 1, parent__path__gt="")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("comments", "0003_comment_live_partial_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(default="", editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["article", "path"],
+                name="comment_article_path_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:37
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_replies_count(apps, schema_editor):
+    Comment = apps.get_model("comments", "Comment")
+    live_replies = (
+        Comment.objects.filter(parent=OuterRef("pk"), deleted_at__isnull=True)
+        .order_by()
+        .values("parent")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Comment.objects.update(replies_count=Coalesce(Subquery(live_replies), 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("comments", "0004_comment_materialized_path"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="replies_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_replies_count, migrations.RunPython.noop),
+    ]
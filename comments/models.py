@@ -1,9 +1,28 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.conf import settings
-from mixins.model_mixin import AuditModel
+from mixins.model_mixin import LIVE, AuditModel
+
+# Width of one path segment: the comment id in zero-padded base 36, so
+# plain string order of ``path`` is depth-first, oldest reply first.
+PATH_STEP = 8
+PATH_LENGTH = 255
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def path_segment(pk):
+    digits = ""
+    while pk:
+        pk, rest = divmod(pk, 36)
+        digits = DIGITS[rest] + digits
+    return digits.rjust(PATH_STEP, "0")
 
 
 class Comment(AuditModel):
+    # Deepest reply level a path can hold (top-level comments are depth 0).
+    MAX_DEPTH = PATH_LENGTH // PATH_STEP - 1
+
     article = models.ForeignKey(
         "articles.Article",
         on_delete=models.CASCADE,
@@ -22,10 +41,109 @@ class Comment(AuditModel):
         blank=True,
         related_name="replies",
     )
+    # Materialized ancestry: the parent's path plus this comment's segment.
+    # Filled in right after the INSERT, once the id is known.
+    path = models.CharField(max_length=PATH_LENGTH, default="", editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    replies_count = models.PositiveIntegerField(default=0, editable=False)
+    # Hidden by a moderator: kept, but out of every public read and count.
+    is_hidden = models.BooleanField(default=False, editable=False)
+    flags_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["created_at"]
         verbose_name_plural = "Comments"
+        indexes = [
+            models.Index(
+                fields=["article", "parent", "created_at"],
+                condition=LIVE,
+                name="comment_article_parent_idx",
+            ),
+            models.Index(
+                fields=["parent", "created_at"],
+                condition=LIVE,
+                name="comment_parent_created_idx",
+            ),
+            # A whole thread (or any subtree) is one range of this index.
+            models.Index(
+                fields=["article", "path"],
+                condition=LIVE,
+                name="comment_article_path_idx",
+            ),
+            # Moderation queues (comments.moderation.QUEUES).
+            models.Index(
+                fields=["created_at"], condition=LIVE, name="comment_created_idx"
+            ),
+            models.Index(
+                fields=["created_at"],
+                condition=LIVE & models.Q(is_hidden=False, flags_count__gt=0),
+                name="comment_flagged_idx",
+            ),
+            models.Index(
+                fields=["created_at"],
+                condition=LIVE & models.Q(is_hidden=True),
+                name="comment_hidden_idx",
+            ),
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(deleted_at__isnull=False),
+                name="comment_deleted_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author_id} on {self.article_id}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            parent_path = self.parent.path if self.parent_id else ""
+            self.path = parent_path + path_segment(self.pk)
+            self.depth = len(self.path) // PATH_STEP - 1
+            Comment.all_with_deleted.filter(pk=self.pk).update(
+                path=self.path, depth=self.depth
+            )
+
+    def soft_delete(self, user=None):
+        """
+        The moderators' delete of this comment and its replies, counters
+        included (see ``comments.moderation.moderate``).
+        """
+        from .moderation import DELETE, moderate
+
+        moderate(DELETE, [self.pk], user)
+        self.refresh_from_db(fields=["deleted_at", "updated_at", "updated_by"])
+
+    @classmethod
+    def adjust_replies_count(cls, comment_id, delta: int):
+        """Atomically add ``delta`` to a comment's direct reply count."""
+        cls.all_with_deleted.filter(pk=comment_id).update(
+            replies_count=Greatest(F("replies_count") + delta, 0)
+        )
+
+    @staticmethod
+    def subtree_range(path):
+        """``path__gte`` / ``path__lt`` bounds of ``path`` and all below it."""
+        return {"path__gte": path, "path__lt": path + "~"}
+
+
+class CommentFlag(AuditModel):
+    """A user's report of a comment; each user flags a comment once."""
+
+    comment = models.ForeignKey(
+        Comment, on_delete=models.CASCADE, related_name="flags"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="comment_flags",
+    )
+
+    class Meta:
+        unique_together = ("comment", "user")
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Flag by {self.user_id} on {self.comment_id}"
@@ -0,0 +1,134 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from api.buffers import add_to_column
+from articles.cache import invalidate_engagement
+from articles.models import Article
+from .models import Comment, CommentFlag
+
+HIDE = "hide"
+DELETE = "delete"
+RESTORE = "restore"
+ACTIONS = (HIDE, DELETE, RESTORE)
+
+# Comments counted in ``comments_count`` and ``replies_count``.
+VISIBLE = Q(deleted_at__isnull=True, is_hidden=False)
+
+# Subtree ranges ORed into one statement; SQLite caps expression depth.
+SUBTREES_PER_STATEMENT = 200
+
+# ``?state=`` of the moderation queue; each is one partial index range.
+QUEUES = {
+    "flagged": VISIBLE & Q(flags_count__gt=0),
+    "recent": Q(deleted_at__isnull=True),
+    "hidden": Q(deleted_at__isnull=True, is_hidden=True),
+    "deleted": Q(deleted_at__isnull=False),
+}
+
+
+def queue_queryset(state):
+    return (
+        Comment.all_with_deleted.filter(QUEUES[state])
+        .select_related("author")
+        .order_by("-created_at")
+    )
+
+
+def subtree_scopes(ids):
+    """
+    ``Q``s covering the comments in ``ids`` and all their replies, each an
+    OR of at most ``SUBTREES_PER_STATEMENT`` ``(article, path)`` ranges.
+    Subtrees inside another one are dropped.
+    """
+    roots = []
+    for article_id, path in sorted(
+        Comment.all_with_deleted.filter(pk__in=ids).values_list("article_id", "path")
+    ):
+        # Sorted by path, a descendant directly follows its ancestor's range.
+        if roots and roots[-1][0] == article_id and path.startswith(roots[-1][1]):
+            continue
+        roots.append((article_id, path))
+    for start in range(0, len(roots), SUBTREES_PER_STATEMENT):
+        scope = Q()
+        for article_id, path in roots[start : start + SUBTREES_PER_STATEMENT]:
+            scope |= Q(article_id=article_id, **Comment.subtree_range(path))
+        yield scope
+
+
+def moderate(action, ids, user):
+    """
+    Apply ``action`` to the comments in ``ids`` and their replies, which
+    no read shows without them, and return how many changed.
+
+    Rows already in the target state are left alone. Each batch of subtrees
+    is written with one range UPDATE on ``(article, path)``, and the
+    article and parent counters of the rows that became visible or
+    invisible with one UPDATE each at the end. No model signals are sent.
+    """
+    now = timezone.now()
+    changes = {"updated_at": now, "updated_by": user}
+    if action == HIDE:
+        target, sign = VISIBLE, -1
+        changes["is_hidden"] = True
+    elif action == DELETE:
+        target, sign = Q(deleted_at__isnull=True), -1
+        changes["deleted_at"] = now
+    else:
+        # Restoring also clears the flags: the comment has been reviewed,
+        # which is how a flagged but visible one is approved.
+        target, sign = ~VISIBLE | Q(flags_count__gt=0), 1
+        changes.update(deleted_at=None, is_hidden=False, flags_count=0)
+
+    changed = 0
+    articles, parents = Counter(), Counter()
+    with transaction.atomic():
+        for scope in subtree_scopes(ids):
+            matching = Comment.all_with_deleted.filter(target, scope)
+            rows = list(
+                matching.select_for_update().values_list(
+                    "article_id", "parent_id", "is_hidden", "deleted_at"
+                )
+            )
+            if not rows:
+                continue
+            if action == RESTORE:
+                CommentFlag.all_with_deleted.filter(comment__in=matching).delete()
+            changed += matching.update(**changes)
+            # Only rows that were visible before (hide, delete) or were not
+            # (restore) move the counters.
+            for article_id, parent_id, is_hidden, deleted_at in rows:
+                if (is_hidden or deleted_at is not None) == (action == RESTORE):
+                    articles[article_id] += 1
+                    if parent_id:
+                        parents[parent_id] += 1
+        if not changed:
+            return 0
+        add_to_column(
+            Article.all_with_deleted.all(),
+            "comments_count",
+            {pk: sign * n for pk, n in articles.items()},
+        )
+        add_to_column(
+            Comment.all_with_deleted.all(),
+            "replies_count",
+            {pk: sign * n for pk, n in parents.items()},
+        )
+    if articles:
+        invalidate_engagement(*articles)
+    return changed
+
+
+def flag(comment, user):
+    """Record ``user``'s flag on ``comment``; False if they already flagged it."""
+    with transaction.atomic():
+        _, created = CommentFlag.all_with_deleted.get_or_create(
+            comment=comment, user=user, defaults={"created_by": user}
+        )
+        if created:
+            Comment.all_with_deleted.filter(pk=comment.pk).update(
+                flags_count=F("flags_count") + 1
+            )
+    return created
@@ -1,5 +1,6 @@
 from rest_framework.permissions import BasePermission
 from authentication.models import Permission
+from authentication.permissions import request_has_permission
 
 
 class CanComment(BasePermission):
@@ -10,13 +11,24 @@ class CanComment(BasePermission):
             return False
         if request.method in ("GET", "HEAD", "OPTIONS"):
             return True
-        return request.user.has_app_permission(Permission.COMMENT)
+        return request_has_permission(request, Permission.COMMENT)
 
     def has_object_permission(self, request, view, obj):
         if request.method in ("GET", "HEAD", "OPTIONS"):
             return True
         # Author can edit/delete their own comment
-        if obj.author == request.user:
+        if obj.author_id == request.user.pk:
             return True
         # Moderators can delete/edit any comment
-        return request.user.has_app_permission(Permission.MODERATE)
+        return request_has_permission(request, Permission.MODERATE)
+
+
+class CanModerate(BasePermission):
+    """Checked once per request, however many comments it acts on."""
+
+    message = "You do not have moderation permission."
+
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+        return request_has_permission(request, Permission.MODERATE)
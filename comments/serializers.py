@@ -1,5 +1,8 @@
 from rest_framework import serializers
+from drf_spectacular.utils import extend_schema_field
 from .models import Comment
+from .moderation import ACTIONS
+from .threads import get_config
 
 
 class ReplySerializer(serializers.ModelSerializer):
@@ -7,13 +10,23 @@ class ReplySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
-        fields = ["id", "author", "author_email", "body", "created_at", "updated_at"]
+        fields = [
+            "id",
+            "author",
+            "author_email",
+            "body",
+            "replies_count",
+            "created_at",
+            "updated_at",
+        ]
         read_only_fields = fields
 
 
 class CommentListSerializer(serializers.ModelSerializer):
     author_email = serializers.EmailField(source="author.email", read_only=True)
-    replies = ReplySerializer(many=True, read_only=True)
+    # Only the first few replies; the rest are paged through
+    # ``/comments/{id}/replies/``.
+    replies = ReplySerializer(source="first_replies", many=True, read_only=True)
 
     class Meta:
         model = Comment
@@ -24,18 +37,114 @@ class CommentListSerializer(serializers.ModelSerializer):
             "author_email",
             "body",
             "parent",
+            "replies_count",
+            "replies",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class CommentNodeSerializer(serializers.ModelSerializer):
+    """One comment of a thread; ``replies`` holds its nested children."""
+
+    author_email = serializers.EmailField(source="author.email", read_only=True)
+    replies = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Comment
+        fields = [
+            "id",
+            "parent",
+            "author",
+            "author_email",
+            "body",
+            "depth",
+            "replies_count",
             "replies",
             "created_at",
             "updated_at",
         ]
         read_only_fields = fields
 
+    @extend_schema_field(serializers.ListField(child=serializers.DictField()))
+    def get_replies(self, obj):
+        # Filled in by ``build_tree``.
+        return []
+
+
+class CommentThreadSerializer(serializers.Serializer):
+    truncated = serializers.BooleanField(
+        help_text="More comments exist beyond the node limit."
+    )
+    results = CommentNodeSerializer(many=True)
+
+
+class ModerationCommentSerializer(serializers.ModelSerializer):
+    author_email = serializers.EmailField(source="author.email", read_only=True)
+
+    class Meta:
+        model = Comment
+        fields = [
+            "id",
+            "article",
+            "parent",
+            "author",
+            "author_email",
+            "body",
+            "flags_count",
+            "is_hidden",
+            "deleted_at",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class ModerationActionSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=ACTIONS)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False
+    )
+
+    def validate_ids(self, ids):
+        limit = get_config()["MODERATION_MAX_IDS"]
+        if len(ids) > limit:
+            raise serializers.ValidationError(
+                f"At most {limit} comments can be moderated at once."
+            )
+        return list(set(ids))
+
+
+class ModerationResultSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=ACTIONS)
+    updated = serializers.IntegerField(
+        help_text="Comments that changed; ids already in that state are skipped."
+    )
+
 
 class CommentCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = ["article", "body", "parent"]
 
+    def validate(self, attrs):
+        parent = attrs.get("parent")
+        if parent is not None:
+            if parent.is_hidden:
+                raise serializers.ValidationError(
+                    {"parent": "The parent comment has been hidden."}
+                )
+            if parent.article_id != attrs["article"].pk:
+                raise serializers.ValidationError(
+                    {"parent": "The parent comment belongs to another article."}
+                )
+            if parent.depth >= Comment.MAX_DEPTH:
+                raise serializers.ValidationError(
+                    {"parent": f"Replies cannot nest deeper than {Comment.MAX_DEPTH}."}
+                )
+        return attrs
+
 
 class CommentUpdateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from articles.models import Article
+from .models import Comment
+
+
+@receiver(post_save, sender=Comment)
+def increment_comments_count(sender, instance, created, **kwargs):
+    if created:
+        Article.adjust_counter(instance.article_id, "comments_count", 1)
+        if instance.parent_id:
+            Comment.adjust_replies_count(instance.parent_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comments_count(sender, instance, **kwargs):
+    if instance.is_hidden or instance.deleted_at is not None:
+        # Hiding or soft-deleting it (see comments.moderation) already took
+        # it out of the counts, e.g. before its author was purged.
+        return
+    Article.adjust_counter(instance.article_id, "comments_count", -1)
+    if instance.parent_id:
+        Comment.adjust_replies_count(instance.parent_id, -1)
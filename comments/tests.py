@@ -1,8 +1,13 @@
-from django.test import TestCase
+import json
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
 from authentication.models import User, Role, Permission
 from articles.models import Article
+from jobs.cascade import CascadePurge
 from .models import Comment
 
 
@@ -64,7 +69,7 @@ class CommentCRUDTest(TestCase):
         Comment.objects.create(article=self.article, author=self.user, body="Comment 1")
         resp = self.client.get("/api/v1/comments/", {"article": self.article.pk})
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(resp.data), 1)
+        self.assertEqual(len(resp.data["results"]), 1)
 
     def test_update_own_comment(self):
         comment = Comment.objects.create(
@@ -81,6 +86,10 @@ class CommentCRUDTest(TestCase):
         )
         resp = self.client.delete(f"/api/v1/comments/{comment.pk}/")
         self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Comment.objects.filter(pk=comment.pk).exists())
+        self.assertTrue(Comment.all_with_deleted.get(pk=comment.pk).is_deleted)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comments_count, 0)
 
 
 class ThreadedCommentTest(TestCase):
@@ -119,8 +128,43 @@ class ThreadedCommentTest(TestCase):
         )
         resp = self.client.get("/api/v1/comments/", {"article": self.article.pk})
         # Only top-level comments in list
-        self.assertEqual(len(resp.data), 1)
-        self.assertEqual(len(resp.data[0]["replies"]), 1)
+        self.assertEqual(len(resp.data["results"]), 1)
+        self.assertEqual(len(resp.data["results"][0]["replies"]), 1)
+
+    def test_new_reply_changes_list_etag(self):
+        parent = Comment.objects.create(
+            article=self.article, author=self.user, body="Parent"
+        )
+        first = self.client.get("/api/v1/comments/", {"article": self.article.pk})
+        cached = self.client.get(
+            "/api/v1/comments/",
+            {"article": self.article.pk},
+            HTTP_IF_NONE_MATCH=first["ETag"],
+        )
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        Comment.objects.create(
+            article=self.article, author=self.user, body="Reply", parent=parent
+        )
+        resp = self.client.get(
+            "/api/v1/comments/",
+            {"article": self.article.pk},
+            HTTP_IF_NONE_MATCH=first["ETag"],
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_new_reply_changes_parent_etag(self):
+        parent = Comment.objects.create(
+            article=self.article, author=self.user, body="Parent"
+        )
+        url = f"/api/v1/comments/{parent.pk}/"
+        first = self.client.get(url)
+        self.client.post(
+            "/api/v1/comments/",
+            {"article": self.article.pk, "body": "Reply", "parent": parent.pk},
+        )
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["replies_count"], 1)
 
 
 class CommentPermissionTest(TestCase):
@@ -171,3 +215,355 @@ class CommentPermissionTest(TestCase):
         self.client.force_authenticate(user=mod)
         resp = self.client.delete(f"/api/v1/comments/{comment.pk}/")
         self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class CommentExportTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = make_commenter()
+        self.client.force_authenticate(user=self.user)
+        self.article = Article.objects.create(
+            title="Test", slug="test", body="body", author=self.user
+        )
+        other = Article.objects.create(
+            title="Other", slug="other", body="body", author=self.user
+        )
+        parent = Comment.objects.create(
+            article=self.article, author=self.user, body="Top"
+        )
+        Comment.objects.create(
+            article=self.article, author=self.user, body="Reply", parent=parent
+        )
+        Comment.objects.create(article=other, author=self.user, body="Elsewhere")
+
+    def test_export_includes_replies_for_article(self):
+        resp = self.client.get(
+            f"/api/v1/comments/export/?fmt=ndjson&article={self.article.pk}"
+        )
+        rows = [
+            json.loads(line) for line in b"".join(resp.streaming_content).splitlines()
+        ]
+        self.assertEqual(sorted(r["body"] for r in rows), ["Reply", "Top"])
+
+
+class CommentThreadTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = make_commenter()
+        self.client.force_authenticate(user=self.user)
+        self.article = Article.objects.create(
+            title="Test", slug="test", body="body", author=self.user
+        )
+        self.first = self.comment("first")
+        self.reply = self.comment("reply", self.first)
+        self.nested = self.comment("nested", self.reply)
+        self.deepest = self.comment("deepest", self.nested)
+        self.sibling = self.comment("sibling", self.first)
+        self.second = self.comment("second")
+
+    def comment(self, body, parent=None):
+        return Comment.objects.create(
+            article=self.article, author=self.user, body=body, parent=parent
+        )
+
+    def thread(self, **params):
+        resp = self.client.get(
+            "/api/v1/comments/thread/", {"article": self.article.pk, **params}
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.data
+
+    def shape(self, nodes):
+        return [(node["body"], self.shape(node["replies"])) for node in nodes]
+
+    def test_paths_follow_ancestry(self):
+        self.assertEqual(self.deepest.depth, 3)
+        self.assertTrue(self.deepest.path.startswith(self.nested.path))
+        self.assertEqual(len(self.deepest.path), 4 * len(self.first.path))
+
+    def test_whole_tree_in_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.thread()
+        comment_queries = [
+            q for q in ctx.captured_queries if 'FROM "comments_comment"' in q["sql"]
+        ]
+        self.assertEqual(len(comment_queries), 1)
+        self.assertFalse(data["truncated"])
+        self.assertEqual(
+            self.shape(data["results"]),
+            [
+                (
+                    "first",
+                    [
+                        ("reply", [("nested", [("deepest", [])])]),
+                        ("sibling", []),
+                    ],
+                ),
+                ("second", []),
+            ],
+        )
+
+    def test_depth_and_size_limits(self):
+        data = self.thread(max_depth=1)
+        self.assertEqual(
+            self.shape(data["results"]),
+            [("first", [("reply", []), ("sibling", [])]), ("second", [])],
+        )
+        data = self.thread(limit=3)
+        self.assertTrue(data["truncated"])
+        self.assertEqual(
+            self.shape(data["results"]), [("first", [("reply", [("nested", [])])])]
+        )
+
+    @override_settings(COMMENTS={"THREAD_MAX_DEPTH": 2})
+    def test_depth_is_capped_by_settings(self):
+        data = self.thread(max_depth=50)
+        reply = data["results"][0]["replies"][0]
+        self.assertEqual(reply["replies"][0]["replies"], [])
+
+    def test_subtree(self):
+        data = self.thread(root=self.reply.pk)
+        self.assertEqual(
+            self.shape(data["results"]), [("reply", [("nested", [("deepest", [])])])]
+        )
+
+    def test_deleted_comment_hides_its_subtree(self):
+        self.reply.soft_delete()
+        data = self.thread()
+        self.assertEqual(
+            self.shape(data["results"]),
+            [("first", [("sibling", [])]), ("second", [])],
+        )
+
+    def test_requires_article(self):
+        resp = self.client.get("/api/v1/comments/thread/")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_reply_must_stay_in_article(self):
+        other = Article.objects.create(
+            title="Other", slug="other", body="body", author=self.user
+        )
+        resp = self.client.post(
+            "/api/v1/comments/",
+            {"article": other.pk, "body": "Stray", "parent": self.first.pk},
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(COMMENTS={"INLINE_REPLIES": 2})
+class CommentRepliesTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = make_commenter()
+        self.client.force_authenticate(user=self.user)
+        self.article = Article.objects.create(
+            title="Test", slug="test", body="body", author=self.user
+        )
+        self.tops = [
+            Comment.objects.create(article=self.article, author=self.user, body=f"T{i}")
+            for i in range(2)
+        ]
+        self.replies = [
+            Comment.objects.create(
+                article=self.article, author=self.user, body=f"R{i}", parent=self.tops[0]
+            )
+            for i in range(5)
+        ]
+
+    def test_delete_takes_subtree_out_of_count(self):
+        Comment.objects.create(
+            article=self.article, author=self.user, body="Deeper", parent=self.replies[0]
+        )
+        resp = self.client.delete(f"/api/v1/comments/{self.tops[0].pk}/")
+        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comments_count, 1)
+        self.assertEqual(Comment.objects.count(), 1)
+
+    def test_purge_after_soft_delete_counts_once(self):
+        other = make_reader()
+        reply = Comment.objects.create(
+            article=self.article, author=other, body="Mine", parent=self.tops[1]
+        )
+        reply.soft_delete()
+        CascadePurge(batch_size=10).purge(User.objects.filter(pk=other.pk))
+        self.assertFalse(Comment.all_with_deleted.filter(pk=reply.pk).exists())
+        self.article.refresh_from_db()
+        self.tops[1].refresh_from_db()
+        self.assertEqual(self.article.comments_count, 7)
+        self.assertEqual(self.tops[1].replies_count, 0)
+
+    def test_list_embeds_first_replies_and_count(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/v1/comments/", {"article": self.article.pk})
+        busy, quiet = resp.data["results"]
+        self.assertEqual(busy["replies_count"], 5)
+        self.assertEqual([r["body"] for r in busy["replies"]], ["R0", "R1"])
+        self.assertEqual((quiet["replies_count"], quiet["replies"]), (0, []))
+        reply_queries = [
+            q for q in ctx.captured_queries if '"comments_comment"."parent_id" IN' in q["sql"]
+        ]
+        self.assertEqual(len(reply_queries), 1)
+
+    def test_replies_endpoint_pages_through_the_rest(self):
+        url = f"/api/v1/comments/{self.tops[0].pk}/replies/?page_size=2"
+        bodies = []
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(resp.data["results"]), 2)
+            bodies += [r["body"] for r in resp.data["results"]]
+            url = resp.data["next"]
+        self.assertEqual(bodies, ["R0", "R1", "R2", "R3", "R4"])
+
+    def test_count_follows_replies(self):
+        self.replies[0].soft_delete()
+        Comment.objects.create(
+            article=self.article, author=self.user, body="Deeper", parent=self.replies[1]
+        )
+        self.tops[0].refresh_from_db()
+        self.replies[1].refresh_from_db()
+        self.assertEqual(self.tops[0].replies_count, 4)
+        self.assertEqual(self.replies[1].replies_count, 1)
+
+
+class CommentModerationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = make_commenter()
+        self.moderator = make_moderator()
+        self.client.force_authenticate(user=self.moderator)
+        self.article = Article.objects.create(
+            title="Test", slug="test", body="body", author=self.user
+        )
+        self.top = Comment.objects.create(article=self.article, author=self.user, body="Top")
+        self.replies = [
+            Comment.objects.create(
+                article=self.article, author=self.user, body=f"R{i}", parent=self.top
+            )
+            for i in range(3)
+        ]
+
+    def moderate(self, action, comments):
+        return self.client.post(
+            "/api/v1/comments/moderate/",
+            {"action": action, "ids": [c.pk for c in comments]},
+            format="json",
+        )
+
+    def counts(self):
+        self.article.refresh_from_db()
+        self.top.refresh_from_db()
+        return self.article.comments_count, self.top.replies_count
+
+    def test_flag_once_and_queue(self):
+        reader = make_reader()
+        self.client.force_authenticate(user=reader)
+        url = f"/api/v1/comments/{self.replies[0].pk}/flag/"
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_204_NO_CONTENT)
+        resp = self.client.get("/api/v1/comments/queue/")
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.moderator)
+        resp = self.client.get("/api/v1/comments/queue/")
+        self.assertEqual(
+            [(c["body"], c["flags_count"]) for c in resp.data["results"]], [("R0", 1)]
+        )
+        resp = self.client.get("/api/v1/comments/queue/", {"state": "recent"})
+        self.assertEqual(len(resp.data["results"]), 4)
+        resp = self.client.get("/api/v1/comments/queue/", {"state": "bogus"})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cannot_flag_own_comment(self):
+        self.client.force_authenticate(user=self.user)
+        resp = self.client.post(f"/api/v1/comments/{self.top.pk}/flag/")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_moderate_requires_permission(self):
+        self.client.force_authenticate(user=self.user)
+        resp = self.moderate("hide", [self.top])
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+        self.top.refresh_from_db()
+        self.assertFalse(self.top.is_hidden)
+
+    def test_hide_is_one_update_and_leaves_public_reads(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.moderate("hide", self.replies[:2])
+        self.assertEqual(resp.data, {"action": "hide", "updated": 2})
+        updates = [
+            q for q in ctx.captured_queries
+            if q["sql"].startswith('UPDATE "comments_comment"')
+        ]
+        # The rows themselves, then the parents' reply counts.
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(self.counts(), (2, 1))
+
+        resp = self.client.get("/api/v1/comments/", {"article": self.article.pk})
+        self.assertEqual([r["body"] for r in resp.data["results"][0]["replies"]], ["R2"])
+        resp = self.client.get(f"/api/v1/comments/{self.top.pk}/replies/")
+        self.assertEqual([r["body"] for r in resp.data["results"]], ["R2"])
+        resp = self.client.get("/api/v1/comments/queue/", {"state": "hidden"})
+        self.assertEqual(len(resp.data["results"]), 2)
+
+        # Hiding them again changes neither the rows nor the counters.
+        self.assertEqual(self.moderate("hide", self.replies[:2]).data["updated"], 0)
+        self.assertEqual(self.counts(), (2, 1))
+
+    def test_delete_and_restore(self):
+        self.moderate("hide", [self.replies[0]])
+        resp = self.moderate("delete", self.replies)
+        self.assertEqual(resp.data["updated"], 3)
+        # The hidden reply had already left the counts.
+        self.assertEqual(self.counts(), (1, 0))
+        self.assertFalse(Comment.objects.filter(parent=self.top).exists())
+
+        self.client.force_authenticate(user=make_reader())
+        self.client.post(f"/api/v1/comments/{self.top.pk}/flag/")
+        self.client.force_authenticate(user=self.moderator)
+        resp = self.moderate("restore", [self.top, *self.replies])
+        # The visible top comment is only cleared of its flag.
+        self.assertEqual(resp.data["updated"], 4)
+        self.assertEqual(self.counts(), (4, 3))
+        self.assertEqual(self.top.flags_count, 0)
+        self.assertFalse(
+            Comment.objects.filter(is_hidden=True).exists()
+            or Comment.all_with_deleted.filter(deleted_at__isnull=False).exists()
+        )
+
+    def test_actions_cover_replies(self):
+        nested = Comment.objects.create(
+            article=self.article, author=self.user, body="N", parent=self.replies[0]
+        )
+        self.assertEqual(self.counts(), (5, 3))
+        for action in ("hide", "delete"):
+            with self.subTest(action=action):
+                resp = self.moderate(action, [self.top, nested])
+                self.assertEqual(resp.data["updated"], 5)
+                self.assertEqual(self.counts(), (0, 0))
+                self.assertFalse(Comment.objects.filter(is_hidden=False).exists())
+                resp = self.client.get(
+                    "/api/v1/comments/thread/", {"article": self.article.pk}
+                )
+                self.assertEqual(resp.data["results"], [])
+
+                self.assertEqual(self.moderate("restore", [self.top]).data["updated"], 5)
+                self.assertEqual(self.counts(), (5, 3))
+                self.replies[0].refresh_from_db()
+                self.assertEqual(self.replies[0].replies_count, 1)
+
+    def test_restore_approves_flagged_comment(self):
+        self.client.force_authenticate(user=make_reader())
+        self.client.post(f"/api/v1/comments/{self.replies[0].pk}/flag/")
+        self.client.force_authenticate(user=self.moderator)
+        self.moderate("restore", [self.replies[0]])
+        self.assertEqual(self.counts(), (4, 3))
+        self.replies[0].refresh_from_db()
+        self.assertEqual(self.replies[0].flags_count, 0)
+        self.assertFalse(self.replies[0].flags.exists())
+
+    @override_settings(COMMENTS={"MODERATION_MAX_IDS": 2})
+    def test_batch_size_is_capped(self):
+        resp = self.moderate("hide", self.replies)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("ids", resp.data)
@@ -0,0 +1,49 @@
+from django.conf import settings
+
+from .models import Comment
+
+DEFAULTS = {
+    # Caps for one thread response; clients may ask for less.
+    "THREAD_MAX_DEPTH": 10,
+    "THREAD_MAX_NODES": 500,
+    # Replies embedded under each comment of /comments/ pages.
+    "INLINE_REPLIES": 3,
+    # Most comment ids one moderation request may act on.
+    "MODERATION_MAX_IDS": 5000,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "COMMENTS", {})}
+
+
+def thread_queryset(article_id, root=None, max_depth=None):
+    """
+    Live comments of one article (or of the subtree under ``root``) in
+    depth-first order: a single range read of ``comment_article_path_idx``.
+    """
+    qs = Comment.objects.filter(article_id=article_id, is_hidden=False)
+    if root is not None:
+        qs = qs.filter(**Comment.subtree_range(root.path))
+    if max_depth is not None:
+        qs = qs.filter(depth__lte=max_depth)
+    return qs.select_related("author").order_by("path")
+
+
+def build_tree(rows, top=0):
+    """
+    Nest flat serialized ``rows`` given in path order, in one pass. Rows at
+    depth ``top`` are the roots; a row whose parent was not loaded (it is
+    soft-deleted) is dropped together with its descendants.
+    """
+    roots, by_id = [], {}
+    for row in rows:
+        node = {**row, "replies": []}
+        if row["depth"] == top:
+            roots.append(node)
+        elif row["parent"] in by_id:
+            by_id[row["parent"]]["replies"].append(node)
+        else:
+            continue
+        by_id[row["id"]] = node
+    return roots
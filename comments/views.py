@@ -1,25 +1,62 @@
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 
+from articles.models import Article
 from .models import Comment
 from .serializers import (
     CommentListSerializer,
     CommentCreateSerializer,
+    CommentNodeSerializer,
+    CommentThreadSerializer,
     CommentUpdateSerializer,
+    ModerationActionSerializer,
+    ModerationCommentSerializer,
+    ModerationResultSerializer,
+    ReplySerializer,
 )
-from .permissions import CanComment
+from . import moderation
+from .threads import build_tree, get_config, thread_queryset
+from .export import COMMENT_EXPORT_COLUMNS
+from .permissions import CanComment, CanModerate
+from api.export import ExportMixin
+from api.pagination import KeysetPagination
+from mixins.view_mixin import ConditionalGetMixin, SoftDeleteMixin
+
+
+def int_param(request, name, default, maximum):
+    try:
+        value = int(request.query_params.get(name, default))
+    except ValueError:
+        raise ValidationError({name: "A valid integer is required."})
+    return min(max(value, 0), maximum)
 
 
 @extend_schema(tags=["Comments"])
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(
+    ConditionalGetMixin, ExportMixin, SoftDeleteMixin, ModelViewSet
+):
     serializer_class = CommentListSerializer
     permission_classes = [IsAuthenticated, CanComment]
+    pagination_class = KeysetPagination
+    export_columns = COMMENT_EXPORT_COLUMNS
+    export_filename = "comments"
+    # A detail embeds its first replies; a new one only moves this counter.
+    etag_fields = ("replies_count",)
 
     def get_queryset(self):
-        qs = Comment.objects.select_related("author", "article").prefetch_related(
-            "replies__author"
-        )
+        qs = Comment.objects.filter(
+            article__deleted_at__isnull=True, is_hidden=False
+        ).select_related("author", "article")
+        if self.action in ("list", "retrieve"):
+            qs = qs.prefetch_related(self.first_replies_prefetch())
         article_id = self.request.query_params.get("article")
         if article_id:
             qs = qs.filter(article_id=article_id)
@@ -28,6 +65,28 @@ class CommentViewSet(ModelViewSet):
             qs = qs.filter(parent=None)
         return qs
 
+    @staticmethod
+    def first_replies_prefetch():
+        # A sliced prefetch is one windowed query for the whole page.
+        replies = (
+            Comment.objects.filter(is_hidden=False)
+            .select_related("author")
+            .order_by("created_at", "id")
+        )
+        return Prefetch(
+            "replies",
+            queryset=replies[: get_config()["INLINE_REPLIES"]],
+            to_attr="first_replies",
+        )
+
+    def get_validator_queryset(self):
+        # Replies are nested into the list, so they must move its validators too.
+        qs = Comment.objects.filter(article__deleted_at__isnull=True, is_hidden=False)
+        article_id = self.request.query_params.get("article")
+        if article_id:
+            qs = qs.filter(article_id=article_id)
+        return qs
+
     def get_serializer_class(self):
         if self.action == "create":
             return CommentCreateSerializer
@@ -35,5 +94,124 @@ class CommentViewSet(ModelViewSet):
             return CommentUpdateSerializer
         return CommentListSerializer
 
+    @extend_schema(
+        tags=["Comments"],
+        parameters=[
+            OpenApiParameter("article", OpenApiTypes.INT, required=True),
+            OpenApiParameter(
+                "root", OpenApiTypes.INT, description="Only this comment's subtree."
+            ),
+            OpenApiParameter("max_depth", OpenApiTypes.INT),
+            OpenApiParameter("limit", OpenApiTypes.INT),
+        ],
+        responses=CommentThreadSerializer,
+    )
+    @action(detail=False, methods=["get"])
+    def thread(self, request):
+        """
+        An article's comments as one nested tree, loaded with a single range
+        query on the materialized paths. At most ``max_depth`` levels below
+        the root and ``limit`` comments (depth first) are returned; both are
+        capped by ``COMMENTS`` in the settings.
+        """
+        config = get_config()
+        article_id = request.query_params.get("article")
+        if not article_id or not article_id.isdigit():
+            raise ValidationError({"article": "A valid article id is required."})
+        get_object_or_404(Article, pk=article_id)
+        root = None
+        if "root" in request.query_params:
+            root = get_object_or_404(
+                Comment, pk=int_param(request, "root", 0, 2**63), article_id=article_id
+            )
+        max_depth = int_param(
+            request, "max_depth", config["THREAD_MAX_DEPTH"], config["THREAD_MAX_DEPTH"]
+        )
+        limit = int_param(
+            request, "limit", config["THREAD_MAX_NODES"], config["THREAD_MAX_NODES"]
+        )
+        top = root.depth if root else 0
+        comments = list(thread_queryset(article_id, root, top + max_depth)[: limit + 1])
+        rows = CommentNodeSerializer(comments[:limit], many=True).data
+        return Response(
+            {"truncated": len(comments) > limit, "results": build_tree(rows, top)}
+        )
+
+    @extend_schema(tags=["Comments"], responses=ReplySerializer(many=True))
+    @action(detail=True, methods=["get"])
+    def replies(self, request, pk=None):
+        """Direct replies to a comment, oldest first, with ``?cursor=`` pages."""
+        parent = self.get_object()
+        replies = (
+            Comment.objects.filter(parent=parent, is_hidden=False)
+            .select_related("author")
+            .order_by("created_at")
+        )
+        page = self.paginate_queryset(replies)
+        return self.get_paginated_response(ReplySerializer(page, many=True).data)
+
+    @extend_schema(
+        tags=["Comments"],
+        parameters=[
+            OpenApiParameter("state", OpenApiTypes.STR, enum=list(moderation.QUEUES)),
+        ],
+        responses=ModerationCommentSerializer(many=True),
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[IsAuthenticated, CanModerate],
+    )
+    def queue(self, request):
+        """
+        Comments awaiting moderation, newest first, with ``?cursor=`` pages.
+        ``?state=`` picks the queue: ``flagged`` (default), ``recent``,
+        ``hidden`` or ``deleted``.
+        """
+        state = request.query_params.get("state", "flagged")
+        if state not in moderation.QUEUES:
+            choices = ", ".join(moderation.QUEUES)
+            raise ValidationError({"state": f"Choose one of: {choices}."})
+        page = self.paginate_queryset(moderation.queue_queryset(state))
+        return self.get_paginated_response(
+            ModerationCommentSerializer(page, many=True).data
+        )
+
+    @extend_schema(
+        tags=["Comments"],
+        request=ModerationActionSerializer,
+        responses=ModerationResultSerializer,
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[IsAuthenticated, CanModerate],
+    )
+    def moderate(self, request):
+        """
+        Hide, soft-delete or restore many comments at once. The permission
+        check runs once for the whole batch and no comment is loaded as an
+        object; see ``comments.moderation.moderate``.
+        """
+        serializer = ModerationActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        action_name = serializer.validated_data["action"]
+        updated = moderation.moderate(
+            action_name, serializer.validated_data["ids"], request.user
+        )
+        return Response({"action": action_name, "updated": updated})
+
+    @extend_schema(tags=["Comments"], request=None, responses={201: None, 204: None})
+    @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
+    def flag(self, request, pk=None):
+        """Report a comment to the moderators; 204 if already flagged."""
+        comment = self.get_object()
+        if comment.author_id == request.user.pk:
+            raise ValidationError({"detail": "You cannot flag your own comment."})
+        created = moderation.flag(comment, request.user)
+        return Response(
+            status=status.HTTP_201_CREATED if created else status.HTTP_204_NO_CONTENT
+        )
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
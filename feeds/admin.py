@@ -0,0 +1,5 @@
+from django.contrib import admin
+from .models import Follow, TimelineEntry
+
+admin.site.register(Follow)
+admin.site.register(TimelineEntry)
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class FeedsConfig(AppConfig):
+    name = "feeds"
+
+    def ready(self):
+        from . import signals, timeline  # noqa: F401  (timeline registers its handler)
@@ -0,0 +1,70 @@
+from django.db import models
+from django.conf import settings
+from mixins.model_mixin import AuditModel
+
+
+class Follow(AuditModel):
+    follower = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="following",
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="followers",
+    )
+
+    class Meta:
+        unique_together = ("follower", "author")
+        ordering = ["-created_at"]
+        indexes = [
+            # Fan-out walks an author's followers in id order.
+            models.Index(fields=["author", "follower"], name="follow_author_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.follower_id} follows {self.author_id}"
+
+
+class TimelineEntry(models.Model):
+    """
+    One published article in one follower's feed, written at publish time.
+
+    ``published_at`` and ``author`` are copied from the article so a feed
+    page is a range read of ``(user, published_at, article)`` alone.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="timeline",
+    )
+    article = models.ForeignKey(
+        "articles.Article",
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    published_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "Timeline entries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "article"], name="timeline_user_article_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "published_at", "article"],
+                name="timeline_user_published_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.article_id} in feed of {self.user_id}"
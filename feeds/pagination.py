@@ -0,0 +1,35 @@
+from rest_framework.exceptions import NotFound
+
+from api.pagination import KeysetPagination
+from articles.models import Article
+from .timeline import timeline_articles, timeline_keys
+
+
+class TimelinePagination(KeysetPagination):
+    """
+    ``KeysetPagination`` cursors over the ``(published_at, id)`` keys of a
+    user's feed. Pages only go forward: ``previous`` is always null.
+    """
+
+    def paginate_timeline(self, user, request):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.model = Article
+        self.ordering = ["-published_at", "-id"]
+
+        position, reverse = self.decode_cursor(request)
+        if reverse:
+            raise NotFound(self.invalid_cursor_message)
+        keys = timeline_keys(user, position, self.page_size + 1)
+        self.has_next, self.has_previous = len(keys) > self.page_size, False
+        self.keys = keys[: self.page_size]
+        self.page = timeline_articles(self.keys)
+        return self.page
+
+    def get_next_link(self):
+        # Keyed on the last key, not the last article: it may have been
+        # unpublished since it was fanned out.
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.keys[-1], reverse=False)
@@ -0,0 +1,14 @@
+from rest_framework.permissions import BasePermission
+from authentication.models import Permission
+from authentication.permissions import request_has_permission
+
+
+class CanFollow(BasePermission):
+    message = "You do not have permission to follow users."
+
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+        if request.method in ("GET", "HEAD", "OPTIONS"):
+            return True
+        return request_has_permission(request, Permission.FOLLOW)
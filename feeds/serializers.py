@@ -0,0 +1,25 @@
+from rest_framework import serializers
+from .models import Follow
+
+
+class FollowSerializer(serializers.ModelSerializer):
+    author_email = serializers.EmailField(source="author.email", read_only=True)
+
+    class Meta:
+        model = Follow
+        fields = ["id", "author", "author_email", "created_at"]
+        read_only_fields = fields
+
+
+class FollowCreateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Follow
+        fields = ["author"]
+
+    def validate_author(self, value):
+        user = self.context["request"].user
+        if value == user:
+            raise serializers.ValidationError("You cannot follow yourself.")
+        if Follow.objects.filter(follower=user, author=value).exists():
+            raise serializers.ValidationError("You already follow this user.")
+        return value
@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from articles.models import Article, article_published
+from authentication.cache import user_cache
+from .models import Follow, TimelineEntry
+from .timeline import backfill, enqueue_fan_out
+
+
+def adjust_followers_count(author_id, delta):
+    get_user_model().objects.filter(pk=author_id).update(
+        followers_count=Greatest(F("followers_count") + delta, 0)
+    )
+    # update() sends no User signal.
+    user_cache.forget(author_id)
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, **kwargs):
+    if created:
+        adjust_followers_count(instance.author_id, 1)
+        backfill(instance)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    adjust_followers_count(instance.author_id, -1)
+    TimelineEntry.objects.filter(
+        user_id=instance.follower_id, author_id=instance.author_id
+    ).delete()
+
+
+@receiver(article_published, sender=Article)
+def fan_out_article(sender, instance, **kwargs):
+    enqueue_fan_out(instance)
@@ -0,0 +1,169 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from authentication.models import User, Role, Permission
+from articles.models import Article
+from jobs.models import Job
+from jobs.runner import run_pending
+from .models import Follow, TimelineEntry
+from .timeline import FAN_OUT
+
+
+def make_role():
+    return Role.objects.create(
+        name='writer',
+        permissions=Permission.FOLLOW | Permission.COMMENT | Permission.WRITE,
+    )
+
+
+class FollowTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        role = make_role()
+        self.user = User.objects.create_user(email='reader@example.com', password='testpass123', role=role)
+        self.author = User.objects.create_user(email='author@example.com', password='testpass123', role=role)
+        self.client.force_authenticate(user=self.user)
+
+    def test_follow_and_unfollow(self):
+        resp = self.client.post('/api/v1/feed/follows/', {'author': self.author.pk})
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 1)
+
+        resp = self.client.get('/api/v1/feed/follows/')
+        self.assertEqual([f['author_email'] for f in resp.data['results']], ['author@example.com'])
+
+        follow = Follow.objects.get()
+        resp = self.client.delete(f'/api/v1/feed/follows/{follow.pk}/')
+        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 0)
+
+    def test_cannot_follow_twice_or_self(self):
+        Follow.objects.create(follower=self.user, author=self.author)
+        resp = self.client.post('/api/v1/feed/follows/', {'author': self.author.pk})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        resp = self.client.post('/api/v1/feed/follows/', {'author': self.user.pk})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_follow_requires_permission(self):
+        no_role = User.objects.create_user(email='norole@example.com', password='testpass123')
+        self.client.force_authenticate(user=no_role)
+        resp = self.client.post('/api/v1/feed/follows/', {'author': self.author.pk})
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_follows_are_private(self):
+        Follow.objects.create(follower=self.author, author=self.user)
+        resp = self.client.get('/api/v1/feed/follows/')
+        self.assertEqual(resp.data['results'], [])
+
+
+@override_settings(JOBS={'BATCH_SIZE': 2})
+class TimelineTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        role = make_role()
+        self.author = User.objects.create_user(email='author@example.com', password='testpass123', role=role)
+        self.other = User.objects.create_user(email='other@example.com', password='testpass123', role=role)
+        self.followers = [
+            User.objects.create_user(email=f'f{i}@example.com', password='testpass123', role=role)
+            for i in range(3)
+        ]
+        for follower in self.followers:
+            Follow.objects.create(follower=follower, author=self.author)
+        self.reader = self.followers[0]
+        self.client.force_authenticate(user=self.reader)
+
+    def publish(self, author, title):
+        return Article.objects.create(
+            title=title, slug=title, body='Body', author=author, status=Article.Status.PUBLISHED,
+        )
+
+    def feed(self, url='/api/v1/feed/'):
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp
+
+    def test_publish_fans_out_in_batches(self):
+        article = self.publish(self.author, 'first')
+        job = Job.objects.get(kind=FAN_OUT)
+        self.assertEqual(job.payload, {'article': article.pk})
+        self.assertFalse(TimelineEntry.objects.exists())
+
+        self.assertEqual(run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress), (Job.Status.DONE, {'delivered': 3}))
+        self.assertEqual(
+            set(TimelineEntry.objects.values_list('user_id', flat=True)),
+            {f.pk for f in self.followers},
+        )
+        self.assertEqual([a['slug'] for a in self.feed().data['results']], ['first'])
+
+    def test_only_first_publication_fans_out(self):
+        article = Article.objects.create(title='Draft', slug='draft', body='Body', author=self.author)
+        self.assertFalse(Job.objects.exists())
+        article.status = Article.Status.PUBLISHED
+        article.save()
+        self.assertIsNotNone(article.published_at)
+        article.title = 'Edited'
+        article.save()
+        self.assertEqual(Job.objects.filter(kind=FAN_OUT).count(), 1)
+
+    def test_authors_without_followers_are_not_fanned_out(self):
+        self.publish(self.other, 'lonely')
+        self.assertFalse(Job.objects.exists())
+
+    def test_feed_pages_with_cursor(self):
+        now = timezone.now()
+        for i in range(5):
+            article = self.publish(self.author, f'a{i}')
+            Article.objects.filter(pk=article.pk).update(published_at=now - timedelta(hours=5 - i))
+        run_pending()
+        resp = self.feed('/api/v1/feed/?page_size=2')
+        slugs = [a['slug'] for a in resp.data['results']]
+        self.assertIsNone(resp.data['previous'])
+        while resp.data['next']:
+            resp = self.feed(resp.data['next'])
+            slugs += [a['slug'] for a in resp.data['results']]
+        self.assertEqual(slugs, ['a4', 'a3', 'a2', 'a1', 'a0'])
+
+    def test_unpublished_and_deleted_articles_are_skipped(self):
+        kept, hidden, deleted = [self.publish(self.author, slug) for slug in ('kept', 'hidden', 'deleted')]
+        run_pending()
+        hidden.status = Article.Status.DRAFT
+        hidden.save()
+        deleted.soft_delete()
+        self.assertEqual([a['slug'] for a in self.feed().data['results']], ['kept'])
+
+    def test_follow_backfills_and_unfollow_clears(self):
+        self.publish(self.other, 'earlier')
+        follow = Follow.objects.create(follower=self.reader, author=self.other)
+        self.assertEqual([a['slug'] for a in self.feed().data['results']], ['earlier'])
+        follow.delete()
+        self.assertEqual(self.feed().data['results'], [])
+
+    @override_settings(FEEDS={'FAN_OUT_MAX_FOLLOWERS': 2})
+    def test_popular_authors_are_merged_at_read_time(self):
+        pushed = self.publish(self.other, 'pushed')
+        Follow.objects.create(follower=self.reader, author=self.other)
+        run_pending()
+        popular = self.publish(self.author, 'popular')
+        self.assertFalse(Job.objects.filter(payload={'article': popular.pk}).exists())
+        self.assertFalse(TimelineEntry.objects.filter(article=popular).exists())
+        # An article fanned out before its author became popular shows once.
+        TimelineEntry.objects.create(
+            user=self.reader, article=popular, author=self.author, published_at=popular.published_at,
+        )
+
+        resp = self.feed('/api/v1/feed/?page_size=1')
+        self.assertEqual([a['slug'] for a in resp.data['results']], ['popular'])
+        resp = self.feed(resp.data['next'])
+        self.assertEqual([a['slug'] for a in resp.data['results']], [pushed.slug])
+        self.assertIsNone(resp.data['next'])
+
+    def test_invalid_cursor(self):
+        resp = self.client.get('/api/v1/feed/?cursor=bogus')
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
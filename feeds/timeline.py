@@ -0,0 +1,163 @@
+from heapq import merge
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from api.pagination import KeysetPagination
+from articles.models import Article
+from jobs.runner import enqueue, get_config as get_jobs_config, handler
+from .models import Follow, TimelineEntry
+
+FAN_OUT = "feed_fan_out"
+
+DEFAULTS = {
+    # Authors with more followers than this are not fanned out: their
+    # articles are merged into each follower's feed when it is read.
+    "FAN_OUT_MAX_FOLLOWERS": 10000,
+    # Latest articles copied into a feed when its owner follows an author.
+    "BACKFILL": 20,
+}
+
+PUSHED_ORDERING = ["-published_at", "-article_id"]
+PULLED_ORDERING = ["-published_at", "-id"]
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "FEEDS", {})}
+
+
+def is_pushed(followers_count):
+    """Whether an author with ``followers_count`` followers is fanned out."""
+    return followers_count <= get_config()["FAN_OUT_MAX_FOLLOWERS"]
+
+
+def followers_count(author_id):
+    counts = get_user_model().objects.filter(pk=author_id)
+    return counts.values_list("followers_count", flat=True).first() or 0
+
+
+def entry(user_id, article):
+    return TimelineEntry(
+        user_id=user_id,
+        article=article,
+        author_id=article.author_id,
+        published_at=article.published_at,
+    )
+
+
+def enqueue_fan_out(article):
+    count = followers_count(article.author_id)
+    if count and is_pushed(count):
+        return enqueue(FAN_OUT, {"article": article.pk}, user=article.author)
+    return None
+
+
+@handler(FAN_OUT)
+def fan_out(job):
+    """
+    Copy a published article into its author's followers' timelines, walking
+    the followers in id order, ``BATCH_SIZE`` rows per ``INSERT``. Existing
+    entries are skipped, so a re-run only fills in what is missing.
+    """
+    article = Article.objects.filter(
+        pk=job.payload["article"], status=Article.Status.PUBLISHED
+    ).first()
+    delivered = 0
+    if article is not None and is_pushed(followers_count(article.author_id)):
+        batch_size = job.payload.get("batch_size") or get_jobs_config()["BATCH_SIZE"]
+        followers = (
+            Follow.objects.filter(author_id=article.author_id)
+            .order_by("follower_id")
+            .values_list("follower_id", flat=True)
+        )
+        last = 0
+        while True:
+            ids = list(followers.filter(follower_id__gt=last)[:batch_size])
+            if not ids:
+                break
+            TimelineEntry.objects.bulk_create(
+                [entry(user_id, article) for user_id in ids], ignore_conflicts=True
+            )
+            delivered += len(ids)
+            last = ids[-1]
+            job.report({"delivered": delivered})
+    job.report({"delivered": delivered})
+
+
+def backfill(follow):
+    """Give a new follower the author's latest articles."""
+    if not is_pushed(followers_count(follow.author_id)):
+        return
+    latest = Article.objects.filter(
+        author_id=follow.author_id, status=Article.Status.PUBLISHED
+    ).order_by("-published_at")[: get_config()["BACKFILL"]]
+    TimelineEntry.objects.bulk_create(
+        [entry(follow.follower_id, article) for article in latest],
+        ignore_conflicts=True,
+    )
+
+
+def pulled_authors(user):
+    """Followed authors too big to fan out, read at feed time instead."""
+    return list(
+        Follow.objects.filter(
+            follower=user,
+            author__followers_count__gt=get_config()["FAN_OUT_MAX_FOLLOWERS"],
+        ).values_list("author_id", flat=True)
+    )
+
+
+def timeline_keys(user, position, limit):
+    """
+    Up to ``limit`` ``(published_at, article_id)`` keys of ``user``'s feed
+    strictly after ``position``, newest first.
+
+    The user's timeline rows and the published articles of each pulled
+    author are read as separate index ranges of at most ``limit`` rows and
+    merged here; an article present in both (its author crossed the
+    threshold after it was fanned out) appears once.
+    """
+    sources = [
+        (
+            TimelineEntry.objects.filter(user=user).values_list(
+                "published_at", "article_id"
+            ),
+            PUSHED_ORDERING,
+        )
+    ]
+    for author_id in pulled_authors(user):
+        articles = Article.objects.filter(
+            author_id=author_id, status=Article.Status.PUBLISHED
+        )
+        sources.append((articles.values_list("published_at", "id"), PULLED_ORDERING))
+
+    streams = []
+    for queryset, ordering in sources:
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(
+                KeysetPagination.keyset_filter(ordering, position)
+            )
+        streams.append(list(queryset[:limit]))
+
+    keys = []
+    for key in merge(*streams, reverse=True):
+        if keys and keys[-1] == key:
+            continue
+        keys.append(key)
+        if len(keys) == limit:
+            break
+    return keys
+
+
+def timeline_articles(keys):
+    """The articles behind ``keys`` in order, minus unpublished or deleted ones."""
+    articles = (
+        Article.objects.filter(
+            pk__in=[pk for _, pk in keys], status=Article.Status.PUBLISHED
+        )
+        .select_related("category", "author")
+        .defer("body")
+    )
+    by_pk = {article.pk: article for article in articles}
+    return [by_pk[pk] for _, pk in keys if pk in by_pk]
@@ -0,0 +1,10 @@
+from django.urls import path
+from rest_framework.routers import SimpleRouter
+from .views import FollowViewSet, TimelineView
+
+router = SimpleRouter()
+router.register(r"follows", FollowViewSet, basename="follow")
+urlpatterns = [
+    path("", TimelineView.as_view(), name="timeline"),
+    *router.urls,
+]
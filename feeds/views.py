@@ -0,0 +1,53 @@
+from rest_framework.generics import ListAPIView
+from rest_framework.viewsets import ModelViewSet
+from rest_framework.permissions import IsAuthenticated
+from drf_spectacular.utils import extend_schema
+
+from articles.models import Article
+from articles.serializers import ArticleListSerializer
+from .models import Follow
+from .pagination import TimelinePagination
+from .permissions import CanFollow
+from .serializers import FollowSerializer, FollowCreateSerializer
+from api.pagination import KeysetPagination
+
+
+@extend_schema(tags=["Feed"])
+class TimelineView(ListAPIView):
+    """
+    Published articles by the authors you follow, newest first. Read from
+    your timeline, which is filled when articles are published, plus the
+    latest articles of followed authors too popular to fan out.
+    """
+
+    serializer_class = ArticleListSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = TimelinePagination
+    queryset = Article.objects.none()
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginator.paginate_timeline(request.user, request)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+@extend_schema(tags=["Feed"])
+class FollowViewSet(ModelViewSet):
+    serializer_class = FollowSerializer
+    permission_classes = [IsAuthenticated, CanFollow]
+    pagination_class = KeysetPagination
+    http_method_names = ["get", "post", "delete"]
+
+    def get_queryset(self):
+        qs = Follow.objects.select_related("author")
+        if getattr(self, "swagger_fake_view", False):
+            return qs
+        return qs.filter(follower=self.request.user)
+
+    def get_serializer_class(self):
+        if self.action == "create":
+            return FollowCreateSerializer
+        return FollowSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(follower=self.request.user)
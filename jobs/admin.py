@@ -0,0 +1,5 @@
+from django.contrib import admin
+from .models import Job, Watermark
+
+admin.site.register(Job)
+admin.site.register(Watermark)
@@ -0,0 +1,89 @@
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models.deletion import get_candidate_relations_to_delete
+
+from .runner import enqueue, get_config, handler
+
+CASCADE_DELETE = "cascade_delete"
+
+
+def enqueue_cascade_delete(instance, user=None):
+    """
+    Schedule ``instance`` and everything that cascades from it for deletion.
+    The caller marks the root row first (soft delete, deactivation) so it
+    disappears from the API immediately.
+    """
+    return enqueue(
+        CASCADE_DELETE,
+        {"model": instance._meta.label, "pk": instance.pk},
+        user=user,
+    )
+
+
+class CascadePurge:
+    """
+    Deletes a queryset the way ``on_delete`` says, but bottom-up and in
+    batches of ``batch_size`` rows, each in its own short transaction.
+
+    ``CASCADE`` children are purged (recursively) before their parents,
+    ``SET_NULL`` references are cleared batch by batch, so the final
+    ``delete()`` of each batch finds little or nothing left to collect.
+    Every step only touches rows still matching its query, so a purge that
+    was interrupted can simply run again.
+    """
+
+    def __init__(self, batch_size, on_progress=None):
+        self.batch_size = batch_size
+        self.on_progress = on_progress
+        self.progress = {"deleted": {}, "updated": {}}
+
+    def purge(self, queryset):
+        model = queryset.model
+        for relation in get_candidate_relations_to_delete(model._meta):
+            related = relation.related_model
+            if related is model:
+                # Self-references (comment replies) are collected per batch.
+                continue
+            field = relation.field.name
+            children = related._base_manager.filter(**{f"{field}__in": queryset})
+            if relation.on_delete is models.CASCADE:
+                self.purge(children)
+            elif relation.on_delete is models.SET_NULL:
+                self.in_batches(children, lambda batch, f=field: self.set_null(batch, f))
+        self.in_batches(queryset, self.delete)
+
+    def in_batches(self, queryset, operation):
+        model = queryset.model
+        while True:
+            pks = list(
+                queryset.order_by().values_list("pk", flat=True)[: self.batch_size]
+            )
+            if not pks:
+                return
+            with transaction.atomic():
+                operation(model._base_manager.filter(pk__in=pks))
+            if self.on_progress:
+                self.on_progress(self.progress)
+
+    def delete(self, batch):
+        _, per_model = batch.delete()
+        for label, count in per_model.items():
+            self.count("deleted", label, count)
+
+    def set_null(self, batch, field):
+        self.count("updated", batch.model._meta.label, batch.update(**{field: None}))
+
+    def count(self, kind, label, n):
+        if n:
+            self.progress[kind][label] = self.progress[kind].get(label, 0) + n
+
+
+@handler(CASCADE_DELETE)
+def cascade_delete(job):
+    model = apps.get_model(job.payload["model"])
+    purge = CascadePurge(
+        job.payload.get("batch_size") or get_config()["BATCH_SIZE"],
+        on_progress=job.report,
+    )
+    purge.purge(model._base_manager.filter(pk=job.payload["pk"]))
+    job.report(purge.progress)
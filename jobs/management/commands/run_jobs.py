@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.runner import requeue_stale, run_pending
+
+
+class Command(BaseCommand):
+    help = "Run pending background jobs, polling for new ones unless --once."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run what is pending now and exit.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep between polls.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            requeued = requeue_stale()
+            if requeued:
+                self.stdout.write(f"Requeued {requeued} stale jobs.")
+            ran = run_pending()
+            if ran:
+                self.stdout.write(self.style.SUCCESS(f"Ran {ran} jobs."))
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,31 @@
+from django.db import transaction
+from django.urls import reverse
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cascade import enqueue_cascade_delete
+from .serializers import JobSerializer
+
+
+class BackgroundDeleteMixin:
+    """
+    ``destroy`` marks the row (``mark_deleted``) and answers 202 with the
+    cascade-delete job that removes it and its dependents in batches.
+    Poll the job at the ``Location`` header for progress.
+    """
+
+    def mark_deleted(self, instance):
+        instance.soft_delete(user=self.request.user)
+
+    @extend_schema(responses={202: JobSerializer})
+    def destroy(self, request, *args, **kwargs):
+        instance = self.get_object()
+        with transaction.atomic():
+            self.mark_deleted(instance)
+            job = enqueue_cascade_delete(instance, user=request.user)
+        return Response(
+            JobSerializer(job).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": reverse("job-detail", args=[job.pk])},
+        )
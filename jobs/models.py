@@ -0,0 +1,73 @@
+from django.db import models
+from django.utils import timezone
+from mixins.model_mixin import AuditModel
+
+
+class Job(AuditModel):
+    """
+    A unit of background work, run by ``jobs.runner``. ``progress`` is
+    rewritten as the handler advances and doubles as a heartbeat through
+    ``updated_at``.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "Pending", "Pending"
+        RUNNING = "Running", "Running"
+        DONE = "Done", "Done"
+        FAILED = "Failed", "Failed"
+
+    kind = models.CharField(max_length=50)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    payload = models.JSONField(default=dict, blank=True)
+    progress = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True, default="")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name_plural = "Jobs"
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="job_status_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+    def report(self, progress):
+        """Persist ``progress`` without touching the rest of the row."""
+        self.progress = progress
+        Job.objects.filter(pk=self.pk).update(progress=progress, updated_at=timezone.now())
+
+
+class Watermark(models.Model):
+    """
+    How far an incremental process has consumed a time-ordered stream, e.g.
+    the newest like folded into the trending scores.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    value = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.value.isoformat()}"
+
+    @classmethod
+    def advance(cls, name, previous, value):
+        """
+        Move ``name`` from ``previous`` to ``value``; False if another run got
+        there first (compare-and-set, so concurrent runs cannot both apply
+        the same window).
+        """
+        if previous is None:
+            _, created = cls.objects.get_or_create(name=name, defaults={"value": value})
+            return created
+        return bool(
+            cls.objects.filter(name=name, value=previous).update(
+                value=value, updated_at=timezone.now()
+            )
+        )
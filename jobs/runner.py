@@ -0,0 +1,111 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # Start each job on a daemon thread once its transaction commits. With
+    # False, jobs wait for ``manage.py run_jobs``.
+    "RUN_IN_PROCESS": True,
+    "BATCH_SIZE": 500,
+    # Running jobs without a progress update for this long are presumed dead
+    # (e.g. the process exited) and handed out again by ``run_jobs``.
+    "STALE_AFTER": 300,
+}
+
+HANDLERS = {}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "JOBS", {})}
+
+
+def handler(kind):
+    """Register ``func(job)`` as the handler for jobs of ``kind``."""
+
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+
+    return register
+
+
+def enqueue(kind, payload, user=None):
+    """
+    Create a pending job. Call inside the transaction that makes the work
+    necessary; the job only starts once that transaction commits.
+    """
+    job = Job.objects.create(kind=kind, payload=payload, created_by=user)
+    if get_config()["RUN_IN_PROCESS"]:
+        transaction.on_commit(lambda: start_in_background(job.pk))
+    return job
+
+
+def start_in_background(job_id):
+    thread = threading.Thread(
+        target=_run_in_thread, args=(job_id,), name=f"job-{job_id}", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def _run_in_thread(job_id):
+    try:
+        run_job(job_id)
+    finally:
+        connection.close()
+
+
+def claim(job_id):
+    """Atomically move a pending job to running; False if someone else did."""
+    return bool(
+        Job.objects.filter(pk=job_id, status=Job.Status.PENDING).update(
+            status=Job.Status.RUNNING,
+            started_at=timezone.now(),
+            updated_at=timezone.now(),
+            attempts=F("attempts") + 1,
+        )
+    )
+
+
+def run_job(job_id):
+    if not claim(job_id):
+        return None
+    job = Job.objects.get(pk=job_id)
+    try:
+        HANDLERS[job.kind](job)
+    except Exception as exc:
+        logger.exception("Job %s (%s) failed", job.pk, job.kind)
+        status, error = Job.Status.FAILED, f"{type(exc).__name__}: {exc}"
+    else:
+        status, error = Job.Status.DONE, ""
+    Job.objects.filter(pk=job.pk).update(
+        status=status, error=error, finished_at=timezone.now(), updated_at=timezone.now()
+    )
+    job.refresh_from_db()
+    return job
+
+
+def requeue_stale():
+    cutoff = timezone.now() - timedelta(seconds=get_config()["STALE_AFTER"])
+    return Job.objects.filter(status=Job.Status.RUNNING, updated_at__lt=cutoff).update(
+        status=Job.Status.PENDING, updated_at=timezone.now()
+    )
+
+
+def run_pending(limit=None):
+    """Run pending jobs oldest first; returns how many were run here."""
+    ran = 0
+    pending = Job.objects.filter(status=Job.Status.PENDING).order_by("created_at", "pk")
+    for job_id in list(pending.values_list("pk", flat=True)[:limit]):
+        if run_job(job_id) is not None:
+            ran += 1
+    return ran
@@ -0,0 +1,133 @@
+from io import StringIO
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from authentication.models import User, Role, Permission
+from articles.models import Article
+from category.models import Category
+from comments.models import Comment
+from likes.models import Like
+from task.models import Task
+from .models import Job
+from .runner import run_pending
+
+
+def make_admin():
+    role = Role.objects.create(name='admin', permissions=Permission.WRITE | Permission.ADMIN)
+    return User.objects.create_user(email='admin@example.com', password='testpass123', role=role)
+
+
+@override_settings(JOBS={'BATCH_SIZE': 2})
+class CascadeDeleteJobTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = make_admin()
+        self.client.force_authenticate(user=self.admin)
+        self.author = User.objects.create_user(email='author@example.com', password='testpass123')
+        self.other = User.objects.create_user(email='other@example.com', password='testpass123')
+        self.category = Category.objects.create(name='Tech', description='Tech')
+        self.articles = [
+            Article.objects.create(
+                title=f'A{i}', slug=f'a{i}', body='body', author=self.author, category=self.category,
+            )
+            for i in range(3)
+        ]
+        self.kept = Article.objects.create(title='Kept', slug='kept', body='body', author=self.other)
+        for article in self.articles:
+            Like.objects.create(article=article, user=self.other)
+            top = Comment.objects.create(article=article, author=self.other, body='Top')
+            Comment.objects.create(article=article, author=self.author, body='Re', parent=top)
+        Like.objects.create(article=self.kept, user=self.author)
+        Comment.objects.create(article=self.kept, author=self.author, body='Hi')
+
+    def test_user_delete_runs_in_batches(self):
+        resp = self.client.delete(f'/api/v1/users/{self.author.pk}/')
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(resp['Location'], f'/api/v1/jobs/{resp.data["id"]}/')
+        self.assertEqual(resp.data['status'], Job.Status.PENDING)
+        # Nothing is removed inside the request.
+        self.assertTrue(User.objects.filter(pk=self.author.pk).exists())
+        self.assertEqual(Article.objects.filter(author=self.author).count(), 3)
+
+        self.assertEqual(run_pending(), 1)
+        job = Job.objects.get(pk=resp.data['id'])
+        self.assertEqual(job.status, Job.Status.DONE)
+        self.assertFalse(User.objects.filter(pk=self.author.pk).exists())
+        self.assertEqual(list(Article.all_with_deleted.all()), [self.kept])
+        self.assertEqual(job.progress['deleted']['articles.Article'], 3)
+        self.assertEqual(job.progress['deleted']['likes.Like'], 4)
+        self.assertEqual(job.progress['deleted']['comments.Comment'], 7)
+        self.assertEqual(Comment.objects.count(), 0)
+
+        self.kept.refresh_from_db()
+        self.assertEqual((self.kept.likes_count, self.kept.comments_count), (0, 0))
+        self.assertEqual(Category.objects.get(pk=self.category.pk).articles.count(), 0)
+
+    def test_category_delete_removes_tasks_and_detaches_articles(self):
+        Task.objects.create(title='T1', description='D', category=self.category)
+        Task.objects.create(title='T2', description='D', category=self.category)
+        resp = self.client.delete(f'/api/v1/categories/{self.category.pk}/')
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(Category.objects.filter(pk=self.category.pk).exists())
+        run_pending()
+        self.assertFalse(Category.all_with_deleted.filter(pk=self.category.pk).exists())
+        self.assertEqual(Task.all_with_deleted.count(), 0)
+        self.assertEqual(Article.objects.filter(category__isnull=True).count(), 4)
+        job = Job.objects.get(pk=resp.data['id'])
+        self.assertEqual(job.progress['updated']['articles.Article'], 3)
+
+    def test_article_delete_purges_comments_and_likes(self):
+        article = self.articles[0]
+        resp = self.client.delete(f'/api/v1/articles/{article.pk}/')
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
+        run_pending()
+        self.assertFalse(Article.all_with_deleted.filter(pk=article.pk).exists())
+        self.assertFalse(Comment.all_with_deleted.filter(article_id=article.pk).exists())
+        self.assertFalse(Like.objects.filter(article_id=article.pk).exists())
+
+
+class JobRunnerTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = make_admin()
+        self.user = User.objects.create_user(email='user@example.com', password='testpass123')
+
+    def test_failed_job_records_error(self):
+        job = Job.objects.create(
+            kind='cascade_delete', payload={'model': 'nope.Nope', 'pk': 1}, created_by=self.user,
+        )
+        with self.assertLogs('jobs.runner', 'ERROR'):
+            run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertIn('LookupError', job.error)
+
+    def test_stale_running_job_is_requeued(self):
+        category = Category.objects.create(name='Tech', description='Tech')
+        job = Job.objects.create(
+            kind='cascade_delete',
+            payload={'model': 'category.Category', 'pk': category.pk},
+            status=Job.Status.RUNNING,
+        )
+        Job.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        out = StringIO()
+        call_command('run_jobs', once=True, stdout=out)
+        self.assertIn('Requeued 1 stale jobs.', out.getvalue())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.DONE)
+        self.assertEqual(job.attempts, 1)
+
+    def test_jobs_visible_to_owner_and_admin(self):
+        job = Job.objects.create(kind='cascade_delete', created_by=self.user)
+        other = User.objects.create_user(email='other@example.com', password='testpass123')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(f'/api/v1/jobs/{job.pk}/').status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(user=self.user)
+        resp = self.client.get(f'/api/v1/jobs/{job.pk}/')
+        self.assertEqual(resp.data['status'], Job.Status.PENDING)
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(len(self.client.get('/api/v1/jobs/').data['results']), 1)
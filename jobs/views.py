@@ -0,0 +1,29 @@
+from rest_framework.viewsets import ReadOnlyModelViewSet
+from rest_framework.permissions import IsAuthenticated
+from drf_spectacular.utils import extend_schema
+
+from authentication.models import Permission
+from authentication.permissions import request_has_permission
+from .models import Job
+from .serializers import JobSerializer
+from api.pagination import KeysetPagination
+
+
+@extend_schema(tags=["Jobs"])
+class JobViewSet(ReadOnlyModelViewSet):
+    """Background jobs: admins see all of them, everyone else their own."""
+
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        qs = Job.objects.all()
+        if getattr(self, "swagger_fake_view", False):
+            return qs
+        if not request_has_permission(self.request, Permission.ADMIN):
+            qs = qs.filter(created_by=self.request.user)
+        status = self.request.query_params.get("status")
+        if status:
+            qs = qs.filter(status=status)
+        return qs
@@ -0,0 +1,128 @@
+from django.conf import settings
+from django.db import connection, transaction
+
+from api.buffers import WriteBehindBuffer
+from articles.cache import invalidate_engagement
+from articles.counters import count_subquery
+from articles.models import Article
+from .models import Like
+from .toggle import forget_likes, sql_names
+
+DEFAULTS = {
+    # Buffer PUT/DELETE /likes/article/<id>/ instead of writing each one.
+    "WRITE_BEHIND": False,
+    "FLUSH_INTERVAL": 1,
+    "MAX_PENDING": 1000,
+    # POST /likes/mine/: ids per request, and the per-user answer cache.
+    "LOOKUP_MAX_IDS": 5000,
+    "LOOKUP_CACHE_SIZE": 5000,
+    "LOOKUP_CACHE_TIMEOUT": 300,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "LIKES", {})}
+
+
+class LikeBuffer(WriteBehindBuffer):
+    """
+    Like and unlike intents keyed by ``(article_id, user_id)``.
+
+    Intents for the same pair coalesce and the last one wins, so a burst of
+    taps costs at most one row write. A flush is one transaction holding a
+    ``bulk_create(ignore_conflicts=True)`` of the likes, one ``DELETE`` of
+    the unlikes and one ``UPDATE`` recounting ``likes_count`` of the
+    articles touched, whatever the number of intents.
+    """
+
+    def __str__(self):
+        return "likes"
+
+    def add(self, article_id, user_id, liked):
+        with self._lock:
+            self._pending[(article_id, user_id)] = liked
+
+    def pending_for(self, user_id, article_ids):
+        """``{article_id: liked}`` for the buffered intents of ``user_id``."""
+        with self._lock:
+            return {
+                article_id: liked
+                for (article_id, user), liked in self._pending.items()
+                if user == user_id and article_id in article_ids
+            }
+
+    def write(self, pending):
+        with transaction.atomic():
+            # Intents for articles purged since they were buffered are dropped.
+            articles = set(
+                Article.all_with_deleted.filter(
+                    pk__in={article_id for article_id, _ in pending}
+                ).values_list("pk", flat=True)
+            )
+            Like.objects.bulk_create(
+                [
+                    Like(
+                        article_id=article_id,
+                        user_id=user_id,
+                        created_by_id=user_id,
+                        updated_by_id=user_id,
+                    )
+                    for (article_id, user_id), liked in pending.items()
+                    if liked and article_id in articles
+                ],
+                ignore_conflicts=True,
+            )
+            delete_likes([pair for pair, liked in pending.items() if not liked])
+            # Which rows the two statements changed is unknown, so the
+            # counters are recounted rather than adjusted.
+            Article.all_with_deleted.filter(pk__in=articles).update(
+                likes_count=count_subquery(Like)
+            )
+        if articles:
+            invalidate_engagement(*articles)
+        for user_id in {user_id for _, user_id in pending}:
+            forget_likes(user_id)
+        return len(pending)
+
+
+def delete_likes(pairs):
+    """Delete the likes of ``(article_id, user_id)`` pairs in one statement."""
+    if not pairs:
+        return 0
+    likes, columns = sql_names(Like, "article", "user")
+    values = ", ".join(["(%s, %s)"] * len(pairs))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {likes} WHERE ({columns['article']}, {columns['user']}) "
+            f"IN (VALUES {values})",
+            [value for pair in pairs for value in pair],
+        )
+        return cursor.rowcount
+
+
+config = get_config()
+
+like_buffer = LikeBuffer(
+    interval=config["FLUSH_INTERVAL"], max_pending=config["MAX_PENDING"]
+)
+
+
+def pending_likes(user_id, article_ids):
+    """``UserFlagField`` hook: this process's unflushed likes of ``user_id``."""
+    return like_buffer.pending_for(user_id, article_ids)
+
+
+def buffer_like(article_id, user_id, liked):
+    """
+    Queue the intent and return the article's stored ``likes_count``, or
+    ``None`` if the article does not exist or is deleted. Only this read
+    reaches the database; the write waits for the next flush.
+    """
+    likes_count = (
+        Article.objects.filter(pk=article_id)
+        .values_list("likes_count", flat=True)
+        .first()
+    )
+    if likes_count is not None:
+        like_buffer.add(article_id, user_id, liked)
+    return likes_count
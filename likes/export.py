@@ -0,0 +1,7 @@
+LIKE_EXPORT_COLUMNS = (
+    "id",
+    "article_id",
+    "user_id",
+    "user__email",
+    "created_at",
+)
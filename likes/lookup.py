@@ -0,0 +1,55 @@
+import base64
+
+from django.core.cache import cache
+
+from .buffer import get_config, pending_likes
+from .models import Like
+from .toggle import liked_cache_key, liked_version
+
+
+def liked_ids(user_id, article_ids):
+    """
+    The subset of ``article_ids`` liked by ``user_id``.
+
+    Each user's recent answers, liked or not, are cached as one
+    ``{article_id: liked}`` entry of at most ``LOOKUP_CACHE_SIZE`` ids; only
+    ids missing from it are looked up, with one query on
+    ``like_user_article_idx``. Intents still in this process's write-behind
+    buffer override both. Answers read while the user's likes changed are
+    not cached.
+    """
+    config = get_config()
+    version = liked_version(user_id)
+    wanted = set(article_ids)
+    cached = cache.get(liked_cache_key(user_id)) or {}
+    missing = wanted - cached.keys()
+    liked = {pk for pk in wanted - missing if cached[pk]}
+    if missing:
+        found = set(
+            Like.objects.filter(user_id=user_id, article_id__in=missing)
+            .order_by()
+            .values_list("article_id", flat=True)
+        )
+        liked |= found
+        # New answers go last, so trimming drops the oldest.
+        known = {**cached, **{pk: pk in found for pk in sorted(missing)}}
+        size = config["LOOKUP_CACHE_SIZE"]
+        if len(known) > size:
+            known = dict(list(known.items())[-size:])
+        if liked_version(user_id) == version:
+            cache.set(liked_cache_key(user_id), known, config["LOOKUP_CACHE_TIMEOUT"])
+    for pk, on in pending_likes(user_id, wanted).items():
+        if on:
+            liked.add(pk)
+        else:
+            liked.discard(pk)
+    return liked
+
+
+def bitmap(article_ids, liked):
+    """Base64 of one bit per requested id, in request order, LSB first."""
+    bits = bytearray((len(article_ids) + 7) // 8)
+    for i, pk in enumerate(article_ids):
+        if pk in liked:
+            bits[i // 8] |= 1 << (i % 8)
+    return base64.b64encode(bytes(bits)).decode("ascii")
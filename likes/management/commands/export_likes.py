@@ -0,0 +1,18 @@
+from api.export import ExportCommand
+from likes.export import LIKE_EXPORT_COLUMNS
+from likes.models import Like
+
+
+class Command(ExportCommand):
+    help = "Stream likes as CSV or NDJSON."
+    columns = LIKE_EXPORT_COLUMNS
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--article", type=int)
+
+    def get_queryset(self, options):
+        qs = Like.objects.order_by("pk")
+        if options["article"] is not None:
+            qs = qs.filter(article_id=options["article"])
+        return qs
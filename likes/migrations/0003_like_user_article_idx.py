@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("likes", "0002_like_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="like",
+            index=models.Index(
+                fields=["user", "article"],
+                name="like_user_article_idx",
+            ),
+        ),
+    ]
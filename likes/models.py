@@ -19,6 +19,14 @@ class Like(AuditModel):
         unique_together = ("article", "user")
         ordering = ["-created_at"]
         verbose_name_plural = "Likes"
+        indexes = [
+            models.Index(
+                fields=["article", "created_at"], name="like_article_created_idx"
+            ),
+            models.Index(fields=["created_at"], name="like_created_idx"),
+            # "Which of these articles did I like" (likes.lookup).
+            models.Index(fields=["user", "article"], name="like_user_article_idx"),
+        ]
 
     def __str__(self):
         return f"Like by {self.user_id} on {self.article_id}"
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from .buffer import get_config
 from .models import Like
 
 
@@ -19,3 +20,36 @@ class LikeCreateSerializer(serializers.ModelSerializer):
         if Like.objects.filter(article=value, user=user).exists():
             raise serializers.ValidationError("You have already liked this article.")
         return value
+
+
+class LikeStateSerializer(serializers.Serializer):
+    article = serializers.IntegerField()
+    liked = serializers.BooleanField()
+    likes_count = serializers.IntegerField()
+
+
+class LikedLookupSerializer(serializers.Serializer):
+    articles = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False
+    )
+    encoding = serializers.ChoiceField(
+        choices=["ids", "bitmap"],
+        default="ids",
+        help_text=(
+            "``ids`` lists the liked ids; ``bitmap`` is base64 with one bit per "
+            "requested id, in request order, least significant bit first."
+        ),
+    )
+
+    def validate_articles(self, articles):
+        limit = get_config()["LOOKUP_MAX_IDS"]
+        if len(articles) > limit:
+            raise serializers.ValidationError(
+                f"At most {limit} articles can be looked up at once."
+            )
+        return articles
+
+
+class LikedLookupResultSerializer(serializers.Serializer):
+    liked = serializers.ListField(child=serializers.IntegerField(), required=False)
+    bitmap = serializers.CharField(required=False)
@@ -0,0 +1,30 @@
+from django.core.signals import request_finished
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from articles.models import Article
+from .buffer import like_buffer
+from .models import Like
+from .toggle import forget_likes
+
+
+@receiver(post_save, sender=Like)
+def increment_likes_count(sender, instance, created, **kwargs):
+    if created:
+        Article.adjust_counter(instance.article_id, "likes_count", 1)
+
+
+@receiver(post_delete, sender=Like)
+def decrement_likes_count(sender, instance, **kwargs):
+    Article.adjust_counter(instance.article_id, "likes_count", -1)
+
+
+@receiver(post_save, sender=Like)
+@receiver(post_delete, sender=Like)
+def forget_liked_ids(sender, instance, **kwargs):
+    forget_likes(instance.user_id)
+
+
+@receiver(request_finished)
+def flush_like_buffer(sender, **kwargs):
+    like_buffer.flush_if_due()
@@ -1,9 +1,22 @@
-from django.test import TestCase
+import base64
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
 from authentication.models import User, Role, Permission
+from articles.counters import article_views
 from articles.models import Article
+from .buffer import like_buffer
+from .lookup import liked_ids
 from .models import Like
+from .serializers import LikeCreateSerializer
+from .toggle import set_like
 
 
 def make_user(email="user@example.com"):
@@ -48,13 +61,22 @@ class LikeCRUDTest(TestCase):
         Like.objects.create(article=self.article, user=self.user)
         resp = self.client.get("/api/v1/likes/", {"article": self.article.pk})
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(resp.data), 1)
+        self.assertEqual(len(resp.data["results"]), 1)
 
     def test_unauthenticated_rejected(self):
         self.client.force_authenticate(user=None)
         resp = self.client.post("/api/v1/likes/", {"article": self.article.pk})
         self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_concurrent_duplicate_is_a_400(self):
+        Like.objects.create(article=self.article, user=self.user)
+        # As if the other request inserted right after this one's check.
+        with mock.patch.object(
+            LikeCreateSerializer, "validate_article", lambda self, value: value
+        ):
+            resp = self.client.post("/api/v1/likes/", {"article": self.article.pk})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_no_put_patch_allowed(self):
         like = Like.objects.create(article=self.article, user=self.user)
         resp = self.client.put(
@@ -65,3 +87,289 @@ class LikeCRUDTest(TestCase):
             f"/api/v1/likes/{like.pk}/", {"article": self.article.pk}
         )
         self.assertEqual(resp.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class LikeToggleTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = make_user()
+        self.client.force_authenticate(user=self.user)
+        self.article = Article.objects.create(
+            title="Test", slug="test", body="body", author=self.user
+        )
+        self.url = f"/api/v1/likes/article/{self.article.pk}/"
+
+    def statements(self, method):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = getattr(self.client, method)(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        sql = [
+            q["sql"].split()[0]
+            for q in ctx.captured_queries
+            if "SAVEPOINT" not in q["sql"]
+        ]
+        return resp.data, sql
+
+    def test_like_and_unlike_are_idempotent(self):
+        data, sql = self.statements("put")
+        self.assertEqual(
+            data, {"article": self.article.pk, "liked": True, "likes_count": 1}
+        )
+        # The write comes first; nothing is read before it.
+        self.assertEqual(sql, ["INSERT", "UPDATE"])
+        data, sql = self.statements("put")
+        self.assertEqual((data["liked"], data["likes_count"]), (True, 1))
+        self.assertEqual(sql, ["INSERT", "SELECT"])
+        self.assertEqual(Like.objects.get().user, self.user)
+
+        data, sql = self.statements("delete")
+        self.assertEqual((data["liked"], data["likes_count"]), (False, 0))
+        self.assertEqual(sql, ["DELETE", "UPDATE"])
+        data, _ = self.statements("delete")
+        self.assertEqual((data["liked"], data["likes_count"]), (False, 0))
+        self.assertFalse(Like.objects.exists())
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 0)
+
+    def test_existing_like_is_kept(self):
+        Like.objects.create(article=self.article, user=self.user)
+        data, _ = self.statements("put")
+        self.assertEqual((data["liked"], data["likes_count"]), (True, 1))
+
+    def test_missing_or_deleted_article(self):
+        resp = self.client.put("/api/v1/likes/article/999999/")
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+        self.article.soft_delete()
+        resp = self.client.put(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Like.objects.exists())
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        resp = self.client.put(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(LIKES={"WRITE_BEHIND": True})
+class LikeWriteBehindTest(TestCase):
+    def setUp(self):
+        like_buffer.discard()
+        self.addCleanup(like_buffer.discard)
+        self.addCleanup(article_views.discard)
+        patcher = mock.patch.object(like_buffer, "interval", 3600)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.user = make_user()
+        self.other = make_user("other@example.com")
+        self.client.force_authenticate(user=self.user)
+        self.articles = [
+            Article.objects.create(
+                title=f"A{i}", slug=f"a-{i}", body="body", author=self.user
+            )
+            for i in range(3)
+        ]
+
+    def toggle(self, method, article, user=None):
+        self.client.force_authenticate(user=user or self.user)
+        resp = getattr(self.client, method)(f"/api/v1/likes/article/{article.pk}/")
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
+        return resp.data
+
+    def stored_counts(self):
+        return list(
+            Article.objects.order_by("pk").values_list("likes_count", flat=True)
+        )
+
+    def test_intents_wait_for_the_flush(self):
+        first, second, third = self.articles
+        Like.objects.create(article=third, user=self.user)
+        self.toggle("put", first)
+        self.toggle("put", first, self.other)
+        self.toggle("put", second)
+        self.toggle("delete", third)
+        self.assertEqual(Like.objects.count(), 1)
+        self.assertEqual(self.stored_counts(), [0, 0, 1])
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(like_buffer.flush(), 4)
+        writes = [
+            q["sql"].split()[0]
+            for q in ctx.captured_queries
+            if q["sql"].split()[0] in ("INSERT", "DELETE", "UPDATE")
+        ]
+        self.assertEqual(writes, ["INSERT", "DELETE", "UPDATE"])
+        self.assertEqual(self.stored_counts(), [2, 1, 0])
+        self.assertEqual(
+            set(Like.objects.values_list("article_id", "user_id")),
+            {
+                (first.pk, self.user.pk),
+                (first.pk, self.other.pk),
+                (second.pk, self.user.pk),
+            },
+        )
+
+    def test_last_intent_wins(self):
+        article = self.articles[0]
+        Like.objects.create(article=article, user=self.user)
+        for method in ("delete", "put", "delete"):
+            self.toggle(method, article)
+        self.assertEqual(like_buffer.pending(), {(article.pk, self.user.pk): False})
+        like_buffer.flush()
+        self.assertFalse(Like.objects.exists())
+        self.assertEqual(self.stored_counts()[0], 0)
+
+    def test_reads_see_pending_intents(self):
+        first, second, _ = self.articles
+        Like.objects.create(article=second, user=self.user)
+        self.toggle("put", first)
+        self.toggle("delete", second)
+        resp = self.client.get("/api/v1/articles/")
+        liked = {a["id"]: a["is_liked"] for a in resp.data["results"]}
+        self.assertEqual((liked[first.pk], liked[second.pk]), (True, False))
+        resp = self.client.get(f"/api/v1/articles/{first.pk}/")
+        self.assertTrue(resp.data["is_liked"])
+        # Only the user who sent them sees them.
+        self.client.force_authenticate(user=self.other)
+        resp = self.client.get(f"/api/v1/articles/{first.pk}/")
+        self.assertFalse(resp.data["is_liked"])
+
+    def test_missing_article_is_not_buffered(self):
+        resp = self.client.put("/api/v1/likes/article/999999/")
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(like_buffer.pending(), {})
+
+    def test_flushes_after_request_once_due(self):
+        with mock.patch.object(like_buffer, "interval", 0):
+            self.toggle("put", self.articles[0])
+        self.assertEqual(like_buffer.pending(), {})
+        self.assertEqual(self.stored_counts()[0], 1)
+
+    def test_failed_flush_keeps_newer_intents(self):
+        article = self.articles[0]
+        self.toggle("put", article)
+        with mock.patch(
+            "django.db.models.QuerySet.bulk_create", side_effect=DatabaseError
+        ), self.assertLogs("api.buffers", "ERROR"):
+            self.assertEqual(like_buffer.flush(), 0)
+        self.assertEqual(like_buffer.pending(), {(article.pk, self.user.pk): True})
+        like_buffer.add(article.pk, self.user.pk, False)
+        like_buffer.restore({(article.pk, self.user.pk): True})
+        self.assertEqual(like_buffer.pending(), {(article.pk, self.user.pk): False})
+
+
+class LikedLookupTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = make_user()
+        self.client.force_authenticate(user=self.user)
+        self.articles = [
+            Article.objects.create(
+                title=f"A{i}", slug=f"a-{i}", body="body", author=self.user
+            )
+            for i in range(10)
+        ]
+        self.ids = [a.pk for a in self.articles]
+        for article in self.articles[1::3]:
+            Like.objects.create(article=article, user=self.user)
+        other = make_user("other@example.com")
+        Like.objects.create(article=self.articles[0], user=other)
+
+    def lookup(self, ids, **extra):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post(
+                "/api/v1/likes/mine/", {"articles": ids, **extra}, format="json"
+            )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        queries = [q for q in ctx.captured_queries if '"likes_like"' in q["sql"]]
+        return resp.data, len(queries)
+
+    def test_liked_ids(self):
+        data, queries = self.lookup(self.ids + [999999])
+        self.assertEqual(data, {"liked": self.ids[1::3]})
+        self.assertEqual(queries, 1)
+
+    def test_bitmap_follows_request_order(self):
+        ids = list(reversed(self.ids))
+        data, _ = self.lookup(ids, encoding="bitmap")
+        bits = base64.b64decode(data["bitmap"])
+        self.assertEqual(len(bits), 2)
+        flags = [bool(bits[i // 8] & 1 << (i % 8)) for i in range(len(ids))]
+        self.assertEqual(flags, [pk in self.ids[1::3] for pk in ids])
+
+    def test_answers_are_cached_until_a_like_changes(self):
+        self.lookup(self.ids[:5])
+        data, queries = self.lookup(self.ids[:3])
+        self.assertEqual((data["liked"], queries), ([self.ids[1]], 0))
+        # Only the ids not asked before are looked up.
+        _, queries = self.lookup(self.ids)
+        self.assertEqual(queries, 1)
+
+        self.client.put(f"/api/v1/likes/article/{self.ids[0]}/")
+        data, queries = self.lookup(self.ids[:3])
+        self.assertEqual((data["liked"], queries), (self.ids[:2], 1))
+        Like.objects.filter(article_id=self.ids[1], user=self.user).delete()
+        data, _ = self.lookup(self.ids[:3])
+        self.assertEqual(data["liked"], [self.ids[0]])
+
+    def test_like_during_lookup_is_not_cached_over(self):
+        real_filter = Like.objects.filter
+
+        def racing_filter(*args, **kwargs):
+            stale = list(real_filter(*args, **kwargs).values_list("pk", flat=True))
+            set_like(self.ids[0], self.user.pk, True)
+            return real_filter(pk__in=stale)
+
+        with mock.patch.object(Like.objects, "filter", side_effect=racing_filter):
+            self.assertEqual(liked_ids(self.user.pk, self.ids[:2]), {self.ids[1]})
+        self.assertEqual(liked_ids(self.user.pk, self.ids[:2]), set(self.ids[:2]))
+
+    @override_settings(LIKES={"LOOKUP_CACHE_SIZE": 4})
+    def test_cache_keeps_the_newest_answers(self):
+        self.lookup(self.ids[:3])
+        self.lookup(self.ids[3:6])
+        _, queries = self.lookup(self.ids[4:6])
+        self.assertEqual(queries, 0)
+        _, queries = self.lookup(self.ids[:1])
+        self.assertEqual(queries, 1)
+
+    @override_settings(LIKES={"WRITE_BEHIND": True})
+    def test_sees_buffered_intents(self):
+        like_buffer.discard()
+        self.addCleanup(like_buffer.discard)
+        with mock.patch.object(like_buffer, "interval", 3600):
+            self.client.put(f"/api/v1/likes/article/{self.ids[0]}/")
+            self.client.delete(f"/api/v1/likes/article/{self.ids[1]}/")
+            data, _ = self.lookup(self.ids[:2])
+        self.assertEqual(data["liked"], [self.ids[0]])
+
+    @override_settings(LIKES={"LOOKUP_MAX_IDS": 2})
+    def test_size_is_capped(self):
+        resp = self.client.post(
+            "/api/v1/likes/mine/", {"articles": self.ids[:3]}, format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LikeExportTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = make_user()
+        self.client.force_authenticate(user=self.user)
+        self.article = Article.objects.create(
+            title="Test", slug="test", body="body", author=self.user
+        )
+        Like.objects.create(article=self.article, user=self.user)
+        Like.objects.create(article=self.article, user=make_user("other@example.com"))
+
+    def test_csv_export(self):
+        resp = self.client.get("/api/v1/likes/export/")
+        lines = b"".join(resp.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,article_id,user_id,user__email,created_at")
+        self.assertEqual(len(lines), 3)
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command("export_likes", article=self.article.pk, stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
@@ -0,0 +1,102 @@
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from articles.cache import invalidate_engagement
+from articles.models import Article
+from .models import Like
+
+
+def sql_names(model, *fields):
+    """Quoted table and column names of ``model`` for raw SQL."""
+    qn = connection.ops.quote_name
+    meta = model._meta
+    return qn(meta.db_table), {
+        name: qn(meta.get_field(name).column) for name in fields
+    }
+
+
+def liked_cache_key(user_id):
+    return f"liked-by:{user_id}"
+
+
+def liked_version_key(user_id):
+    return f"liked-by-version:{user_id}"
+
+
+def liked_version(user_id):
+    return cache.get(liked_version_key(user_id), 0)
+
+
+def forget_likes(user_id):
+    """
+    Drop ``likes.lookup``'s cached answers after a write to the user's likes,
+    and bump the version so a lookup that read the rows before the write
+    does not store its answer afterwards.
+    """
+    cache.delete(liked_cache_key(user_id))
+    key = liked_version_key(user_id)
+    cache.add(key, 0)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Expired between the two calls.
+        cache.set(key, 1)
+
+
+def set_like(article_id, user_id, liked):
+    """
+    Make ``user_id``'s like of ``article_id`` exist (``liked=True``) or not,
+    and return the article's ``likes_count`` afterwards, or ``None`` if the
+    article does not exist or is deleted.
+
+    The write is a single ``INSERT ... ON CONFLICT DO NOTHING`` or
+    ``DELETE``, with no read before it: a repeated or concurrent request is
+    a no-op instead of an ``IntegrityError``. Its row count says whether
+    anything changed, and the counter moves by exactly that with an
+    ``UPDATE ... RETURNING``. No model signals are sent.
+    """
+    likes, lc = sql_names(
+        Like, "article", "user", "created_at", "updated_at", "created_by", "updated_by"
+    )
+    articles, ac = sql_names(Article, "id", "likes_count", "deleted_at")
+    live_article = f"{ac['id']} = %s AND {ac['deleted_at']} IS NULL"
+    count = ac["likes_count"]
+    with transaction.atomic(), connection.cursor() as cursor:
+        if liked:
+            now = connection.ops.adapt_datetimefield_value(timezone.now())
+            cursor.execute(
+                f"INSERT INTO {likes} ({', '.join(lc.values())}) "
+                f"SELECT {ac['id']}, %s, %s, %s, %s, %s FROM {articles} "
+                f"WHERE {live_article} "
+                f"ON CONFLICT ({lc['article']}, {lc['user']}) DO NOTHING",
+                [user_id, now, now, user_id, user_id, article_id],
+            )
+            delta = cursor.rowcount
+        else:
+            cursor.execute(
+                f"DELETE FROM {likes} WHERE {lc['article']} = %s AND {lc['user']} = %s",
+                [article_id, user_id],
+            )
+            delta = -cursor.rowcount
+        if delta:
+            cursor.execute(
+                f"UPDATE {articles} SET {count} = CASE WHEN {count} + %s < 0 "
+                f"THEN 0 ELSE {count} + %s END "
+                f"WHERE {live_article} RETURNING {count}",
+                [delta, delta, article_id],
+            )
+        else:
+            cursor.execute(
+                f"SELECT {count} FROM {articles} WHERE {live_article}",
+                [article_id],
+            )
+        row = cursor.fetchone()
+        if row is None:
+            # Unliking a deleted article is not a change either.
+            transaction.set_rollback(True)
+            return None
+    if delta:
+        invalidate_engagement(article_id)
+        forget_likes(user_id)
+    return row[0]
@@ -1,6 +1,10 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import LikeViewSet
+from .views import LikeToggleView, LikeViewSet
 
 router = DefaultRouter()
 router.register(r"", LikeViewSet, basename="like")
-urlpatterns = router.urls
+urlpatterns = [
+    path("article/<int:article_id>/", LikeToggleView.as_view(), name="like-toggle"),
+    *router.urls,
+]
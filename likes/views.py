@@ -1,19 +1,42 @@
+from django.db import IntegrityError
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema
 
 from .models import Like
-from .serializers import LikeSerializer, LikeCreateSerializer
+from .export import LIKE_EXPORT_COLUMNS
+from .lookup import bitmap, liked_ids
+from .serializers import (
+    LikeCreateSerializer,
+    LikedLookupResultSerializer,
+    LikedLookupSerializer,
+    LikeSerializer,
+    LikeStateSerializer,
+)
+from .buffer import buffer_like, get_config
+from .toggle import set_like
+from api.export import ExportMixin
+from api.pagination import KeysetPagination
 
 
 @extend_schema(tags=["Likes"])
-class LikeViewSet(ModelViewSet):
+class LikeViewSet(ExportMixin, ModelViewSet):
     serializer_class = LikeSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     http_method_names = ["get", "post", "delete"]
+    export_columns = LIKE_EXPORT_COLUMNS
+    export_filename = "likes"
 
     def get_queryset(self):
-        qs = Like.objects.select_related("user", "article").all()
+        qs = Like.objects.filter(article__deleted_at__isnull=True).select_related(
+            "user", "article"
+        )
         article_id = self.request.query_params.get("article")
         if article_id:
             qs = qs.filter(article_id=article_id)
@@ -24,5 +47,59 @@ class LikeViewSet(ModelViewSet):
             return LikeCreateSerializer
         return LikeSerializer
 
+    @extend_schema(
+        tags=["Likes"],
+        request=LikedLookupSerializer,
+        responses=LikedLookupResultSerializer,
+    )
+    @action(detail=False, methods=["post"])
+    def mine(self, request):
+        """
+        Which of up to ``LIKES["LOOKUP_MAX_IDS"]`` articles the caller likes,
+        without fetching the articles: ``{"liked": [...]}`` or, with
+        ``"encoding": "bitmap"``, ``{"bitmap": "..."}``.
+        """
+        serializer = LikedLookupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        articles = serializer.validated_data["articles"]
+        liked = liked_ids(request.user.pk, articles)
+        if serializer.validated_data["encoding"] == "bitmap":
+            return Response({"bitmap": bitmap(articles, liked)})
+        return Response({"liked": sorted(liked)})
+
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        try:
+            serializer.save(user=self.request.user)
+        except IntegrityError:
+            # A concurrent request got in between the validator and the insert.
+            raise ValidationError({"article": ["You have already liked this article."]})
+
+
+@extend_schema(tags=["Likes"], request=None, responses=LikeStateSerializer)
+class LikeToggleView(APIView):
+    """
+    ``PUT`` likes the article, ``DELETE`` unlikes it; both are idempotent and
+    answer with the resulting state and ``likes_count``.
+
+    With ``LIKES["WRITE_BEHIND"]`` the intent is buffered instead and the
+    answer is ``202`` with the stored count, which the next flush updates.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request, article_id):
+        return self.respond(article_id, liked=True)
+
+    def delete(self, request, article_id):
+        return self.respond(article_id, liked=False)
+
+    def respond(self, article_id, liked):
+        buffered = get_config()["WRITE_BEHIND"]
+        write = buffer_like if buffered else set_like
+        likes_count = write(article_id, self.request.user.pk, liked)
+        if likes_count is None:
+            raise NotFound("No such article.")
+        return Response(
+            {"article": article_id, "liked": liked, "likes_count": likes_count},
+            status=status.HTTP_202_ACCEPTED if buffered else status.HTTP_200_OK,
+        )
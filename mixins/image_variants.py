@@ -0,0 +1,186 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "WIDTHS": [160, 480, 1200],
+    "FORMATS": ["webp", "jpeg"],
+    "QUALITY": 80,
+    # 0 renders inline in the calling thread (tests, management commands).
+    "WORKERS": 2,
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "IMAGE_VARIANTS", {})}
+
+
+def render_variants(source, targets, quality):
+    """
+    Decode ``source`` once and write each ``(width, format, path)`` target.
+
+    Runs inside a worker process, so it only touches Pillow and the
+    filesystem, never Django models or the database.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        for width, fmt, path in targets:
+            resized = image.copy()
+            # Never upscale: small originals are re-encoded at their own size.
+            resized.thumbnail((width, image.height))
+            if fmt == "jpeg" or resized.mode not in ("RGB", "RGBA"):
+                resized = resized.convert("RGB")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            resized.save(path, fmt.upper(), quality=quality)
+
+
+def variant_name(name, width, fmt):
+    directory, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    ext = "jpg" if fmt == "jpeg" else fmt
+    return os.path.join(directory, "variants", f"{stem}_{width}.{ext}")
+
+
+def get_executor(workers):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # "spawn" keeps the parent's DB connections and threads out of workers.
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+        return _executor
+
+
+def discard_executor():
+    global _executor
+    with _executor_lock:
+        _executor = None
+
+
+def store_variants(model, pk, field_name, name, variants_field, variants, future=None):
+    try:
+        if future is not None:
+            future.result()
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool for the next upload.
+        logger.exception("Image variant worker pool broke while rendering %s", name)
+        discard_executor()
+        return
+    except Exception:
+        logger.exception("Generating image variants for %s failed", name)
+        return
+    try:
+        # Only record the variants if the image was not replaced meanwhile.
+        model._base_manager.filter(pk=pk, **{field_name: name}).update(
+            **{variants_field: variants}
+        )
+    finally:
+        if future is not None:
+            # Done-callbacks run on the pool's management thread.
+            connection.close()
+
+
+def enqueue_variants(instance, field_name, variants_field):
+    """Schedule resized copies of ``instance.<field_name>`` on the worker pool."""
+    file = getattr(instance, field_name)
+    if not file:
+        return
+    config = get_config()
+    try:
+        source = file.storage.path(file.name)
+    except NotImplementedError:
+        logger.warning("Storage for %s has no local path; skipping variants.", file.name)
+        return
+
+    variants = {}
+    targets = []
+    for width in config["WIDTHS"]:
+        for fmt in config["FORMATS"]:
+            name = variant_name(file.name, width, fmt)
+            variants.setdefault(str(width), {})[fmt] = name
+            targets.append((width, fmt, file.storage.path(name)))
+
+    store = partial(
+        store_variants,
+        type(instance),
+        instance.pk,
+        field_name,
+        file.name,
+        variants_field,
+        variants,
+    )
+    if not config["WORKERS"]:
+        render_variants(source, targets, config["QUALITY"])
+        store()
+        return
+    future = get_executor(config["WORKERS"]).submit(
+        render_variants, source, targets, config["QUALITY"]
+    )
+    future.add_done_callback(store)
+
+
+class ImageVariantsMixin:
+    """
+    ModelSerializer mixin that queues variant generation for uploaded images
+    once the surrounding transaction commits.
+
+    ``image_variant_fields`` maps each image field to the JSON field that
+    stores its variants, e.g. ``{"cover_image": "cover_image_variants"}``.
+    """
+
+    image_variant_fields = {}
+
+    def save(self, **kwargs):
+        uploaded = [
+            (field, variants_field)
+            for field, variants_field in self.image_variant_fields.items()
+            if field in self.validated_data
+        ]
+        for _, variants_field in uploaded:
+            # Stale variants of a replaced (or removed) image must not linger.
+            kwargs.setdefault(variants_field, {})
+        instance = super().save(**kwargs)
+        for field, variants_field in uploaded:
+            transaction.on_commit(
+                partial(enqueue_variants, instance, field, variants_field)
+            )
+        return instance
+
+
+@extend_schema_field(OpenApiTypes.OBJECT)
+class ImageVariantsField(serializers.ReadOnlyField):
+    """Renders stored variant names as ``{width: {format: url}}``."""
+
+    def to_representation(self, value):
+        request = self.context.get("request")
+        urls = {}
+        for width, formats in (value or {}).items():
+            urls[width] = {}
+            for fmt, name in formats.items():
+                url = default_storage.url(name)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                urls[width][fmt] = url
+        return urls
@@ -1,7 +1,31 @@
 from django.db import models
 from django.conf import settings
+from django.dispatch import Signal
 from django.utils import timezone
 
+# Condition for partial indexes and constraints covering live rows only.
+LIVE = models.Q(deleted_at__isnull=True)
+
+# Sent after ``AuditModel.soft_delete()``; ``post_delete`` does not fire for it.
+post_soft_delete = Signal()
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    def soft_delete(self, user=None):
+        """Mark every row deleted with one UPDATE; sends no signals."""
+        now = timezone.now()
+        fields = {"deleted_at": now, "updated_at": now}
+        if user is not None:
+            fields["updated_by"] = user
+        return self.filter(LIVE).update(**fields)
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Default manager: soft-deleted rows are invisible."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(LIVE)
+
 
 class AuditModel(models.Model):
     created_by = models.ForeignKey(
@@ -18,9 +42,25 @@ class AuditModel(models.Model):
     )
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    objects = SoftDeleteManager()
+    all_with_deleted = models.Manager.from_queryset(SoftDeleteQuerySet)()
+
     class Meta:
         abstract = True
 
     @property
     def is_deleted(self):
         return self.deleted_at is not None
+
+    def soft_delete(self, user=None):
+        """
+        Hide the row with a single UPDATE. Related rows are left alone: they
+        keep pointing at it and are filtered out through it where needed.
+        """
+        self.deleted_at = timezone.now()
+        update_fields = ["deleted_at", "updated_at"]
+        if user is not None:
+            self.updated_by = user
+            update_fields.append("updated_by")
+        self.save(update_fields=update_fields)
+        post_soft_delete.send(sender=type(self), instance=self)
@@ -0,0 +1,104 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    ``ETag`` / ``Last-Modified`` validators for ``list`` and ``retrieve``.
+
+    ``If-None-Match`` and ``If-Modified-Since`` are answered with 304 before
+    any serialization. ``retrieve`` derives its validators from the object's
+    ``last_modified_fields``; ``list`` from their ``MAX()`` plus the row count
+    of the filtered queryset, so additions, edits and deletions all change it.
+    ``etag_fields`` are columns that change without touching ``updated_at``
+    (e.g. denormalized counters) and are folded into the detail ETag only.
+    A list showing them is versioned by ``get_list_version()`` instead, a
+    stamp their writers bump, rather than aggregating them on each request.
+
+    Lists send no ``Last-Modified``: removing a row other than the newest
+    leaves ``MAX(updated_at)`` alone, so only the ETag can tell.
+    """
+
+    last_modified_fields = ("updated_at",)
+    etag_fields = ()
+
+    def get_validator_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_list_validators(self):
+        aggregates = {f"max_{f}": Max(f) for f in self.last_modified_fields}
+        aggregates["count"] = Count("pk")
+        values = self.get_validator_queryset().order_by().aggregate(**aggregates)
+        version = self.get_list_version()
+        if version is not None:
+            values["version"] = version
+        return None, values
+
+    def get_list_version(self):
+        return None
+
+    def get_object_validators(self, obj):
+        values = {"pk": obj.pk}
+        stamps = []
+        for path in (*self.last_modified_fields, *self.etag_fields):
+            value = obj
+            for attr in path.split("__"):
+                value = getattr(value, attr, None)
+            values[path] = value
+            if path in self.last_modified_fields and value is not None:
+                stamps.append(value)
+        return max(stamps, default=None), values
+
+    def get_etag(self, values):
+        # Output can be per-user (e.g. is_liked), so the user is part of it.
+        raw = repr((self.request.user.pk, sorted(values.items())))
+        return "W/" + quote_etag(hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest())
+
+    def evaluate_preconditions(self, last_modified, values):
+        self.validator_headers = {"ETag": self.get_etag(values)}
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        if timestamp is not None:
+            self.validator_headers["Last-Modified"] = http_date(timestamp)
+        return get_conditional_response(
+            self.request,
+            etag=self.validator_headers["ETag"],
+            last_modified=timestamp,
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        headers = getattr(self, "validator_headers", None)
+        if headers and response.status_code in (200, 304):
+            for header, value in headers.items():
+                response[header] = value
+            patch_vary_headers(response, ("Authorization",))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        not_modified = self.evaluate_preconditions(*self.get_list_validators())
+        if not_modified is not None:
+            return not_modified
+        return self.render_list(request, *args, **kwargs)
+
+    def render_list(self, request, *args, **kwargs):
+        """The unconditional list response; override to wrap it."""
+        return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        not_modified = self.evaluate_preconditions(*self.get_object_validators(instance))
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+
+class SoftDeleteMixin:
+    """``destroy`` stamps ``deleted_at`` instead of deleting the row."""
+
+    def perform_destroy(self, instance):
+        instance.soft_delete(user=self.request.user)
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("task", "0007_task_created_by_task_deleted_at_task_updated_by"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="thumbnail_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
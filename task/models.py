@@ -17,6 +17,7 @@ class Task(AuditModel):
         "category.Category", on_delete=models.CASCADE, related_name="tasks", null=True
     )
     thumbnail = models.ImageField(upload_to="thumbnails/", null=True, blank=True)
+    thumbnail_variants = models.JSONField(default=dict, blank=True, editable=False)
     priority = models.CharField(
         max_length=10, choices=Priority.choices, default=Priority.LOW
     )
@@ -3,6 +3,7 @@ from drf_spectacular.utils import extend_schema_field
 from drf_spectacular.types import OpenApiTypes
 from .models import Task
 from category.serializers import CategorySerializer
+from mixins.image_variants import ImageVariantsField, ImageVariantsMixin
 
 
 class TaskSerializer(serializers.ModelSerializer):
@@ -13,6 +14,7 @@ class TaskSerializer(serializers.ModelSerializer):
 
 class TaskListSerializer(serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
+    thumbnail_variants = ImageVariantsField()
 
     class Meta:
         model = Task
@@ -26,7 +28,8 @@ class BinaryImageField(serializers.ImageField):
 extend_schema_field(OpenApiTypes.BINARY)(BinaryImageField)
 
 
-class TaskCreateSerializer(serializers.ModelSerializer):
+class TaskCreateSerializer(ImageVariantsMixin, serializers.ModelSerializer):
+    image_variant_fields = {"thumbnail": "thumbnail_variants"}
     thumbnail = BinaryImageField(required=False, allow_null=True)
 
     class Meta:
@@ -1,4 +1,10 @@
-from django.test import TestCase
+import io
+import os
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
 from rest_framework.test import APIClient
 from rest_framework import status
 from authentication.models import User
@@ -46,6 +52,7 @@ class TaskCRUDTest(TestCase):
         resp = self.client.delete(f'/api/v1/tasks/{task.pk}/')
         self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Task.objects.count(), 0)
+        self.assertTrue(Task.all_with_deleted.get(pk=task.pk).is_deleted)
 
     def test_complete_task(self):
         task = Task.objects.create(title='T1', description='D1', completed=False)
@@ -53,3 +60,74 @@ class TaskCRUDTest(TestCase):
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         task.refresh_from_db()
         self.assertTrue(task.completed)
+
+
+class TaskConditionalGetTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.task = Task.objects.create(title='T1', description='D1')
+
+    def test_if_modified_since(self):
+        url = f'/api/v1/tasks/{self.task.pk}/'
+        first = self.client.get(url)
+        resp = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_is_validated_by_etag_only(self):
+        newest = Task.objects.create(title='T2', description='D2')
+        first = self.client.get('/api/v1/tasks/')
+        self.assertNotIn('Last-Modified', first)
+        self.task.soft_delete()
+        resp = self.client.get('/api/v1/tasks/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([t['id'] for t in resp.data], [newest.pk])
+
+    def test_if_none_match_after_create(self):
+        first = self.client.get('/api/v1/tasks/')
+        Task.objects.create(title='T2', description='D2')
+        resp = self.client.get('/api/v1/tasks/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data), 2)
+
+
+def make_png(width=800, height=600):
+    buf = io.BytesIO()
+    Image.new('RGBA', (width, height), (200, 40, 40, 255)).save(buf, 'PNG')
+    return SimpleUploadedFile('photo.png', buf.getvalue(), content_type='image/png')
+
+
+class TaskThumbnailVariantsTest(TestCase):
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+
+    def test_upload_generates_variants_after_commit(self):
+        with override_settings(MEDIA_ROOT=self.media.name, IMAGE_VARIANTS={'WORKERS': 0}):
+            with self.captureOnCommitCallbacks(execute=True):
+                resp = self.client.post('/api/v1/tasks/', {
+                    'title': 'T1', 'description': 'D1', 'thumbnail': make_png(),
+                })
+            self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+            task = Task.objects.get()
+            self.assertEqual(set(task.thumbnail_variants), {'160', '480', '1200'})
+            small = os.path.join(self.media.name, task.thumbnail_variants['160']['webp'])
+            with Image.open(small) as image:
+                self.assertEqual(image.size, (160, 120))
+            with Image.open(os.path.join(self.media.name, task.thumbnail_variants['1200']['jpeg'])) as image:
+                # Originals are never upscaled.
+                self.assertEqual(image.size, (800, 600))
+
+            listed = self.client.get(f'/api/v1/tasks/{task.pk}/')
+            self.assertTrue(listed.data['thumbnail_variants']['480']['jpeg'].endswith('_480.jpg'))
+
+    def test_variants_not_generated_before_commit(self):
+        with override_settings(MEDIA_ROOT=self.media.name, IMAGE_VARIANTS={'WORKERS': 0}):
+            self.client.post('/api/v1/tasks/', {
+                'title': 'T1', 'description': 'D1', 'thumbnail': make_png(),
+            })
+        self.assertEqual(Task.objects.get().thumbnail_variants, {})
@@ -5,13 +5,15 @@ from .seriallizers import TaskSerializer, TaskCreateSerializer, TaskListSerializ
 from drf_spectacular.utils import extend_schema
 from rest_framework.parsers import MultiPartParser, FormParser
 from .models import Task
+from mixins.view_mixin import ConditionalGetMixin, SoftDeleteMixin
 
 
 # Create your views here.
-class TaskListView(ModelViewSet):
+class TaskListView(ConditionalGetMixin, SoftDeleteMixin, ModelViewSet):
     queryset = Task.objects.select_related("category").all()
     serializer_class = TaskSerializer
     parser_classes = (MultiPartParser, FormParser)
+    last_modified_fields = ("updated_at", "category__updated_at")
 
     @extend_schema(tags=["Task"], responses=TaskListSerializer)
     def list(self, request, *args, **kwargs):
@@ -1,5 +1,6 @@
 from rest_framework.permissions import BasePermission
 from authentication.models import Permission
+from authentication.permissions import request_has_permission
 
 
 class IsAdmin(BasePermission):
@@ -8,4 +9,4 @@ class IsAdmin(BasePermission):
     def has_permission(self, request, view):
         if not request.user or not request.user.is_authenticated:
             return False
-        return request.user.has_app_permission(Permission.ADMIN)
+        return request_has_permission(request, Permission.ADMIN)
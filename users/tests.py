@@ -51,7 +51,9 @@ class UserViewSetTest(TestCase):
     def test_delete_user(self):
         user = User.objects.create_user(email='target@example.com', password='testpass123')
         resp = self.client.delete(f'/api/v1/users/{user.pk}/')
-        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
+        user.refresh_from_db()
+        self.assertFalse(user.is_active)
 
 
 class UserViewSetPermissionTest(TestCase):
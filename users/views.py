@@ -3,6 +3,7 @@ from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema
 
 from authentication.models import User, Role
+from jobs.mixins import BackgroundDeleteMixin
 from .serializers import (
     UserListSerializer,
     UserCreateSerializer,
@@ -13,11 +14,16 @@ from .permissions import IsAdmin
 
 
 @extend_schema(tags=["Users"])
-class UserViewSet(ModelViewSet):
+class UserViewSet(BackgroundDeleteMixin, ModelViewSet):
     queryset = User.objects.select_related("role").all()
     serializer_class = UserListSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
 
+    def mark_deleted(self, instance):
+        # Locks the account out at once; the row goes with the cascade job.
+        instance.is_active = False
+        instance.save(update_fields=["is_active"])
+
     def get_serializer_class(self):
         if self.action == "create":
             return UserCreateSerializer